@@ -0,0 +1,212 @@
+# Groebner bases on disk, for bases too large to keep as Polynomial objects.  A store is a directory with
+#
+#   meta.json    the ring (field code as in checkpoint.py, variables, order) and the numbers of polynomials and terms
+#   exps.bin     the exponent vectors of all terms, int64, one row of num_vars entries per term
+#   coeffs.bin   the coefficients, int64: the representative over GF(p) or GF(p^k), numerator and denominator over QQ
+#   offsets.bin  int64, polynomial i is made of the terms offsets[i] to offsets[i + 1]
+#
+# with the terms of every polynomial in increasing order like Polynomial.monomials, so each leading term is the last
+# one.  BasisWriter appends one polynomial at a time, so a basis never has to be in memory as a whole.  BasisStore
+# opens the files as read-only NumPy memmaps: opening is instant, the operating system pages in only the terms that are
+# used, and every process that opens the same store shares those pages.  Only the leading exponent vectors are read
+# into memory, as the index that finds the divisors of a monomial.  store[i] is a view of polynomial i whose arrays are
+# slices of the memmaps; over GF(p) with p < 2**31 normal_form reduces by these views directly with
+# gfp_array.reduce_arrays, without building any Polynomial of the basis.
+
+import os
+import json
+import numpy
+from polynomial import _polynomial
+from polynomial_ring import PolynomialRing
+from coefficient_field import RationalField, PrimeField, FiniteField
+from monomial import _monomial
+from rational import Rational
+from checkpoint import encode_field, decode_field
+import gfp_array
+
+class BasisWriter:
+    """
+    Writes the polynomials of one ring to a new store at path, see the top
+    of the file; close() finishes the store
+
+    >>> from polynomial import *
+    >>> import tempfile
+    >>> R = PolynomialRing(QQ, 'xy', 'grevlex')
+    >>> x, y = R.variables()
+    >>> path = tempfile.mkdtemp()
+    >>> writer = BasisWriter(path, R)
+    >>> writer.append(x**2 - Rational(1, 3)*y)
+    >>> writer.append(x*y + 1)
+    >>> writer.close()
+    >>> store = BasisStore(path)
+    >>> len(store), store.polynomial(0), store[1].LM()
+    (2, x^2 + (-1/3)*y, (1, 1))
+    >>> writer = BasisWriter(path, R)
+    >>> writer.append(Rational(2**70, 1) * x)
+    Traceback (most recent call last):
+    ValueError: coefficient 1180591620717411303424 does not fit into 64 bits
+    """
+
+    def __init__(self, path, ring):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.ring = ring
+        self.offsets = [0]
+        self.exps = open(os.path.join(path, 'exps.bin'), 'wb')
+        self.coeffs = open(os.path.join(path, 'coeffs.bin'), 'wb')
+
+    def append(self, f):
+        field = self.ring.coeff_ring
+        if isinstance(field, RationalField):
+            coeffs = [x for c in f.coeffs for x in (c.n, c.d)]
+        else:
+            coeffs = [c.x for c in f.coeffs]
+        for c in coeffs:
+            if not -2**63 <= c < 2**63:
+                raise ValueError, 'coefficient %d does not fit into 64 bits' % c
+        numpy.array([m.degrees for m in f.monomials], dtype=numpy.int64).tofile(self.exps)
+        numpy.array(coeffs, dtype=numpy.int64).tofile(self.coeffs)
+        self.offsets.append(self.offsets[-1] + len(f.monomials))
+
+    def close(self):
+        self.exps.close()
+        self.coeffs.close()
+        numpy.array(self.offsets, dtype=numpy.int64).tofile(os.path.join(self.path, 'offsets.bin'))
+        meta = {'field': encode_field(self.ring.coeff_ring), 'vars': self.ring.var_list, 'order': self.ring.order,
+                'polynomials': len(self.offsets) - 1, 'terms': self.offsets[-1]}
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+def save_basis(path, basis, ring=None):
+    """
+    Writes the polynomials of basis, an iterable, to a new store at path
+    """
+    writer = None
+    for f in basis:
+        if writer is None:
+            writer = BasisWriter(path, ring or f.ring)
+        writer.append(f)
+    if writer is None:
+        assert ring is not None, 'an empty basis needs its ring'
+        writer = BasisWriter(path, ring)
+    writer.close()
+
+class StoredPolynomial:
+    """
+    A read-only view of a polynomial of a BasisStore: exps and coeffs are
+    slices of the memmaps, coeffs with two columns over QQ
+    """
+
+    def __init__(self, ring, exps, coeffs):
+        self.ring = ring
+        self.exps = exps
+        self.coeffs = coeffs
+
+    def __len__(self):
+        return len(self.exps)
+
+    def LM(self):
+        return tuple(self.exps[-1].tolist())
+
+    def to_polynomial(self, ring=None):
+        ring = ring or self.ring
+        field = ring.coeff_ring
+        monomials = [_monomial(ring, tuple(e)) for e in self.exps.tolist()]
+        if isinstance(field, RationalField):
+            coeffs = [Rational(n, d) for n, d in self.coeffs.tolist()]
+        elif isinstance(field, FiniteField):
+            coeffs = [field.element(c) for c in self.coeffs.tolist()]
+        else:
+            coeffs = [field(c) for c in self.coeffs.tolist()]
+        return _polynomial(ring, monomials, coeffs)
+
+class BasisStore:
+    """
+    A store written by BasisWriter, opened read-only, see the top of the file
+
+    >>> from polynomial import *
+    >>> import tempfile
+    >>> R = PolynomialRing(PrimeField(32003), 'xyz', 'grevlex')
+    >>> x, y, z = R.variables()
+    >>> from buchberger import groebner, interreduce
+    >>> G = interreduce(groebner([x**2 + y*z - 2, y**2 - x*z + 1, z**3 - x]))
+    >>> path = tempfile.mkdtemp()
+    >>> save_basis(path, G)
+    >>> store = BasisStore(path)
+    >>> store.ring
+    Polynomial Ring in 3 variable(s), x, y, z over GF(32003) with grevlex order
+    >>> [store.polynomial(i) for i in range(len(store))] == G
+    True
+    >>> f = (x + y + z + 1)**4
+    >>> store.normal_form(f) == f.divide(G)[1]
+    True
+    >>> store.divisors((2, 1, 0)) == [i for i in range(len(G)) if G[i].LM().degrees[1] <= 1 and G[i].LM().degrees[2] == 0]
+    True
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        field = decode_field(tuple(meta['field']))
+        self.ring = PolynomialRing(field, [str(v) for v in meta['vars']], str(meta['order']))
+        n = self.ring.num_vars()
+        terms = meta['terms']
+        self.offsets = numpy.fromfile(os.path.join(path, 'offsets.bin'), dtype=numpy.int64)
+        if terms:
+            self.exps = numpy.memmap(os.path.join(path, 'exps.bin'), dtype=numpy.int64, mode='r', shape=(terms, n))
+            shape = (terms, 2) if isinstance(field, RationalField) else (terms,)
+            self.coeffs = numpy.memmap(os.path.join(path, 'coeffs.bin'), dtype=numpy.int64, mode='r', shape=shape)
+            self.leading = numpy.array(self.exps[self.offsets[1:] - 1])
+        else:
+            self.exps = numpy.zeros((0, n), dtype=numpy.int64)
+            self.coeffs = numpy.zeros((0,), dtype=numpy.int64)
+            self.leading = numpy.zeros((0, n), dtype=numpy.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError, 'no polynomial %d in the store' % i
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return StoredPolynomial(self.ring, self.exps[start:end], self.coeffs[start:end])
+
+    def polynomial(self, i, ring=None):
+        """
+        Polynomial i as a Polynomial, in ring if given, a copy of the view
+        """
+        return self[i].to_polynomial(ring)
+
+    def divisors(self, degrees):
+        """
+        The indices of the polynomials whose leading monomial divides the
+        monomial with the exponent vector degrees
+        """
+        return numpy.flatnonzero(numpy.all(self.leading <= numpy.array(degrees), axis=1)).tolist()
+
+    def normal_form(self, f):
+        """
+        The remainder of f, a Polynomial with the variables of the store, by
+        the polynomials of the store in order, as Polynomial.divide gives it
+        """
+        ring = f.ring
+        assert ring.var_list == self.ring.var_list and ring.order == self.ring.order, 'f is in another ring'
+        if not len(self) or f.is_zero():
+            return f
+        field = ring.coeff_ring
+        if isinstance(field, PrimeField) and field.p < 2**31:
+            exps = numpy.array([m.degrees for m in f.monomials], dtype=numpy.int64)
+            coeffs = numpy.array([c.x for c in f.coeffs], dtype=numpy.int64)
+            views = [self[i] for i in range(len(self))]
+            remainder = gfp_array.reduce_arrays(ring, exps, coeffs, views, self.leading)[1]
+            return _polynomial(ring, [_monomial(ring, tuple(e.tolist())) for e, c in reversed(remainder)],
+                               [field(int(c)) for e, c in reversed(remainder)])
+        return f.divide([self.polynomial(i, ring) for i in range(len(self))])[1]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,317 @@
+# Computes Groebner bases for a file of ideals on a pool of worker processes.
+#
+# usage: python batch.py input output [options], see python batch.py --help
+#
+# The input is either JSONL, one ideal per line:
+#
+#   {"id": "a1", "field": "QQ", "vars": ["x", "y"], "order": "grevlex", "ideal": ["x^2 - y", "x*y - 1"]}
+#
+# where id, field (QQ, a prime or GF(p^k)), vars and order are optional and default to the line number and the command line
+# options, or text, one ideal per line with its polynomials separated by commas.  Blank lines and lines starting with #
+# are skipped.  Polynomials are written as Polynomial prints them or with the usual + - * / ^ ** and parentheses; over
+# GF(p^k) the generator of the field is a, which cannot be a variable then.
+#
+# Every ideal gives one JSONL line of output, in the order of the input:
+#
+#   {"id": "a1", "status": "done", "basis": ["y^3 + (-1)*1", "x + (-1)*y^2"], "stats": {...}, "seconds": 0.001}
+#
+# status is 'done', 'time' or 'memory' when the per-ideal limit was hit, or 'error' with the message in "error"; a line
+# that cannot be read gives an error record too, with the id it has or else its line number.  The input is read as the
+# workers need it, so it does not have to fit into memory.
+# Output lines are flushed as they are written.  Rerunning with the same output file skips the ideals already in it
+# and appends the rest, so an interrupted run resumes where it stopped; a last line cut off by the interruption is
+# dropped.  Ideals are handed to the workers in chunks and the workers keep their rings between ideals, so the work per
+# ideal is parsing, the computation and printing, which all happen in the workers.
+
+import os
+import re
+import sys
+import json
+from time import time
+from optparse import OptionParser
+from multiprocessing import Pool, cpu_count
+from polynomial_ring import PolynomialRing
+from coefficient_field import QQ, PrimeField, FiniteField
+from service import compute, _options, _ring
+from checkpoint import encode_field
+
+_token = re.compile(r'\s*(?:(\d+)|([A-Za-z_]\w*)|(\*\*|[-+*/^(),]))')
+
+def _tokens(s):
+    tokens = []
+    pos = 0
+    s = s.rstrip()
+    while pos < len(s):
+        match = _token.match(s, pos)
+        if match is None:
+            raise ValueError, 'cannot parse %r at %r' % (s, s[pos:])
+        number, name, op = match.groups()
+        if number is not None:
+            tokens.append(('number', int(number)))
+        elif name is not None:
+            tokens.append(('name', name))
+        else:
+            tokens.append(('op', op))
+        pos = match.end()
+    return tokens
+
+class _Parser:
+    """
+    Recursive descent over the tokens of one polynomial:
+
+    sum     = ['-'] product (('+' | '-') product)*
+    product = power (('*' | '/') power)*
+    power   = atom (('^' | '**') number)?
+    atom    = number | variable | '(' sum ')'
+    """
+
+    def __init__(self, ring, tokens):
+        self.ring = ring
+        self.tokens = tokens
+        self.pos = 0
+        self.variables = dict(zip(ring.var_list, ring.variables()))
+        field = ring.coeff_ring
+        if isinstance(field, FiniteField):
+            # the generator of GF(p^k), as Polynomial prints the coefficients
+            if field.name in self.variables:
+                raise ValueError, 'the variable %r is the name of the generator of %s' % (field.name, field)
+            self.variables[field.name] = ring(field.gen())
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, op):
+        if self.next() != ('op', op):
+            raise ValueError, 'expected %r' % op
+
+    def sum(self):
+        negate = self.peek() == ('op', '-')
+        if negate:
+            self.next()
+        f = self.product()
+        if negate:
+            f = -f
+        while self.peek() in (('op', '+'), ('op', '-')):
+            op = self.next()[1]
+            g = self.product()
+            f = f + g if op == '+' else f - g
+        return f
+
+    def product(self):
+        f = self.power()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            op = self.next()[1]
+            g = self.power()
+            if op == '*':
+                f = f * g
+            elif len(g.monomials) != 1 or g.monomials[0].degree() != 0:
+                raise ValueError, 'can only divide by nonzero constants'
+            else:
+                f = f * ~g.coeffs[0]
+        return f
+
+    def power(self):
+        f = self.atom()
+        if self.peek() in (('op', '^'), ('op', '**')):
+            self.next()
+            kind, e = self.next()
+            if kind != 'number':
+                raise ValueError, 'exponents must be integers'
+            f = f**e
+        return f
+
+    def atom(self):
+        kind, value = self.next()
+        if kind == 'number':
+            return self.ring(value)
+        elif kind == 'name':
+            if value not in self.variables:
+                raise ValueError, 'unknown variable %r' % value
+            return self.variables[value]
+        elif value == '(':
+            f = self.sum()
+            self.expect(')')
+            return f
+        raise ValueError, 'unexpected %s' % ('end of input' if kind is None else repr(value))
+
+def parse_polynomial(ring, s):
+    """
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> parse_polynomial(R, '(-5)*x^12*y*z^5 + 1/2*x**2 - 3*(y - z)')
+    (-5)*x^12*y*z^5 + 1/2*x^2 + (-3)*y + 3*z
+    >>> parse_polynomial(R, '2*1')
+    2*1
+    >>> parse_polynomial(R, 'x + w')
+    Traceback (most recent call last):
+    ValueError: unknown variable 'w'
+    >>> S = PolynomialRing(FiniteField(3, 2), 'xy')
+    >>> x, y = S.variables()
+    >>> a = S.coeff_ring.gen()
+    >>> f = a**2*x + y + a**5
+    >>> f, parse_polynomial(S, repr(f)) == f
+    (a^2*x + y + a^5*1, True)
+    >>> parse_polynomial(PolynomialRing(FiniteField(3, 2), 'ab'), 'a + b')
+    Traceback (most recent call last):
+    ValueError: the variable 'a' is the name of the generator of GF(3^2)
+    """
+    parser = _Parser(ring, _tokens(s))
+    f = parser.sum()
+    if parser.pos != len(parser.tokens):
+        raise ValueError, 'cannot parse %r' % s
+    return f
+
+def parse_field(field):
+    """
+    >>> parse_field('QQ'), parse_field(32003), parse_field('GF(7)'), parse_field('GF(2^8)')
+    (QQ, GF(32003), GF(7), GF(2^8))
+    """
+    if field == 'QQ':
+        return QQ
+    if isinstance(field, basestring) and field.startswith('GF(') and field.endswith(')'):
+        field = field[3:-1]
+    if isinstance(field, basestring) and '^' in field:
+        p, k = field.split('^')
+        return FiniteField(int(p), int(k))
+    return PrimeField(int(field))
+
+def read_ideals(lines, defaults):
+    """
+    Yields (id, ring code, polynomial strings) for the ideals in the lines of
+    a JSONL or text file, or (id, None, error message) for a line that
+    cannot be read; defaults holds field, vars and order
+
+    >>> defaults = {'field': 'QQ', 'vars': 'xy', 'order': 'lex'}
+    >>> list(read_ideals(['# test', 'x^2 - y, x*y - 1', '', '{"id": 7, "vars": "xyz", "ideal": ["x - z"]}'], defaults))
+    [(2, (('QQ',), ('x', 'y'), 'lex'), ['x^2 - y', 'x*y - 1']), (7, (('QQ',), ('x', 'y', 'z'), 'lex'), ['x - z'])]
+    >>> for id, code, error in read_ideals(['{"id": 1, "ideal": ["x"', '{"id": 5}', '{"field": "GF(q)"}'], defaults):
+    ...     print id, code, error.split(':')[0]
+    1 None ValueError
+    5 None KeyError
+    3 None ValueError
+    """
+    for number, line in enumerate(lines):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        item = {}
+        try:
+            if line.startswith('{'):
+                item = json.loads(line)
+            else:
+                item = {'ideal': line.split(',')}
+            field = encode_field(parse_field(item.get('field', defaults['field'])))
+            var_list = tuple([str(v) for v in item.get('vars', defaults['vars'])])
+            ring = (field, var_list, str(item.get('order', defaults['order'])))
+            strings = [str(f).strip() for f in item['ideal']]
+        except Exception, e:
+            id = item.get('id', number + 1) if isinstance(item, dict) else number + 1
+            yield (id, None, '%s: %s' % (e.__class__.__name__, e))
+            continue
+        yield (item.get('id', number + 1), ring, strings)
+
+def solve(task):
+    """
+    Computes one ideal from read_ideals with the options of the run and
+    returns its output record; runs in the workers
+
+    >>> solve(((1, (('GF', 7), ('x', 'y'), 'grevlex'), ['x^2 - y', 'x*y - 1']), _options(None)))['basis']
+    ['y^2 + 6*x', 'x*y + 6*1', 'x^2 + 6*y']
+    >>> solve(((2, None, "KeyError: 'ideal'"), _options(None)))['error']
+    "KeyError: 'ideal'"
+    """
+    (id, code, strings), options = task
+    if code is None:
+        return {'id': id, 'status': 'error', 'error': strings, 'seconds': 0.0}
+    start = time()
+    try:
+        ring = _ring(code)
+        ideal = [parse_polynomial(ring, s) for s in strings]
+        ideal = [f for f in ideal if not f.is_zero()]
+        if not ideal:
+            status, basis, stats = 'done', [], {}
+        else:
+            status, basis, stats = compute(ideal, options)
+        record = {'id': id, 'status': status, 'stats': stats}
+        if basis is not None:
+            record['basis'] = [repr(f) for f in basis]
+    except Exception, e:
+        record = {'id': id, 'status': 'error', 'error': '%s: %s' % (e.__class__.__name__, e)}
+    record['seconds'] = round(time() - start, 6)
+    return record
+
+def finished_ids(path):
+    """
+    Returns the ids in an output file, dropping a last line cut off in the
+    middle of being written
+    """
+    ids = set()
+    if not os.path.exists(path):
+        return ids
+    good = 0
+    with open(path, 'r+') as f:
+        for line in iter(f.readline, ''):
+            try:
+                ids.add(json.loads(line)['id'])
+            except ValueError:
+                break
+            good = f.tell()
+        f.truncate(good)
+    return ids
+
+def run(input, output, defaults, options, processes=None, chunksize=16, log=None):
+    """
+    Runs every ideal of the file input not yet in the file output and
+    appends the records to output; returns the number of ideals computed
+    """
+    done = finished_ids(output)
+    pool = Pool(processes or cpu_count())
+    start = time()
+    count = 0
+    with open(input) as f, open(output, 'a') as out:
+        tasks = ((ideal, options) for ideal in read_ideals(f, defaults) if ideal[0] not in done)
+        for record in pool.imap(solve, tasks, chunksize):
+            out.write(json.dumps(record, sort_keys=True) + '\n')
+            out.flush()
+            count += 1
+            if log is not None and count % 1000 == 0:
+                log.write('%d ideals, %.1f per second\n' % (count, count / (time() - start)))
+    pool.close()
+    pool.join()
+    return count
+
+def main(argv):
+    parser = OptionParser(usage='usage: %prog input output [options]')
+    parser.add_option('--processes', type='int', default=cpu_count(), help='worker processes [%default]')
+    parser.add_option('--chunksize', type='int', default=16, help='ideals handed to a worker at a time [%default]')
+    parser.add_option('--time-limit', type='float', help='seconds per ideal')
+    parser.add_option('--memory-limit', type='float', help='megabytes of resident memory per worker')
+    parser.add_option('--engine', default='buchberger', help='buchberger or signature [%default]')
+    parser.add_option('--top-reduction', action='store_true', help='reduce only leading terms until the end')
+    parser.add_option('--not-reduced', action='store_true', help='do not interreduce the bases')
+    parser.add_option('--field', default='QQ', help='QQ, a prime or GF(p^k), for ideals that do not give one [%default]')
+    parser.add_option('--vars', default='xyz', help='variables, for ideals that do not give them [%default]')
+    parser.add_option('--order', default='lex', help='monomial order, for ideals that do not give one [%default]')
+    opts, args = parser.parse_args(argv)
+    if len(args) != 2:
+        parser.error('expected an input and an output file')
+    options = _options({'engine': opts.engine, 'reduced': not opts.not_reduced,
+                        'reduction': 'top' if opts.top_reduction else 'full',
+                        'time_limit': opts.time_limit, 'memory_limit': opts.memory_limit})
+    defaults = {'field': opts.field, 'vars': opts.vars.split(',') if ',' in opts.vars else opts.vars,
+                'order': opts.order}
+    start = time()
+    count = run(args[0], args[1], defaults, options, opts.processes, opts.chunksize, sys.stderr)
+    sys.stderr.write('%d ideals in %.2f seconds\n' % (count, time() - start))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(sys.argv[1:])
+    else:
+        import doctest
+        doctest.testmod()
@@ -0,0 +1,347 @@
+# Boolean polynomials: GF(2)[x1, ..., xn] / (x1^2 - x1, ..., xn^2 - xn), for systems over GF(2) whose solutions are
+# 0/1 vectors.  Every exponent is 0 or 1, so a monomial is a Python int with bit n - 1 - i set when the i-th variable
+# divides it: multiplying monomials is OR, divisibility is a subset test, and with the first variable in the highest
+# bit lex order is the order of the ints.  Coefficients are 0 or 1, so a polynomial is just the frozenset of its
+# monomials and adding polynomials is the symmetric difference of the sets.  The field equations xi^2 = xi are applied
+# by every product instead of being generators.
+#
+# BooleanBuchberger computes Groebner bases in the quotient ring.  Besides the S-polynomials of pairs of basis
+# elements, the pairs of an element g with the field equations of the variables x of LM(g) have to reduce to zero;
+# their S-polynomials are the products x*g.  Pairs of elements with coprime leading monomials are skipped (Buchberger's
+# first criterion), and the pair with the smallest lcm is reduced first, which keeps the degrees of the intermediate
+# polynomials low.  groebner in buchberger.py hands BooleanPolynomials to groebner here.
+
+import heapq
+from coefficient_field import PrimeField
+
+class BooleanPolynomialRing:
+    """
+    order is 'lex', 'grlex' or 'grevlex', see orders.py
+
+    TESTS:
+
+    >>> R = BooleanPolynomialRing('xyz')
+    >>> R
+    Boolean Polynomial Ring in 3 variable(s), x, y, z
+    >>> x, y, z = R.variables()
+    >>> (x + y)*(x + z)
+    x*y + x*z + x + y*z
+    >>> x*x == x, x + x == R(0), (x + 1)**5 == x + 1
+    (True, True, True)
+    >>> S = BooleanPolynomialRing(['x%d' % i for i in range(200)], 'grevlex')
+    >>> v = S.variables()
+    >>> v[0]*v[199] + v[100] + 1
+    x0*x199 + x100 + 1
+    """
+
+    def __init__(self, var_list, order='lex'):
+        if isinstance(var_list, str):
+            var_list = [var for var in var_list]
+        if order not in ('lex', 'grlex', 'grevlex'):
+            raise ValueError, 'unknown monomial order %r' % order
+        self.var_list = list(var_list)
+        self.order = order
+        self.coeff_ring = PrimeField(2)
+        self._num_vars = len(var_list)
+        self._mask = (1 << self._num_vars) - 1
+
+    def num_vars(self):
+        return self._num_vars
+
+    def __repr__(self):
+        x = 'Boolean Polynomial Ring in %d variable(s), %s' % (self._num_vars, ', '.join(self.var_list))
+        if self.order != 'lex':
+            x += ' with %s order' % self.order
+        return x
+
+    def __call__(self, element):
+        if isinstance(element, BooleanPolynomial):
+            assert element.ring is self, 'the polynomial is in another ring'
+            return element
+        elif isinstance(element, (int, long)):
+            return BooleanPolynomial(self, [0] if element % 2 else [])
+        raise ValueError, 'cannot coerce into boolean polynomial ring'
+
+    def variables(self):
+        n = self._num_vars
+        variables = tuple([BooleanPolynomial(self, [1 << (n - 1 - i)]) for i in range(n)])
+        return variables[0] if n == 1 else variables
+
+    def monomial(self, names):
+        """
+        The monomial that is the product of the named variables, as an int
+        """
+        m = 0
+        for name in names:
+            m |= 1 << (self._num_vars - 1 - self.var_list.index(name))
+        return m
+
+    def key(self, m):
+        """
+        An int that orders the monomials of the ring as the monomial order does
+
+        >>> R = BooleanPolynomialRing('xyz', 'grevlex')
+        >>> [R.monomial_str(m) for m in sorted(range(8), key=R.key)]
+        ['1', 'z', 'y', 'x', 'y*z', 'x*z', 'x*y', 'x*y*z']
+        """
+        if self.order == 'lex':
+            return m
+        degree = bin(m).count('1')
+        if self.order == 'grlex':
+            return (degree << self._num_vars) | m
+        # ties in grevlex go to the monomial without the last variable where they differ
+        reverse = int(bin((~m & self._mask) | (1 << self._num_vars))[:2:-1], 2)
+        return (degree << self._num_vars) | reverse
+
+    def monomial_str(self, m):
+        if not m:
+            return '1'
+        n = self._num_vars
+        return '*'.join([self.var_list[i] for i in range(n) if m >> (n - 1 - i) & 1])
+
+class BooleanPolynomial:
+    """
+    A sum of distinct monomials of a BooleanPolynomialRing, see the top of
+    the file; the leading monomial is found on first use and kept
+    """
+
+    def __init__(self, ring, monomials):
+        self.ring = ring
+        self.monomials = frozenset(monomials)
+        self._LM = None
+
+    def __repr__(self):
+        if not self.monomials:
+            return '0'
+        key = self.ring.key
+        return ' + '.join([self.ring.monomial_str(m) for m in sorted(self.monomials, key=key, reverse=True)])
+
+    def __eq__(self, other):
+        if isinstance(other, (int, long)):
+            other = self.ring(other)
+        return isinstance(other, BooleanPolynomial) and self.monomials == other.monomials
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.monomials)
+
+    def __add__(self, other):
+        other = self.ring(other)
+        return BooleanPolynomial(self.ring, self.monomials.symmetric_difference(other.monomials))
+
+    __radd__ = __add__
+    __sub__ = __add__
+    __rsub__ = __add__
+
+    def __neg__(self):
+        return self
+
+    def __mul__(self, other):
+        other = self.ring(other)
+        if len(other.monomials) == 1:
+            return self.mul_monomial(iter(other.monomials).next())
+        terms = set()
+        for m in self.monomials:
+            for n in other.monomials:
+                terms ^= set([m | n])
+        return BooleanPolynomial(self.ring, terms)
+
+    __rmul__ = __mul__
+
+    def __pow__(self, power):
+        assert power >= 0
+        return self if power else self.ring(1)
+
+    def mul_monomial(self, n):
+        """
+        self times the monomial n; terms that become equal cancel in pairs
+        """
+        terms = set()
+        for m in self.monomials:
+            m |= n
+            if m in terms:
+                terms.remove(m)
+            else:
+                terms.add(m)
+        return BooleanPolynomial(self.ring, terms)
+
+    def is_zero(self):
+        return not self.monomials
+
+    def LM(self):
+        """
+        The leading monomial, as an int
+        """
+        if self._LM is None:
+            self._LM = max(self.monomials, key=self.ring.key)
+        return self._LM
+
+    def degree(self):
+        return max([bin(m).count('1') for m in self.monomials]) if self.monomials else -1
+
+    def normal_form(self, divisors):
+        """
+        Returns the remainder of self by the nonzero divisors: no monomial of
+        it is divisible by the leading monomial of any of them
+
+        >>> x, y, z = BooleanPolynomialRing('xyz').variables()
+        >>> (x*y*z + x*z + y).normal_form([x*z + 1, y + z])
+        1
+        """
+        key = self.ring.key
+        leading = [(g.LM(), g) for g in divisors]
+        terms = set(self.monomials)
+        heap = [(-key(m), m) for m in terms]
+        heapq.heapify(heap)
+        remainder = []
+        while heap:
+            t = heapq.heappop(heap)[1]
+            if t not in terms:
+                continue
+            for lm, g in leading:
+                if lm & t == lm:
+                    for m in g.mul_monomial(t & ~lm).monomials:
+                        if m in terms:
+                            terms.remove(m)
+                        else:
+                            terms.add(m)
+                            heapq.heappush(heap, (-key(m), m))
+                    break
+            else:
+                terms.remove(t)
+                remainder.append(t)
+        return BooleanPolynomial(self.ring, remainder)
+
+    def S_polynomial(self, other):
+        lcm = self.LM() | other.LM()
+        return self.mul_monomial(lcm & ~self.LM()) + other.mul_monomial(lcm & ~other.LM())
+
+class BooleanBuchberger:
+    """
+    TESTS:
+
+    >>> R = BooleanPolynomialRing('xyz')
+    >>> x, y, z = R.variables()
+    >>> engine = BooleanBuchberger([x*y + z, x + y + 1])
+    >>> interreduce(engine.run())
+    [z, x + y + 1]
+    >>> sorted(engine.stats.items())
+    [('field_pairs', 6), ('pairs_skipped', 2), ('reductions', 8), ('zero_reductions', 6)]
+    """
+
+    def __init__(self, poly_list):
+        self.ideal = []
+        self.reducers = []
+        self.pairs = []
+        self.done = set()
+        self.stats = {'reductions': 0, 'zero_reductions': 0, 'field_pairs': 0, 'pairs_skipped': 0}
+        for f in poly_list:
+            if not f.is_zero():
+                self.add(f)
+
+    def add(self, f):
+        """
+        Adds f to the basis with its pairs: one with every reducer whose
+        leading monomial is not coprime to that of f, one with the field
+        equation of each variable of LM(f).  Reducers whose leading monomial
+        is divisible by that of f are redundant from then on: they are not
+        used for reducing and get no new pairs (Gebauer and Moeller).
+        """
+        key = f.ring.key
+        n = len(self.ideal)
+        self.ideal.append(f)
+        lm = f.LM()
+        for j in self.reducers:
+            other = self.ideal[j].LM()
+            if lm & other:
+                heapq.heappush(self.pairs, (key(lm | other), n, j))
+            else:
+                self.done.add((n, j))
+                self.stats['pairs_skipped'] += 1
+        bit = lm
+        while bit:
+            x = bit & -bit
+            heapq.heappush(self.pairs, (key(lm), n, -x))
+            bit ^= x
+        self.reducers = [j for j in self.reducers if self.ideal[j].LM() & lm != lm] + [n]
+
+    def _chain(self, i, j):
+        """
+        Whether the pair (i, j) can be skipped by Buchberger's second
+        criterion: some k has LM(k) dividing lcm(LM(i), LM(j)) and both
+        (i, k) and (j, k) are done
+        """
+        lcm = self.ideal[i].LM() | self.ideal[j].LM()
+        for k in self.reducers:
+            lm = self.ideal[k].LM()
+            if k != i and k != j and lm & lcm == lm and \
+               (max(i, k), min(i, k)) in self.done and (max(j, k), min(j, k)) in self.done:
+                return True
+        return False
+
+    def step(self):
+        """
+        Reduces the pair with the smallest lcm, returns the new basis element
+        or None if it reduced to zero or was skipped
+        """
+        lcm, i, j = heapq.heappop(self.pairs)
+        if j < 0:
+            self.stats['field_pairs'] += 1
+            S = self.ideal[i].mul_monomial(-j)
+        else:
+            self.done.add((i, j))
+            if self._chain(i, j):
+                self.stats['pairs_skipped'] += 1
+                return None
+            S = self.ideal[i].S_polynomial(self.ideal[j])
+        S = S.normal_form([self.ideal[k] for k in self.reducers])
+        self.stats['reductions'] += 1
+        if S.is_zero():
+            self.stats['zero_reductions'] += 1
+            return None
+        self.add(S)
+        return S
+
+    def run(self):
+        """
+        Reduces pairs until none are left and returns a Groebner basis: the
+        elements that are not redundant
+        """
+        while self.pairs:
+            self.step()
+        return [self.ideal[k] for k in self.reducers]
+
+def interreduce(basis):
+    """
+    The reduced Groebner basis of the ideal with the Groebner basis basis,
+    sorted by leading monomial
+    """
+    key = basis[0].ring.key if basis else None
+    basis = sorted(basis, key=lambda g: key(g.LM()))
+    minimal = []
+    for g in basis:
+        if not [h for h in minimal if h.LM() & g.LM() == h.LM()]:
+            minimal.append(g)
+    return [g.normal_form([h for h in minimal if h is not g]) for g in minimal]
+
+def groebner(poly_list):
+    """
+    The reduced Groebner basis of the ideal of the boolean polynomials
+
+    >>> R = BooleanPolynomialRing('abcd', 'grevlex')
+    >>> a, b, c, d = R.variables()
+    >>> groebner([a*b + c, b*c + d + 1, a + b + c + d])
+    [d + 1, c, a + b + 1]
+    >>> groebner([a*b + 1, a + b])
+    [b + 1, a + 1]
+    >>> groebner([a*b + 1, a + b, a*c + c + 1])
+    [1]
+    """
+    return interreduce(BooleanBuchberger(poly_list).run())
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
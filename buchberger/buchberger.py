@@ -1,9 +1,281 @@
 from polynomial import Polynomial
+from multiples import MultipleCache
+from collections import deque
+from time import time
+import resource
 
-def groebner(poly_list):
+class CancellationToken:
+    """
+    Passed to Buchberger.iterate so another thread can stop a computation
+
+    >>> token = CancellationToken()
+    >>> token.is_cancelled()
+    False
+    >>> token.cancel()
+    >>> token.is_cancelled()
+    True
+    """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def is_cancelled(self):
+        return self.cancelled
+
+def memory_used():
+    """
+    Returns the resident memory of this process in megabytes: the current
+    one where /proc/self/statm exists, so that a long-lived worker process
+    can run one limited computation after another, the peak one elsewhere
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * (resource.getpagesize() / 1024.0) / 1024.0
+    except IOError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def stop_reason(start, time_limit=None, memory_limit=None, cancel=None):
+    """
+    'cancelled', 'time' or 'memory' if a computation started at time start
+    has to stop for cancel or one of the limits, see Buchberger.iterate,
+    None otherwise
+
+    >>> stop_reason(time(), 60), stop_reason(time(), 0)
+    (None, 'time')
+    """
+    if cancel is not None and cancel.is_cancelled():
+        return 'cancelled'
+    if time_limit is not None and time() - start >= time_limit:
+        return 'time'
+    if memory_limit is not None and memory_used() > memory_limit:
+        return 'memory'
+    return None
+
+class Buchberger:
+    """
+    The state of a Buchberger computation: the basis found so far, the pairs
+    still waiting to be reduced and some statistics.  The elements of the
+    basis are monic and distinct, and those whose leading monomial is
+    divisible by that of a later element are in self.redundant, see add().
+    step() reduces one pair, so a computation can be stopped after any
+    reduction, written to disk with checkpoint.save_checkpoint and picked up
+    again later.  The multiples of basis elements subtracted while reducing
+    are kept in self.cache (see multiples.py), which is not saved.  Redundant
+    elements keep their entries since they are still used for reducing, and
+    the entries are keyed by the elements, which never change, so the cache is
+    only cleared once the computation is finished.
+
+    With reduction='top' an S-polynomial is only reduced until its leading
+    term is irreducible (Polynomial.top_reduce), which is all the pairs
+    need; the tails are reduced at the end, and only for the elements that
+    stay in the basis, see tail_reduce.
+
+    ring is the ring of the polynomials, which is needed only when there are
+    none.
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> engine = Buchberger([x**2 - 2*x*y, x**2*y - 2*y**2 + x])
+    >>> engine.pairs
+    deque([(1, 0)])
+    >>> engine.step()
+    x*y^2 + 1/2*x + (-1)*y^2
+    >>> engine.pairs
+    deque([(2, 0), (2, 1)])
+    >>> engine.run()
+    [x + 4*y^3 + (-2)*y^2, y^5 + (-1/2)*y^4 + 1/2*y^3]
+    >>> len(engine.ideal), sorted(engine.redundant)
+    (5, [0, 1, 2])
+    >>> engine.stats
+    {'reductions': 7, 'zero_reductions': 4}
+    >>> engine = Buchberger([x**2 - 2*x*y, x**2*y - 2*y**2 + x], reduction='top')
+    >>> engine.run()
+    [x + 4*y^3 + (-2)*y^2, y^5 + (-1/2)*y^4 + 1/2*y^3]
+    >>> engine.stats
+    {'reductions': 7, 'zero_reductions': 4}
+    >>> Buchberger([2*x*y - 1, x*y - Rational(1, 2), x**2]).ideal
+    [x*y + (-1/2)*1, x^2]
+    >>> Buchberger([x], reduction='tail')
+    Traceback (most recent call last):
+    ValueError: unknown reduction 'tail'
+    """
+
+    def __init__(self, poly_list, reduction='full', ring=None):
+        if reduction not in ('full', 'top'):
+            raise ValueError, 'unknown reduction %r' % reduction
+        self.reduction = reduction
+        self.ring = poly_list[0].ring if ring is None and poly_list else ring
+        self.ideal = []
+        self.redundant = set()
+        self.pairs = deque()
+        self.stats = {'reductions': 0, 'zero_reductions': 0}
+        self.cache = MultipleCache()
+        seen = set()
+        for f in poly_list:
+            if not f.is_zero():
+                f = f * ~f.LC()
+                if f not in seen:
+                    seen.add(f)
+                    self.add(f)
+
+    def is_finished(self):
+        return not self.pairs
+
+    def add(self, f):
+        """
+        Appends the monic polynomial f to the basis with a pair for every
+        element that is not redundant.  The elements whose leading monomial
+        is divisible by LM(f) become redundant: they get no new pairs, and
+        their pairs with the elements that are not redundant are dropped,
+        except the one with f (Gebauer and Moeller).  A dropped pair (g, k)
+        is not needed since LM(f) divides lcm(LM(g), LM(k)) and the pairs
+        (g, f) and (f, k) are reduced.  Redundant elements are still used for
+        reducing: they come first in the basis and tend to be the shortest,
+        so dividing by them first keeps the remainders small.
+        """
+        n = len(self.ideal)
+        self.ideal.append(f)
+        self.pairs.extend([(n, j) for j in range(n) if j not in self.redundant])
+        LM = f.LM()
+        new = set([j for j in range(n) if j not in self.redundant and self.ideal[j].LM().is_divisible(LM)])
+        if new:
+            self.redundant |= new
+            keep = lambda i, j: not (i in new or j in new) or n in (i, j) or \
+                                (i in self.redundant and j in self.redundant)
+            self.pairs = deque([(i, j) for i, j in self.pairs if keep(i, j)])
+
+    def minimal(self):
+        """
+        The elements of the basis that are not redundant
+        """
+        return [f for k, f in enumerate(self.ideal) if k not in self.redundant]
+
+    def step(self):
+        """
+        Reduces the next pair, returns the new basis element, made monic, or None if the S-polynomial reduced to zero
+        """
+        i, j = self.pairs.popleft()
+        S = self.reduce(self.ideal[i].S_polynomial(self.ideal[j]))
+        self.stats['reductions'] += 1
+        if S.is_zero():
+            self.stats['zero_reductions'] += 1
+            return None
+        S = S * ~S.LC()
+        self.add(S)
+        return S
+
+    def reduce(self, S):
+        """
+        The remainder of the S-polynomial S by the basis, or with
+        reduction='top' the result of top_reduce
+        """
+        if self.reduction == 'top':
+            return S.top_reduce(self.ideal, self.cache)
+        return S.divide(self.ideal, self.cache)[1]
+
+    def run(self, checkpointer=None):
+        """
+        Reduces pairs until none are left and returns the basis.  If a
+        checkpoint.Checkpointer is given it is told about every reduction.
+        """
+        while self.pairs:
+            self.step()
+            if checkpointer is not None:
+                checkpointer.update(self)
+        if checkpointer is not None:
+            checkpointer.save(self)
+        if self.cache is not None:
+            self.cache.clear()
+        return self.basis()
+
+    def basis(self):
+        """
+        Returns the elements of the basis found so far that are not
+        redundant, with the tails reduced for reduction='top'
+        """
+        if self.reduction == 'top':
+            return tail_reduce(self.minimal())
+        return self.minimal()
+
+    def iterate(self, time_limit=None, memory_limit=None, cancel=None, progress=None):
+        """
+        Runs the computation as a generator of events:
+
+        ('basis', f)        a new basis element f, as soon as it is found
+        ('progress', stats) a copy of the statistics, every `progress' reductions
+        ('done', basis)     the finished Groebner basis
+        ('stopped', reason) the time_limit (seconds) or memory_limit
+                            (megabytes) was exceeded, or cancel was cancelled;
+                            reason is 'time', 'memory' or 'cancelled'
+
+        A stopped engine keeps its state, so it can be iterated or run again.
+
+        TESTS:
+
+        >>> from polynomial import *
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> engine = Buchberger([x**2 - 2*x*y, x**2*y - 2*y**2 + x])
+        >>> for event in engine.iterate(progress=5):
+        ...     print event
+        ('basis', x*y^2 + 1/2*x + (-1)*y^2)
+        ('basis', x + 4*y^3 + (-2)*y^2)
+        ('progress', {'reductions': 5, 'zero_reductions': 3})
+        ('basis', y^5 + (-1/2)*y^4 + 1/2*y^3)
+        ('done', [x + 4*y^3 + (-2)*y^2, y^5 + (-1/2)*y^4 + 1/2*y^3])
+        >>> token = CancellationToken()
+        >>> engine = Buchberger([x**2 - 2*x*y, x**2*y - 2*y**2 + x])
+        >>> for event in engine.iterate(cancel=token):
+        ...     print event
+        ...     token.cancel()
+        ('basis', x*y^2 + 1/2*x + (-1)*y^2)
+        ('stopped', 'cancelled')
+        >>> engine.stats
+        {'reductions': 1, 'zero_reductions': 0}
+        >>> list(engine.iterate(time_limit=0))
+        [('stopped', 'time')]
+        """
+        start = time()
+        while self.pairs:
+            reason = stop_reason(start, time_limit, memory_limit, cancel)
+            if reason is not None:
+                yield ('stopped', reason)
+                return
+            S = self.step()
+            if S is not None:
+                yield ('basis', S)
+            if progress and self.stats['reductions'] % progress == 0:
+                yield ('progress', dict(self.stats))
+        if self.cache is not None:
+            self.cache.clear()
+        yield ('done', self.basis())
+
+def groebner(poly_list, checkpointer=None, engine='buchberger', reduction='full', factor=False):
     """
     Takes a list of polynomials from the same ring and returns a Groebner basis
 
+    engine is 'buchberger' for the Buchberger engine above or 'signature' for
+    signature.SignatureBuchberger; only the former can be checkpointed, and
+    only the former takes reduction, see Buchberger.  In a ring with one
+    variable either engine returns the reduced basis, the monic GCD of the
+    polynomials, computed by univariate.gcd.  BooleanPolynomials go to
+    boolean.groebner, which returns the reduced basis in the boolean ring
+    whatever the engine.  Generators of degree at most 1
+    are replaced by their reduced row echelon form L (linear.echelon) and the
+    others by their remainders modulo L, which no longer contain the pivot
+    variables: the leading monomials of L are coprime to everything left, so
+    L together with a basis of the remainders is a Groebner basis, and only
+    the remainders go through S-polynomials.  With factor, the GCD g of the
+    polynomials (polygcd.gcd_list) is divided out first and the basis is g
+    times a basis of the quotients: multiplying by g multiplies every leading
+    monomial by that of g, so S-polynomials and reductions carry over.
+
     TESTS:
 
     >>> from polynomial import *
@@ -11,27 +283,163 @@ def groebner(poly_list):
     >>> x, y, z = R.variables()
     >>> F = [x - 2*x*y, x**3*y - 2*x**2 + y]
     >>> groebner(F)
-    [x^3 + (-2)*x*y, x^2*y + x + (-2)*y^2, x^2, 2*x*y, (-1)*x + 2*y^2, (-4)*y^3]
-    """
-
-    n = len(poly_list)
-    ideal = poly_list[:]
-    changed = True
-    while changed:
-        changed = False
-        for i in range(len(ideal)):
-            for j in range(len(ideal)):
-                if j <= (i - 1):
-                    S = (ideal[i].S_polynomial(ideal[j])).divide(ideal)[1]
-                    if not S.is_zero():
-                        ideal.append(S)
-                        changed = True
-                if changed:
-                    break
-            if changed:
+    [x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y, y^2 + (-1/2)*y]
+    >>> groebner(F, reduction='top')
+    [x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y, y^2 + (-1/2)*y]
+    >>> groebner(F, engine='signature')
+    [x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y, y^2 + (-1/2)*y]
+    >>> groebner([], engine='signature'), groebner([])
+    ([], [])
+    >>> groebner(F, engine='f4')
+    Traceback (most recent call last):
+    ValueError: unknown engine 'f4'
+    >>> x = PolynomialRing(QQ, 'x').variables()
+    >>> groebner([x**4 - 1, 2*x**6 - 2])
+    [x^2 + (-1)*1]
+    >>> x, y = PolynomialRing(QQ, 'xy').variables()
+    >>> F = [(x + y)*(x**2 - y), (x + y)*(x*y - 1)]
+    >>> groebner(F, factor=True)
+    [x^2 + (-1)*x*y^2 + x*y + (-1)*y^3, x*y^3 + (-1)*x + y^4 + (-1)*y]
+    >>> interreduce(groebner(F, factor=True)) == interreduce(groebner(F))
+    True
+    >>> groebner([x**2 + y**2 - 1, x - 2*y + 1, 3*y - x])
+    [1]
+    >>> groebner([x**2 + y**2 - 1, x - 2*y + 1])
+    [x + (-2)*y + 1, y^2 + (-4/5)*y]
+    >>> from boolean import BooleanPolynomialRing
+    >>> a, b, c = BooleanPolynomialRing('abc').variables()
+    >>> groebner([a*b + c, a + b + 1])
+    [c, a + b + 1]
+    >>> from compact import compact
+    >>> groebner([compact(x*y - 1), compact(x - y)])
+    Traceback (most recent call last):
+    TypeError: groebner takes Polynomials or BooleanPolynomials, not CompactPolynomial
+    """
+    if poly_list and not isinstance(poly_list[0], Polynomial):
+        import boolean
+        if not isinstance(poly_list[0], boolean.BooleanPolynomial):
+            name = poly_list[0].__class__.__name__
+            raise TypeError, 'groebner takes Polynomials or BooleanPolynomials, not %s' % name
+        assert checkpointer is None, 'boolean computations cannot be checkpointed'
+        return boolean.groebner(poly_list)
+    if factor and poly_list:
+        from polygcd import gcd_list, divide_exact
+        g = gcd_list(poly_list)
+        if g.LM().degree() > 0:
+            quotients = [divide_exact(f, g) for f in poly_list]
+            return [g * h for h in groebner(quotients, checkpointer, engine, reduction)]
+    if engine not in ('buchberger', 'signature'):
+        raise ValueError, 'unknown engine %r' % engine
+    if checkpointer is not None:
+        assert engine == 'buchberger', 'the signature engine cannot be checkpointed'
+        return Buchberger(poly_list, reduction).run(checkpointer)
+    L, rest = presolve(poly_list)
+    if not rest:
+        return L
+    if engine == 'buchberger':
+        G = Buchberger(rest, reduction).run()
+    else:
+        from signature import SignatureBuchberger
+        G = SignatureBuchberger(rest).run()
+    return combine(L, G)
+
+def presolve(poly_list):
+    """
+    The fast paths of groebner, for Polynomials: returns (L, rest) such that
+    combine(L, G) is a Groebner basis of the polynomials for any Groebner
+    basis G of rest.  L is the reduced basis and rest is empty in a ring
+    with one variable; otherwise L is the echelon form of the linear
+    generators and rest the nonzero remainders of the others by L.
+
+    >>> from polynomial import *
+    >>> x, y, z = PolynomialRing(QQ, 'xyz', 'grevlex').variables()
+    >>> presolve([x - y, x*y - y**2 + y + z, x**2 + z**3])
+    ([x + (-1)*y, y + z], [z^3 + z^2])
+    >>> presolve([x**2 + y*z, x*y - 1])
+    ([], [x^2 + y*z, x*y + (-1)*1])
+    """
+    if not poly_list:
+        return [], []
+    import univariate, linear
+    ring = poly_list[0].ring
+    if univariate.supports(ring):
+        return univariate.groebner(poly_list), []
+    if not linear.supports(ring):
+        return [], poly_list
+    L = linear.echelon([f for f in poly_list if linear.is_linear(f)])
+    if not L:
+        return [], poly_list
+    if L[0].LM().degree() == 0:
+        return L, []
+    rest = [f.divide(L)[1] for f in poly_list if not linear.is_linear(f)]
+    # remainders can be linear again
+    K, rest = presolve([f for f in rest if not f.is_zero()])
+    return combine(L, K), rest
+
+def combine(L, G):
+    """
+    L followed by G, or the unit of G if there is one
+    """
+    units = [g for g in G if g.LM().degree() == 0]
+    return units[:1] or L + G
+
+def interreduce(basis):
+    """
+    Turns a Groebner basis into the reduced Groebner basis: elements whose
+    leading monomial is divisible by that of another are dropped, the rest
+    are made monic, reduced by each other and sorted by leading monomial.
+    Two Groebner bases of the same ideal have the same reduced basis.
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> interreduce(groebner([x - 2*x*y, x**3*y - 2*x**2 + y]))
+    [y^2 + (-1/2)*y, x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y]
+    """
+    return sorted([r * ~r.LC() for r in tail_reduce(basis)], key=lambda f: f.LM())
+
+def tail_reduce(basis):
+    """
+    Drops the elements of a Groebner basis whose leading monomial is
+    divisible by that of another and reduces the others by each other.  The
+    elements keep their order and leading coefficients.
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> tail_reduce([x**2 + y**2, y**2 - y, x**2*y, 2*x**2 + y])
+    [x^2 + y, y^2 + (-1)*y]
+    """
+    G = [f for f in basis if not f.is_zero()]
+    minimal = []
+    for i in range(len(G)):
+        LM = G[i].LM()
+        for j in range(len(G)):
+            if j != i and LM.is_divisible(G[j].LM()) and (LM != G[j].LM() or j < i):
                 break
-    return ideal
-                                                                                                                                                                
+        else:
+            minimal.append(G[i])
+    if len(minimal) < 2:
+        return minimal
+    return [minimal[i].divide(minimal[:i] + minimal[i+1:])[1] for i in range(len(minimal))]
+
+def groebner_iter(poly_list, time_limit=None, memory_limit=None, cancel=None, progress=None, reduction='full'):
+    """
+    Streaming version of groebner, see Buchberger.iterate for the events
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> [f for event, f in groebner_iter([x - 2*x*y, x**3*y - 2*x**2 + y]) if event == 'basis']
+    [x^3 + (-4)*x^2 + 2*y, y^2 + (-1/2)*y]
+    """
+    return Buchberger(poly_list, reduction).iterate(time_limit, memory_limit, cancel, progress)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,209 @@
+# Saving and restoring the state of a Buchberger computation, so that a long computation survives a crash or preemption.
+# A checkpoint is the marshalled and zlib compressed tuple (ring, basis, pairs, stats, reduction), with the ring stored
+# as (field, variables, order), or None if the engine has no ring, and polynomials as tuples of exponent vectors and
+# integer coefficients.
+
+import os
+import marshal
+import zlib
+from time import time
+from collections import deque
+from polynomial import Polynomial
+from monomial import Monomial
+from polynomial_ring import PolynomialRing
+from coefficient_field import RationalField, PrimeField, FiniteField, QQ
+from rational import Rational
+from mod import Mod
+from finite_field import FFElement
+from buchberger import Buchberger
+
+def encode_field(field):
+    """
+    >>> encode_field(QQ)
+    ('QQ',)
+    >>> encode_field(PrimeField(7))
+    ('GF', 7)
+    >>> encode_field(FiniteField(3, 2))
+    ('GF', 3, 2)
+    """
+    if isinstance(field, RationalField):
+        return ('QQ',)
+    elif isinstance(field, PrimeField):
+        return ('GF', field.p)
+    elif isinstance(field, FiniteField):
+        return ('GF', field.p, field.k)
+    else:
+        raise ValueError, 'cannot encode coefficient field %s' % field
+
+def decode_field(code):
+    """
+    >>> decode_field(('GF', 7)), decode_field(('GF', 3, 2))
+    (GF(7), GF(3^2))
+    """
+    if code[0] == 'QQ':
+        return QQ
+    elif code[0] == 'GF' and len(code) == 3:
+        return FiniteField(code[1], code[2])
+    elif code[0] == 'GF':
+        return PrimeField(code[1])
+    else:
+        raise ValueError, 'unknown coefficient field %s' % (code,)
+
+def encode_coeff(c):
+    if isinstance(c, Rational):
+        return (c.n, c.d)
+    elif isinstance(c, (Mod, FFElement)):
+        return c.x
+    else:
+        raise ValueError, 'cannot encode coefficient %s' % c
+
+def decode_coeff(field, c):
+    if isinstance(field, RationalField):
+        return Rational(c[0], c[1])
+    elif isinstance(field, FiniteField):
+        return field.element(c)
+    else:
+        return field(c)
+
+def encode_polynomial(f):
+    """
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> encode_polynomial(x**2 - 3*y)
+    (((0, 1), (2, 0)), ((-3, 1), (1, 1)))
+    """
+    return (tuple([m.degrees for m in f.monomials]), tuple([encode_coeff(c) for c in f.coeffs]))
+
+def decode_polynomial(ring, code):
+    """
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> decode_polynomial(R, (((0, 1), (2, 0)), ((-3, 1), (1, 1))))
+    x^2 + (-3)*y
+    """
+    monomials, coeffs = code
+    return Polynomial(ring, [Monomial(ring, m) for m in monomials], [decode_coeff(ring.coeff_ring, c) for c in coeffs])
+
+def save_checkpoint(engine, path):
+    """
+    Writes the state of a Buchberger engine to path.  The file is written
+    next to path first and then renamed, so an interrupted save never
+    destroys the previous checkpoint.
+    """
+    ring = engine.ring
+    state = (None if ring is None else (encode_field(ring.coeff_ring), tuple(ring.var_list), ring.order),
+             tuple([encode_polynomial(f) for f in engine.ideal]),
+             tuple(engine.pairs),
+             engine.stats,
+             engine.reduction)
+    data = zlib.compress(marshal.dumps(state))
+    f = open(path + '.tmp', 'wb')
+    try:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    finally:
+        f.close()
+    os.rename(path + '.tmp', path)
+
+def load_checkpoint(path, ring=None):
+    """
+    Returns the Buchberger engine saved in path, ready to be run again.
+    Pass ring to get the basis in an existing ring rather than a new one.
+
+    TESTS:
+
+    >>> import tempfile
+    >>> from buchberger import groebner
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> F = [x**2*y - z, x*y**2 + y*z - x, z**2 - x*y]
+    >>> path = tempfile.mktemp()
+    >>> engine = Buchberger(F)
+    >>> for i in range(5):
+    ...     S = engine.step()
+    >>> save_checkpoint(engine, path)
+    >>> resumed = load_checkpoint(path, R)
+    >>> resumed.stats
+    {'reductions': 5, 'zero_reductions': 0}
+    >>> resumed.run() == groebner(F)
+    True
+    >>> engine = Buchberger(F, reduction='top')
+    >>> S = engine.step()
+    >>> save_checkpoint(engine, path)
+    >>> resumed = load_checkpoint(path)
+    >>> resumed.reduction, resumed.run() == groebner(F, reduction='top')
+    ('top', True)
+    >>> save_checkpoint(Buchberger([], ring=R), path)
+    >>> resumed = load_checkpoint(path)
+    >>> resumed.ring, resumed.run()
+    (Polynomial Ring in 3 variable(s), x, y, z over QQ, [])
+    >>> os.remove(path)
+    """
+    f = open(path, 'rb')
+    try:
+        data = f.read()
+    finally:
+        f.close()
+    state = marshal.loads(zlib.decompress(data))
+    ring_code, basis, pairs, stats = state[:4]
+    reduction = state[4] if len(state) > 4 else 'full'
+    if ring is None and ring_code is not None:
+        order = ring_code[2] if len(ring_code) > 2 else 'lex'
+        ring = PolynomialRing(decode_field(ring_code[0]), list(ring_code[1]), order)
+    # adding the basis in order marks the same elements redundant as the saved run did
+    engine = Buchberger([decode_polynomial(ring, f) for f in basis], reduction, ring)
+    engine.pairs = deque(pairs)
+    engine.stats = stats
+    return engine
+
+class Checkpointer:
+    """
+    Saves a Buchberger engine to path every `seconds' seconds or every
+    `reductions' reductions, whichever comes first.  Either may be None.
+
+    TESTS:
+
+    >>> import tempfile
+    >>> from buchberger import groebner
+    >>> R = PolynomialRing(PrimeField(7), 'xyz')
+    >>> x, y, z = R.variables()
+    >>> F = [x**2*y - z, x*y**2 + y*z - x, z**2 - x*y]
+    >>> path = tempfile.mktemp()
+    >>> G = groebner(F, Checkpointer(path, reductions=3))
+    >>> engine = load_checkpoint(path, R)
+    >>> engine.is_finished()
+    True
+    >>> engine.basis() == G
+    True
+    >>> os.remove(path)
+    """
+
+    def __init__(self, path, seconds=None, reductions=None):
+        self.path = path
+        self.seconds = seconds
+        self.reductions = reductions
+        self.saves = 0
+        self._last_time = time()
+        self._last_reductions = None
+
+    def update(self, engine):
+        """
+        Saves the engine if a checkpoint is due
+        """
+        if self._last_reductions is None:
+            self._last_reductions = engine.stats['reductions'] - 1
+        if self.reductions is not None and engine.stats['reductions'] - self._last_reductions >= self.reductions:
+            self.save(engine)
+        elif self.seconds is not None and time() - self._last_time >= self.seconds:
+            self.save(engine)
+
+    def save(self, engine):
+        save_checkpoint(engine, self.path)
+        self.saves += 1
+        self._last_time = time()
+        self._last_reductions = engine.stats['reductions']
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,6 +1,6 @@
 from rational import Rational
 from mod import Mod
-from random import randint
+import random
 
 class RationalField:
     def __call__(self, x):
@@ -14,11 +14,56 @@ class RationalField:
     def __repr__(self):
         return 'QQ'
 
+    def random_element(self, rng=random, bound=9):
+        """
+        Returns a random rational with numerator and denominator of absolute value at most `bound'
+
+        >>> c = QQ.random_element(random.Random(1))
+        >>> abs(c.n) <= 9 and 0 < c.d <= 9
+        True
+        """
+        return Rational(rng.randint(-bound, bound), rng.randint(1, bound))
+
 class PrimeField:
 
-    def __init__(self, p):
+    # fields up to this size keep a table of all inverses
+    INVERSE_TABLE_SIZE = 2**20
+
+    def __init__(self, p, vectorized=False):
+        """
+        With vectorized, long polynomials are divided as NumPy arrays, see
+        gfp_array.py; products of two coefficients must then fit in an int64
+
+        >>> PrimeField(2**61 - 1, vectorized=True)
+        Traceback (most recent call last):
+        ValueError: vectorized prime fields need p < 2**31
+        """
+        if vectorized and p >= 2**31:
+            raise ValueError, 'vectorized prime fields need p < 2**31'
         self.p = p
-        
+        self.vectorized = vectorized
+        self._inverses = None
+
+    def inverse(self, x):
+        """
+        Returns the inverse of the integer x modulo p as an integer, from a
+        table built on first use if the field is small enough
+
+        >>> F7 = PrimeField(7)
+        >>> [F7.inverse(x) for x in range(1, 7)]
+        [1, 4, 5, 2, 3, 6]
+        >>> PrimeField(2147483647).inverse(2)
+        1073741824
+        """
+        if self.p > self.INVERSE_TABLE_SIZE:
+            return pow(x, self.p - 2, self.p)
+        if self._inverses is None:
+            inverses = [0, 1]
+            for i in range(2, self.p):
+                inverses.append(-(self.p / i) * inverses[self.p % i] % self.p)
+            self._inverses = inverses
+        return self._inverses[x % self.p]
+
     def __call__(self, x):
         """
         >>> F7 = PrimeField(7)
@@ -44,12 +89,82 @@ class PrimeField:
     def __repr__(self):
         return 'GF(%s)' %self.p
 
-    def random_element(self):
+    def random_element(self, rng=random):
+        """
+        >>> F7 = PrimeField(7)
+        >>> F7.random_element(random.Random(2))
+        Mod(6, 7)
+        """
+        return Mod(rng.randint(0, self.p - 1), self.p)
+
+class FiniteField:
+    """
+    GF(p^k) for a prime p, with elements finite_field.FFElement: every
+    product, quotient and inverse is exponent arithmetic and every sum one
+    lookup in a table of Zech logarithms, see finite_field.py.  name is how
+    the generator prints.
+
+    >>> F = FiniteField(2, 4)
+    >>> F
+    GF(2^4)
+    >>> a = F.gen()
+    >>> a**4 + a + 1
+    0
+    >>> from polynomial import *
+    >>> R = PolynomialRing(F, 'xy')
+    >>> x, y = R.variables()
+    >>> (a*x + y)**2
+    a^2*x^2 + y^2
+    >>> FiniteField(6, 2)
+    Traceback (most recent call last):
+    ValueError: 6 is not a prime
+    """
+
+    def __init__(self, p, k, name='a'):
+        from grob_check import is_prime
+        from finite_field import tables
+        if not is_prime(p):
+            raise ValueError, '%d is not a prime' % p
+        self.p = p
+        self.k = k
+        self.q = p**k
+        self.name = name
+        self.modulus, self._exp, self._log, self._zech = tables(p, k)
+        self._minus_one = 0 if p == 2 else (self.q - 1) / 2
+
+    def __call__(self, x):
         """
-        >>> 
+        >>> F = FiniteField(5, 2)
+        >>> F(7), F(Mod(3, 5)), F(F(2)) == F(2)
+        (2, 3, True)
         """
-        return Mod(randint(0, self.p - 1), self.p)
-    
+        from finite_field import FFElement, _ffelement
+        if isinstance(x, FFElement) and x.field.q == self.q:
+            return x
+        elif isinstance(x, Mod) and x.p == self.p:
+            x = x.x
+        elif not isinstance(x, (int, long)):
+            raise ValueError, "cannot coerce into finite field"
+        x %= self.p
+        return _ffelement(self._log[x] + 1 if x else 0, self)
+
+    def element(self, x):
+        """
+        The element with the representative x, see finite_field.py
+        """
+        from finite_field import _ffelement
+        assert 0 <= x < self.q
+        return _ffelement(x, self)
+
+    def gen(self):
+        return self.element(2 if self.q > 2 else 1)
+
+    def __repr__(self):
+        return 'GF(%d^%d)' % (self.p, self.k)
+
+    def random_element(self, rng=random):
+        return self.element(rng.randint(0, self.q - 1))
+
 QQ = RationalField()
         
 if __name__ == '__main__':
@@ -0,0 +1,315 @@
+# A compact layout for polynomials with many terms.  A Polynomial holds a list of Monomial instances, each with its own
+# dictionary, degree tuple and ring pointer, and a list of coefficient instances.  A CompactPolynomial holds
+# one array of exponents, n entries per term (array('H') while every exponent is below 2**16, array('I') or array('L')
+# above), and one array of coefficients: array('l') of representatives in [0, p) over GF(p), and a list of Rationals
+# over QQ, whose numerators and denominators are unbounded.  Terms are stored in the same increasing order as
+# Polynomial.monomials.  The monomials and coeffs attributes are views which create Monomial and Mod objects only for
+# the terms that are accessed.
+
+from array import array
+from heapq import heapify, heappush, heappop
+from monomial import Monomial, _monomial
+from coefficient_field import PrimeField
+from mod import _mod
+import orders
+
+def _exponent_array(exps):
+    """
+    Returns an array holding the integers exps in the smallest of the types H, I and L
+
+    >>> _exponent_array([1, 2, 3]).typecode
+    'H'
+    >>> _exponent_array([1, 2**20]).typecode
+    'I'
+    """
+    largest = max(exps) if exps else 0
+    for typecode in 'HIL':
+        if largest < 1 << (8 * array(typecode).itemsize):
+            return array(typecode, exps)
+    raise OverflowError, 'exponent %d is too large' % largest
+
+class MonomialView(object):
+    """
+    The monomials of a CompactPolynomial, created on access
+    """
+    __slots__ = ('f',)
+
+    def __init__(self, f):
+        self.f = f
+
+    def __len__(self):
+        return len(self.f._coeffs)
+
+    def __getitem__(self, i):
+        f = self.f
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError, 'monomial index out of range'
+        n = f.ring.num_vars()
+        return _monomial(f.ring, tuple(f._exps[i*n:(i+1)*n]))
+
+class CoefficientView(object):
+    """
+    The coefficients of a CompactPolynomial as elements of the coefficient field, created on access
+    """
+    __slots__ = ('f',)
+
+    def __init__(self, f):
+        self.f = f
+
+    def __len__(self):
+        return len(self.f._coeffs)
+
+    def __getitem__(self, i):
+        f = self.f
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        c = f._coeffs[i]
+        field = f.ring.coeff_ring
+        return _mod(c, field.p) if isinstance(field, PrimeField) else c
+
+class CompactPolynomial(object):
+    """
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(7), 'xyz')
+    >>> x, y, z = R.variables()
+    >>> f = compact(3*x**2*y + 5*z + 1)
+    >>> f
+    3*x^2*y + 5*z + 1
+    >>> f._exps, f._coeffs
+    (array('H', [0, 0, 0, 0, 0, 1, 2, 1, 0]), array('l', [1, 5, 3]))
+    >>> f.monomials[-1], f.coeffs[-1]
+    (x^2*y, Mod(3, 7))
+    >>> len(f), f.LM(), f.LC()
+    (3, x^2*y, Mod(3, 7))
+    """
+    __slots__ = ('ring', '_exps', '_coeffs')
+
+    def __init__(self, ring, exps, coeffs):
+        """
+        exps is an exponent array with ring.num_vars() entries per term and
+        coeffs the coefficient array, in increasing order of monomials and
+        without zero coefficients
+        """
+        self.ring = ring
+        self._exps = exps
+        self._coeffs = coeffs
+
+    def _is_prime_field(self):
+        return isinstance(self.ring.coeff_ring, PrimeField)
+
+    def __len__(self):
+        return len(self._coeffs)
+
+    @property
+    def monomials(self):
+        return MonomialView(self)
+
+    @property
+    def coeffs(self):
+        return CoefficientView(self)
+
+    def degrees(self):
+        """
+        Returns the degree tuples of the terms, in increasing order
+        """
+        n = self.ring.num_vars()
+        return zip(*[self._exps[k::n] for k in range(n)]) if n > 1 else [(e,) for e in self._exps]
+
+    def terms(self):
+        """
+        Returns a list of (degrees, c) in increasing order, with c an integer
+        representative over GF(p) and a Rational over QQ
+        """
+        return zip(self.degrees(), self._coeffs)
+
+    def is_zero(self):
+        return not self._coeffs
+
+    def LM(self):
+        return self.monomials[-1]
+
+    def LC(self):
+        return self.coeffs[-1]
+
+    def to_polynomial(self):
+        from polynomial import _polynomial
+        return _polynomial(self.ring, list(self.monomials), list(self.coeffs))
+
+    def __repr__(self):
+        return repr(self.to_polynomial())
+
+    def __eq__(self, other):
+        return self.ring is other.ring and self.terms() == other.terms()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __neg__(self):
+        if self._is_prime_field():
+            p = self.ring.coeff_ring.p
+            return CompactPolynomial(self.ring, self._exps, array('l', [p - c for c in self._coeffs]))
+        return CompactPolynomial(self.ring, self._exps, [-c for c in self._coeffs])
+
+    def __add__(self, other):
+        """
+        >>> from polynomial import *
+        >>> R = PolynomialRing(QQ, 'xy')
+        >>> x, y = R.variables()
+        >>> compact(x**2 + y) + compact(3*y - x**2 + 1)
+        4*y + 1
+        """
+        terms = dict(self.terms())
+        zero = self.ring.coeff_ring(0) if not self._is_prime_field() else 0
+        for e, c in other.terms():
+            terms[e] = terms.get(e, zero) + c
+        return from_terms(self.ring, terms)
+
+    def __sub__(self, other):
+        """
+        >>> from polynomial import *
+        >>> R = PolynomialRing(PrimeField(5), 'xy')
+        >>> x, y = R.variables()
+        >>> compact(x**2 + y) - compact(3*y - x**2 + 1)
+        2*x^2 + 3*y + 4*1
+        """
+        return self + -other
+
+    def __mul__(self, other):
+        """
+        >>> from polynomial import *
+        >>> from rational import Rational
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> f, g = x + Rational(1, 2)*y*z - 3, x*y - z + 2
+        >>> compact(f) * compact(g) == compact(f * g)
+        True
+        """
+        terms = {}
+        zero = self.ring.coeff_ring(0) if not self._is_prime_field() else 0
+        right = other.terms()
+        for a, c in self.terms():
+            for b, d in right:
+                e = tuple([i + j for i, j in zip(a, b)])
+                terms[e] = terms.get(e, zero) + c * d
+        return from_terms(self.ring, terms)
+
+    def divide(self, divisors):
+        """
+        Same as Polynomial.divide, for CompactPolynomial divisors.  The
+        dividend is kept as a dictionary of terms with a heap of its monomials,
+        so each reduction step only touches the terms of one divisor.
+
+        >>> from polynomial import *
+        >>> R = PolynomialRing(PrimeField(32003), 'xyz')
+        >>> x, y, z = R.variables()
+        >>> f = (x + 2*y + z + 3)**5
+        >>> F = [x**2*y - z**2 + 1, y**3 - 2*x*z, x*z**2 + y + 5]
+        >>> quots, r = compact(f).divide([compact(g) for g in F])
+        >>> ([q.to_polynomial() for q in quots], r.to_polynomial()) == f.divide(F)
+        True
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> compact(x**2*y + x*y**2 + y**2).divide([compact(x*y + (-1)), compact(y**2 - 1)])
+        ([x + y, 1], x + y + 1)
+        >>> R = PolynomialRing(QQ, 'xyz', 'grevlex')
+        >>> x, y, z = R.variables()
+        >>> f, F = (x + y*z - 2)**4, [x**2 - y, y*z**2 - x + 1]
+        >>> quots, r = compact(f).divide([compact(g) for g in F])
+        >>> ([q.to_polynomial() for q in quots], r.to_polynomial()) == f.divide(F)
+        True
+        """
+        field = self.ring.coeff_ring
+        p = field.p if self._is_prime_field() else None
+        zero = 0 if p else field(0)
+        divs = []
+        for g in divisors:
+            terms = g.terms()
+            if terms:
+                lead, lc = terms[-1]
+                divs.append((lead, field.inverse(lc) if p else ~lc, terms[:-1]))
+            else:
+                divs.append((None, None, None))
+        if all([lead is None for lead, inverse, tail in divs]):
+            raise ZeroDivisionError
+        key = orders.sort_key(self.ring)
+        terms = dict(self.terms())
+        heap = [(tuple([-i for i in key(e)]), e) for e in terms]
+        heapify(heap)
+        quots = [{} for g in divisors]
+        remainder = {}
+        while heap:
+            e = heappop(heap)[1]
+            c = terms.pop(e)
+            if p:
+                c %= p
+            if c == zero:
+                continue
+            for i in range(len(divs)):
+                lead, inverse, tail = divs[i]
+                if lead is not None and all([a >= b for a, b in zip(e, lead)]):
+                    m = [a - b for a, b in zip(e, lead)]
+                    q = c * inverse % p if p else c * inverse
+                    quots[i][tuple(m)] = q
+                    for d, dc in tail:
+                        t = tuple([a + b for a, b in zip(m, d)])
+                        if t in terms:
+                            terms[t] = terms[t] - q * dc
+                        else:
+                            terms[t] = -q * dc
+                            heappush(heap, (tuple([-a for a in key(t)]), t))
+                    break
+            else:
+                remainder[e] = c
+        return [from_terms(self.ring, q) for q in quots], from_terms(self.ring, remainder)
+
+def from_terms(ring, terms):
+    """
+    Returns the CompactPolynomial with the terms of the dictionary {degrees: c}, dropping zero coefficients
+    """
+    field = ring.coeff_ring
+    key = orders.sort_key(ring)
+    if isinstance(field, PrimeField):
+        p = field.p
+        items = [(e, c % p) for e, c in terms.iteritems() if c % p]
+        items.sort(key=lambda item: key(item[0]))
+        coeffs = array('l', [c for e, c in items])
+    else:
+        items = [(e, c) for e, c in terms.iteritems() if c]
+        items.sort(key=lambda item: key(item[0]))
+        coeffs = [c for e, c in items]
+    exps = []
+    for e, c in items:
+        exps.extend(e)
+    return CompactPolynomial(ring, _exponent_array(exps), coeffs)
+
+def compact(f):
+    """
+    Returns the Polynomial f as a CompactPolynomial
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> compact(x**70000 - y).to_polynomial() == x**70000 - y
+    True
+    >>> compact(R(0)).is_zero()
+    True
+    """
+    exps = []
+    for m in f.monomials:
+        exps.extend(m.degrees)
+    if isinstance(f.ring.coeff_ring, PrimeField):
+        coeffs = array('l', [c.x for c in f.coeffs])
+    else:
+        coeffs = list(f.coeffs)
+    return CompactPolynomial(f.ring, _exponent_array(exps), coeffs)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
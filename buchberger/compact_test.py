@@ -0,0 +1,46 @@
+# Compares the memory use and the speed of multiplication and division of Polynomial and CompactPolynomial.
+
+from polynomial import *
+from compact import compact
+from timing import compare, Table
+import sys
+
+def size(obj, seen=None):
+    """
+    Bytes used by obj and everything it refers to, except rings, which are shared
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, PolynomialRing):
+        return 0
+    seen.add(id(obj))
+    total = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        total += size(obj.__dict__, seen)
+    if hasattr(obj, '__slots__'):
+        total += sum([size(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name)])
+    if isinstance(obj, dict):
+        total += sum([size(k, seen) + size(v, seen) for k, v in obj.items()])
+    elif isinstance(obj, (list, tuple)):
+        total += sum([size(x, seen) for x in obj])
+    return total
+
+def main():
+    cases = []
+    for K in [PrimeField(32003), QQ]:
+        R = PolynomialRing(K, 'xyzw')
+        x, y, z, w = R.variables()
+        f = (x + 2*y + 3*z + 5*w + 7)**8
+        g = x**2 - 3*y*z + w + 1
+        F = [x**3*y - z**2 + 1, y**4 - 2*x*w, z**3 + y*w + 5, w**2 - x + 2]
+        cf, cg, cF = compact(f), compact(g), [compact(h) for h in F]
+        print '%s, %d terms: Polynomial %d bytes, CompactPolynomial %d bytes' % (K, len(f.monomials), size(f), size(cf))
+        cases.append((K, f, g, F, cf, cg, cF))
+    table = Table('Polynomial', 'Compact')
+    for K, f, g, F, cf, cg, cF in cases:
+        compare(table, '%s multiply' % K, lambda: f * g, lambda: cf * cg, 3, lambda h, ch: compact(h) == ch)
+        compare(table, '%s divide' % K, lambda: f.divide(F)[1], lambda: cf.divide(cF)[1],
+                same=lambda r, cr: compact(r) == cr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+# Global validation switch.  Internal arithmetic builds its Polynomial, Monomial and Mod results with unchecked
+# constructors (polynomial._polynomial, monomial._monomial, mod._mod), which trust that the data they are given is
+# already valid: monomials distinct, sorted and of the ring's length, no zero coefficients, representatives in [0, p).
+# With CHECKS = True these constructors go through the public ones and verify all of it, and the arithmetic of Mod,
+# Monomial and FFElement checks that both operands come from the same field or ring, which is how the doctests and the
+# fuzz harness should be run when the arithmetic is changed.
+
+CHECKS = False
@@ -0,0 +1,36 @@
+# Times polynomial arithmetic and Groebner bases with debug.CHECKS on and with the unchecked internal constructors, and
+# checks that both give the same results.
+
+from polynomial import *
+from buchberger import groebner
+from random_ideals import FAMILIES
+from timing import timed, Table
+import debug
+
+def benchmarks():
+    for K in [PrimeField(32003), QQ]:
+        R = PolynomialRing(K, 'xyz')
+        x, y, z = R.variables()
+        f = (x + 2*y + 3*z + 5)**6
+        g = (x*y - 3*z + 1)**3
+        F = [x**2*y - z**2 + 1, y**3 - 2*x*z, x*z**2 + y + 5]
+        yield '%s f + g' % K, lambda: f + g
+        yield '%s f * g' % K, lambda: f * g
+        yield '%s f.divide(F)' % K, lambda: f.divide(F)
+        for family in sorted(FAMILIES):
+            ideals = [FAMILIES[family](R, seed) for seed in range(5)]
+            yield '%s groebner %s' % (K, family), lambda ideals=ideals: [groebner(I) for I in ideals]
+
+def main():
+    table = Table('checked', 'unchecked')
+    for name, f in benchmarks():
+        debug.CHECKS = True
+        expected, checked = timed(f, 3)
+        debug.CHECKS = False
+        result, unchecked = timed(f, 3)
+        assert result == expected, '%s: the unchecked result differs' % name
+        table.row(name, checked, unchecked)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+# Elimination ideals.  eliminate(ideal, variables) returns generators of the intersection of the ideal with the
+# polynomial ring in the other variables, without computing a full lex Groebner basis:
+#
+# - the variables to eliminate are moved to the front of a new ring with the block order for them (see orders.py);
+# - unless the generators are homogeneous they are homogenized with a new variable _h, last in the ring;
+# - a Groebner basis of the homogeneous system is computed degree by degree.  Pairs are reduced in increasing degree of
+#   their lcm, so once all pairs of degree d are done the basis is complete up to degree d.  Pairs with coprime leading
+#   monomials are skipped (Buchberger's first criterion).
+#
+# The degree by degree computation can stop early:
+#
+# - with degree=d only generators and pairs of degree at most d are used.  For homogeneous input the result then holds
+#   every generator of the elimination ideal of degree at most d; for inhomogeneous input the generators whose
+#   homogenization has degree at most d;
+# - an element _h^k, or a constant, means that the ideal is the whole ring, and the computation stops there.
+#
+# Setting _h = 1 in the homogeneous basis gives a Groebner basis of the ideal for the block order, and its elements free
+# of the eliminated variables are a Groebner basis of the elimination ideal.  They are returned interreduced, in a ring
+# of the remaining variables with grevlex order.
+
+from heapq import heappush, heappop
+from polynomial import Polynomial
+from monomial import Monomial
+from polynomial_ring import PolynomialRing
+from buchberger import interreduce
+
+def is_homogeneous(f):
+    """
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> is_homogeneous(x**2 - y*z), is_homogeneous(x**2 - y)
+    (True, False)
+    """
+    return len(set([m.degree() for m in f.monomials])) <= 1
+
+def transfer(f, ring, degree=None):
+    """
+    Returns f in ring, matching variables by name.  Variables of f that ring
+    does not have are set to 1; with degree, the last variable of ring
+    homogenizes f to that degree.
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> S = PolynomialRing(QQ, ['z', 'y', 'x', 'h'], 'grevlex')
+    >>> transfer(x**2 - y*z + 1, S, 2)
+    (-1)*z*y + x^2 + h^2
+    >>> transfer(x*y**2 + y, PolynomialRing(QQ, 'x'))
+    x + 1
+    """
+    if f.ring is ring and degree is None:
+        return f
+    n = ring.num_vars()
+    positions = [ring.var_list.index(v) if v in ring.var_list else None for v in f.ring.var_list]
+    monomials = []
+    for m in f.monomials:
+        e = [0] * n
+        for i in range(len(positions)):
+            if positions[i] is not None:
+                e[positions[i]] = m.degrees[i]
+        if degree is not None:
+            e[-1] = degree - m.degree()
+        monomials.append(Monomial(ring, e))
+    terms = sorted(zip(monomials, f.coeffs), key=lambda term: term[0])
+    return Polynomial(ring, [m for m, c in terms], [c for m, c in terms])
+
+def homogeneous_groebner(generators, degree=None, homogenized=False, stats=None):
+    """
+    Returns a Groebner basis of the ideal of the homogeneous generators,
+    computed in increasing degree; with degree only up to that degree.  The
+    basis is returned as soon as it contains a constant or, if the last
+    variable was added by homogenizing, a power of the last variable.
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz', 'grevlex')
+    >>> x, y, z = R.variables()
+    >>> F = [x**2 - y*z, x*y - z**2]
+    >>> homogeneous_groebner(F)
+    [x^2 + (-1)*y*z, x*y + (-1)*z^2, y^2*z + (-1)*x*z^2]
+    >>> homogeneous_groebner(F, degree=2)
+    [x^2 + (-1)*y*z, x*y + (-1)*z^2]
+    """
+    if stats is None:
+        stats = {}
+    stats.update({'reductions': 0, 'zero_reductions': 0, 'product_criterion': 0, 'truncated': 0})
+    basis = []
+    queue = []
+    count = [0]
+
+    def push(d, f, i, j):
+        heappush(queue, (d, count[0], f, i, j))
+        count[0] += 1
+
+    for f in generators:
+        if not f.is_zero():
+            push(f.LM().degree(), f, None, None)
+    while queue:
+        d, c, f, i, j = heappop(queue)
+        if degree is not None and d > degree:
+            stats['truncated'] = len(queue) + 1
+            break
+        if f is None:
+            f = basis[i].S_polynomial(basis[j])
+        r = f.divide(basis)[1] if basis else f
+        stats['reductions'] += 1
+        if r.is_zero():
+            stats['zero_reductions'] += 1
+            continue
+        r = r * ~r.LC()
+        LM = r.LM()
+        for k in range(len(basis)):
+            L = LM.lcm(basis[k].LM())
+            if L.degree() == LM.degree() + basis[k].LM().degree():
+                stats['product_criterion'] += 1
+            else:
+                push(L.degree(), None, len(basis), k)
+        basis.append(r)
+        if LM.degree() == 0 or homogenized and LM.degree() == LM.degrees[-1]:
+            break
+    return basis
+
+def eliminate(ideal, variables, degree=None, ring=None):
+    """
+    Returns the reduced Groebner basis, for grevlex, of the intersection of
+    the ideal generated by `ideal' with the polynomial ring in the variables
+    not in `variables'.  The variables are given by name or as polynomials.
+    See the top of the file for degree.  ring is the ring of the
+    polynomials, which is needed only when there are none.
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'txy')
+    >>> t, x, y = R.variables()
+    >>> E = eliminate([x - t**2, y - t**3], ['t'])
+    >>> E
+    [x^3 + (-1)*y^2]
+    >>> E[0].ring
+    Polynomial Ring in 2 variable(s), x, y over QQ with grevlex order
+    >>> eliminate([x - t**2, y - t**3], [t], degree=2)
+    []
+    >>> eliminate([t*x - 1, x], ['x'])
+    [1]
+    >>> R = PolynomialRing(PrimeField(32003), 'xyzw')
+    >>> x, y, z, w = R.variables()
+    >>> eliminate([x*z - y**2, x*w - y*z, y*w - z**2], ['y'])
+    [z^3 + 32002*x*w^2]
+    >>> eliminate([R(0)], ['y']), eliminate([], ['y'], ring=R)
+    ([], [])
+    """
+    if ring is None:
+        if not ideal:
+            raise ValueError, 'an empty ideal needs its ring'
+        ring = ideal[0].ring
+    eliminated = []
+    for v in variables:
+        if isinstance(v, str):
+            eliminated.append(ring.var_list.index(v))
+        else:
+            eliminated.append(list(v.LM().degrees).index(1))
+    kept = [i for i in range(ring.num_vars()) if i not in eliminated]
+    order = eliminated + kept
+    ideal = [f for f in ideal if not f.is_zero()]
+    if not ideal:
+        return []
+    homogeneous = all([is_homogeneous(f) for f in ideal])
+    names = [ring.var_list[i] for i in order]
+    if not homogeneous:
+        names.append('_h')
+    E = PolynomialRing(ring.coeff_ring, names, 'block%d' % len(eliminated))
+    if homogeneous:
+        generators = [transfer(f, E) for f in ideal]
+    else:
+        generators = [transfer(f, E, max([m.degree() for m in f.monomials])) for f in ideal]
+    basis = homogeneous_groebner(generators, degree, not homogeneous)
+
+    S = PolynomialRing(ring.coeff_ring, [ring.var_list[i] for i in kept], 'grevlex')
+    k = len(eliminated)
+    result = []
+    for g in basis:
+        if any(g.LM().degrees[:k]):
+            continue
+        result.append(transfer(g, S))
+    return interreduce(result)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,119 @@
+# Evaluation of a polynomial at a batch of points with NumPy.  The points are the rows of a 2D array with one column per
+# variable.  For every variable only the powers that occur as exponents in the polynomial are tabulated, each one from
+# the previous by square and multiply, every term is then the coefficient times one row of each table, and the values
+# are the sums over the terms.  Over GF(p) the arithmetic is on int64 representatives reduced mod p after every product,
+# so p has to be below 2**31; over QQ the coefficients and points are converted to floats.
+
+import numpy
+from coefficient_field import PrimeField
+
+def _power(column, e, p):
+    """
+    Returns column**e elementwise, reduced mod p unless p is None
+    """
+    result = numpy.ones_like(column)
+    while e:
+        if e & 1:
+            result = result * column if p is None else result * column % p
+        e >>= 1
+        if e:
+            column = column * column if p is None else column * column % p
+    return result
+
+def power_tables(points, exps, p=None):
+    """
+    Returns (tables, index): tables[i][index[t, i]] is column i of points
+    raised to exps[t, i], with one table row per distinct exponent of
+    variable i
+
+    >>> points = numpy.array([[2, 3], [5, 7]])
+    >>> exps = numpy.array([[0, 4], [3, 0], [3, 1]])
+    >>> tables, index = power_tables(points, exps)
+    >>> tables[0].tolist(), index[:, 0].tolist()
+    ([[1, 1], [8, 125]], [0, 1, 1])
+    >>> tables[1].tolist(), index[:, 1].tolist()
+    ([[1, 1], [3, 7], [81, 2401]], [2, 0, 1])
+    """
+    tables = []
+    index = numpy.empty(exps.shape, dtype=numpy.int64)
+    for i in range(exps.shape[1]):
+        column = points[:, i]
+        needed = numpy.unique(exps[:, i])
+        table = numpy.empty((len(needed), len(column)), dtype=column.dtype)
+        current = numpy.ones_like(column)
+        previous = 0
+        for k in range(len(needed)):
+            e = int(needed[k])
+            step = _power(column, e - previous, p)
+            current = current * step if p is None else current * step % p
+            table[k] = current
+            previous = e
+        tables.append(table)
+        index[:, i] = numpy.searchsorted(needed, exps[:, i])
+    return tables, index
+
+def evaluate_many(f, points):
+    """
+    Returns the values of f at the rows of `points' as a NumPy array: int64
+    representatives in [0, p) over GF(p), floats over QQ.  For p >= 2**31
+    the points are evaluated one by one with Polynomial.evaluate and the
+    representatives are Python ints in an array of objects.
+
+    >>> from polynomial import *
+    >>> from rational import Rational
+    >>> R = PolynomialRing(PrimeField(32003), 'xyz')
+    >>> x, y, z = R.variables()
+    >>> f = 3*x**5*y - x*z**2 + 7*y**3 + 11
+    >>> points = [(1, 2, 3), (10000, 20000, 30000), (0, 0, 0)]
+    >>> evaluate_many(f, points).tolist() == [f.evaluate(P).x for P in points]
+    True
+    >>> S = PolynomialRing(QQ, 'xy')
+    >>> x, y = S.variables()
+    >>> evaluate_many(Rational(1, 2)*x**2 - y, [(1.0, 0.5), (3.0, -2.0)]).tolist()
+    [0.0, 6.5]
+    >>> evaluate_many(S(0), [(1.0, 2.0)]).tolist()
+    [0.0]
+    >>> T = PolynomialRing(PrimeField(2**61 - 1), 'xy')
+    >>> x, y = T.variables()
+    >>> evaluate_many(x**3*y + 1, [(2**40, 3), (5, 7)]).tolist() == [(2**120 * 3 + 1) % (2**61 - 1), 876]
+    True
+    >>> evaluate_many(x + y, [(0.5, 1.0)])
+    Traceback (most recent call last):
+    ValueError: float points need rational coefficients
+    """
+    field = f.ring.coeff_ring
+    n = f.ring.num_vars()
+    if isinstance(field, PrimeField):
+        p = field.p
+        if isinstance(points, numpy.ndarray):
+            floats = points.dtype.kind == 'f'
+        else:
+            floats = any([isinstance(v, float) for point in points for v in point])
+            points = [[getattr(v, 'x', v) for v in point] for point in points]
+        if floats:
+            raise ValueError, 'float points need rational coefficients'
+        if p >= 2**31:
+            # products of two representatives would overflow an int64
+            return numpy.array([f.evaluate([int(v) for v in point]).x for point in points], dtype=object)
+        points = numpy.array(points, dtype=numpy.int64).reshape((-1, n)) % p
+        coeffs = numpy.array([c.x for c in f.coeffs], dtype=numpy.int64)
+    else:
+        p = None
+        points = numpy.array(points, dtype=numpy.float64).reshape((-1, n))
+        coeffs = numpy.array([float(c.n) / c.d for c in f.coeffs], dtype=numpy.float64)
+    if f.is_zero():
+        return numpy.zeros(len(points), dtype=points.dtype)
+    exps = numpy.array([m.degrees for m in f.monomials], dtype=numpy.int64).reshape((len(f.monomials), n))
+    tables, index = power_tables(points, exps, p)
+    terms = numpy.repeat(coeffs[:, numpy.newaxis], len(points), axis=1)
+    for i in range(n):
+        terms = terms * tables[i][index[:, i]]
+        if p is not None:
+            terms %= p
+    values = terms.sum(axis=0)
+    return values if p is None else values % p
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,198 @@
+# Elements of GF(p^k), for coefficient_field.FiniteField.  The field is GF(p)[a] / (m(a)) for a primitive polynomial
+# m of degree k, so every nonzero element is a power of a.  An element is stored as a small integer x: 0 for zero and
+# e + 1 for a^e, 0 <= e < q - 1.  With that
+#
+# - a^i * a^j = a^(i + j), a^i / a^j = a^(i - j) and the inverse of a^i is a^-i, exponent arithmetic modulo q - 1;
+# - a^i + a^j = a^i * (1 + a^(j - i)) = a^(i + Z(j - i)), with the Zech logarithms Z(n) defined by a^Z(n) = 1 + a^n,
+#   one lookup in a table of q - 1 entries;
+# - -a^i = a^i * (-1) = a^(i + e) for the exponent e of -1, which is 0 in characteristic 2 and (q - 1) / 2 otherwise.
+#
+# The tables come from the powers of a written as vectors of coefficients in GF(p), encoded as the integers
+# c0 + c1*p + ... + c(k-1)*p^(k-1), so that the integers 0..p-1 are the prime subfield.  They are built once for each
+# (p, k) and shared by all FiniteField(p, k).
+
+import new
+import debug
+
+_tables = {}
+
+def _powers(p, k, m):
+    """
+    The codes of a^0, a^1, ... for a root a of the monic polynomial
+    x^k + m[k-1]*x^(k-1) + ... + m[0], until a power repeats 1
+    """
+    powers = [1]
+    v = [1] + [0] * (k - 1)
+    while True:
+        top = v[-1]
+        v = [0] + v[:-1]
+        v = [(v[i] - top * m[i]) % p for i in range(k)]
+        code = 0
+        for c in reversed(v):
+            code = code * p + c
+        if code == 1:
+            return powers
+        powers.append(code)
+        if len(powers) >= p**k:
+            return powers
+
+def tables(p, k):
+    """
+    Returns (m, exp, log, zech) for GF(p^k): the coefficients of the
+    primitive polynomial, the codes of the powers of a, the exponent of each
+    nonzero code and the Zech logarithms, None where 1 + a^n = 0
+
+    >>> m, exp, log, zech = tables(2, 3)
+    >>> m, exp
+    ([1, 1, 0], [1, 2, 4, 3, 6, 7, 5])
+    >>> zech
+    [None, 3, 6, 1, 5, 4, 2]
+    """
+    if (p, k) not in _tables:
+        q = p**k
+        # the monic polynomials of degree k in order, until one has a root of order q - 1
+        for n in xrange(p**k):
+            m = [n / p**i % p for i in range(k)]
+            if m[0] == 0:
+                continue
+            exp = _powers(p, k, m)
+            if len(exp) == q - 1:
+                break
+        else:
+            raise ValueError, 'no primitive polynomial of degree %d over GF(%d)' % (k, p)
+        log = [None] * q
+        for e, code in enumerate(exp):
+            log[code] = e
+        zech = []
+        for n in range(q - 1):
+            code = exp[n]
+            # adding 1 changes the constant coefficient only
+            one = code - code % p + (code % p + 1) % p
+            zech.append(log[one])
+        _tables[(p, k)] = (m, exp, log, zech)
+    return _tables[(p, k)]
+
+class FFElement:
+    """
+    An element of a FiniteField, see the top of the file; x is 0 for zero
+    and e + 1 for a^e
+
+    TESTS:
+
+    >>> from coefficient_field import FiniteField
+    >>> F = FiniteField(3, 2)
+    >>> a = F.gen()
+    >>> a, a**2, a**8, a + a, a - a
+    (a, a^2, 1, a^5, 0)
+    >>> (a + 1) * (a - 1) == a**2 - 1, ~a * a, a / a**3
+    (True, 1, a^6)
+    >>> F(5), -F(1), F(2) * F(2)
+    (2, 2, 1)
+    """
+
+    def __init__(self, x, field):
+        self.x = x
+        self.field = field
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self):
+        if not self.x:
+            return '0'
+        field = self.field
+        code = field._exp[self.x - 1]
+        if code < field.p:
+            return str(code)
+        e = self.x - 1
+        return field.name if e == 1 else '%s^%d' % (field.name, e)
+
+    def __add__(self, other):
+        if isinstance(other, (int, long)):
+            other = self.field(other)
+        if not self.x:
+            return other
+        if not other.x:
+            return self
+        field = self.field
+        n = field.q - 1
+        i = self.x - 1
+        z = field._zech[(other.x - 1 - i) % n]
+        return _ffelement(0 if z is None else (i + z) % n + 1, field)
+
+    def __neg__(self):
+        if not self.x:
+            return self
+        field = self.field
+        return _ffelement((self.x - 1 + field._minus_one) % (field.q - 1) + 1, field)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, (int, long)):
+            other = self.field(other)
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        return self.coerce_mul(other)
+
+    def coerce_mul(self, other):
+        try:
+            return self._mul_(other)
+        except AttributeError:
+            return other.ring(self)._mul_(other)
+
+    def _mul_(self, other):
+        if debug.CHECKS:
+            assert other.field.q == self.field.q, 'cannot multiply elements of different fields'
+        if not self.x or not other.x:
+            return _ffelement(0, self.field)
+        return _ffelement((self.x + other.x - 2) % (self.field.q - 1) + 1, self.field)
+
+    def __invert__(self):
+        if not self.x:
+            raise ZeroDivisionError
+        return _ffelement((1 - self.x) % (self.field.q - 1) + 1, self.field)
+
+    def __div__(self, other):
+        if not other.x:
+            raise ZeroDivisionError
+        if not self.x:
+            return self
+        return _ffelement((self.x - other.x) % (self.field.q - 1) + 1, self.field)
+
+    def __pow__(self, power):
+        if not self.x:
+            if power < 0:
+                raise ZeroDivisionError
+            return self if power else _ffelement(1, self.field)
+        return _ffelement((self.x - 1) * power % (self.field.q - 1) + 1, self.field)
+
+    def __cmp__(self, other):
+        """
+        The order of the representatives: zero is the smallest element, so
+        that Polynomial prints no coefficient as negative
+        """
+        if isinstance(other, (int, long)):
+            other = self.field(other)
+        return cmp(self.x, other.x)
+
+    def __hash__(self):
+        return hash(self.x)
+
+    def __nonzero__(self):
+        return self.x != 0
+
+def _ffelement(x, field):
+    """
+    FFElement(x, field) without the call to __init__
+    """
+    return new.instance(FFElement, {'x': x, 'field': field})
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
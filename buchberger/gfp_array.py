@@ -0,0 +1,241 @@
+# Polynomials over GF(p) stored as NumPy arrays: the exponent vectors as the rows of a 2D int64 array, in the same
+# increasing order as Polynomial.monomials, and the coefficients as an int64 array of representatives in [0, p).
+# Merging two polynomials, scaling by a coefficient and shifting by a monomial are then whole-array operations, which
+# is what Polynomial.divide and Polynomial.S_polynomial use for long polynomials when the ring's PrimeField was created
+# with vectorized=True.  Products of two coefficients must fit in an int64, so p has to be below 2**31.
+
+import numpy
+from monomial import Monomial, _monomial
+from mod import _mod
+
+# Polynomial.divide and S_polynomial switch to arrays for polynomials with at least this many terms
+MIN_TERMS = 32
+
+class ArrayPolynomial:
+
+    def __init__(self, ring, exps, coeffs):
+        self.ring = ring
+        self.exps = exps
+        self.coeffs = coeffs
+
+    def __len__(self):
+        return len(self.coeffs)
+
+    def to_polynomial(self):
+        from polynomial import _polynomial
+        p = self.ring.coeff_ring.p
+        return _polynomial(self.ring, [_monomial(self.ring, tuple(e)) for e in self.exps.tolist()],
+                           [_mod(c, p) for c in self.coeffs.tolist()])
+
+def from_polynomial(f):
+    """
+    Returns f as an ArrayPolynomial; the result is kept on f for later calls,
+    but not pickled with it, see Polynomial.__getstate__
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(7, vectorized=True), 'xy')
+    >>> x, y = R.variables()
+    >>> A = from_polynomial(3*x**2 + 5*y)
+    >>> A.exps.tolist(), A.coeffs.tolist()
+    ([[0, 1], [2, 0]], [5, 3])
+    >>> A.to_polynomial()
+    3*x^2 + 5*y
+    >>> f = x + 1
+    >>> from_polynomial(f) is from_polynomial(f)
+    True
+    >>> import pickle
+    >>> '_array' in pickle.loads(pickle.dumps(f)).__dict__
+    False
+    """
+    if '_array' not in f.__dict__:
+        n = f.ring.num_vars()
+        exps = numpy.array([m.degrees for m in f.monomials], dtype=numpy.int64).reshape((len(f.monomials), n))
+        coeffs = numpy.array([c.x for c in f.coeffs], dtype=numpy.int64)
+        f.__dict__['_array'] = ArrayPolynomial(f.ring, exps, coeffs)
+    return f._array
+
+def _grevlex_columns(exps):
+    return [exps.sum(axis=1)] + [-exps[:, i] for i in range(exps.shape[1] - 1, -1, -1)]
+
+def _sort_keys(exps, ring):
+    """
+    Keys for numpy.lexsort putting exponent vectors in increasing monomial order
+    of ring, see orders.py
+    """
+    order = ring.order
+    if order == 'lex':
+        return exps.T[::-1]
+    elif order == 'grlex':
+        columns = [exps.sum(axis=1)] + [exps[:, i] for i in range(exps.shape[1])]
+    elif order == 'grevlex':
+        columns = _grevlex_columns(exps)
+    else:
+        k = int(order[5:])
+        columns = _grevlex_columns(exps[:, :k]) + _grevlex_columns(exps[:, k:])
+    return numpy.array(columns[::-1])
+
+def _packed_keys(ring, exps):
+    """
+    One int64 per exponent vector, increasing in the monomial order of ring,
+    or None if the exponents span too wide a range to pack them
+    """
+    size = 1
+    packed = numpy.zeros(len(exps), dtype=numpy.int64)
+    # the last sort key is the most significant
+    for column in _sort_keys(exps, ring)[::-1]:
+        low = int(column.min())
+        radix = int(column.max()) - low + 1
+        size *= radix
+        if size >= 2**62:
+            return None
+        packed = packed * radix + (column - low)
+    return packed
+
+def merge(ring, exps, coeffs, other_exps, other_coeffs, p):
+    """
+    Returns the sum of two polynomials given as arrays, each with distinct
+    exponent vectors in increasing order, with like terms collected and zero
+    terms dropped.  The terms of the second are inserted into the first at
+    the positions found by a binary search on packed keys; exponents too
+    large to pack fall back to sorting all the terms.
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(7), 'xy', 'grevlex')
+    >>> x, y = R.variables()
+    >>> A, B = from_polynomial(x**2 + 3*x*y + 1), from_polynomial(4*x*y + y**2 + 2*y + 6)
+    >>> exps, coeffs = merge(R, A.exps, A.coeffs, B.exps, B.coeffs, 7)
+    >>> exps.tolist(), coeffs.tolist()
+    ([[0, 1], [0, 2], [2, 0]], [2, 1, 1])
+    >>> exps, coeffs = merge(R, A.exps, A.coeffs, B.exps * 2**40, B.coeffs, 7)
+    >>> expected = _sort_merge(R, A.exps, A.coeffs, B.exps * 2**40, B.coeffs, 7)
+    >>> exps.tolist() == expected[0].tolist() and coeffs.tolist() == expected[1].tolist()
+    True
+    """
+    if not len(other_coeffs) or not len(coeffs):
+        exps = exps if len(coeffs) else other_exps
+        coeffs = coeffs if len(coeffs) else other_coeffs
+        keep = coeffs % p != 0
+        return exps[keep], coeffs[keep] % p
+    keys = _packed_keys(ring, numpy.vstack((exps, other_exps)))
+    if keys is None:
+        return _sort_merge(ring, exps, coeffs, other_exps, other_coeffs, p)
+    keys, other_keys = keys[:len(coeffs)], keys[len(coeffs):]
+    positions = numpy.searchsorted(keys, other_keys)
+    same = numpy.zeros(len(other_keys), dtype=bool)
+    inside = positions < len(keys)
+    same[inside] = keys[positions[inside]] == other_keys[inside]
+    coeffs = coeffs.copy()
+    coeffs[positions[same]] += other_coeffs[same]
+    new = ~same
+    exps = numpy.insert(exps, positions[new], other_exps[new], axis=0)
+    coeffs = numpy.insert(coeffs, positions[new], other_coeffs[new]) % p
+    keep = coeffs != 0
+    return exps[keep], coeffs[keep]
+
+def _sort_merge(ring, exps, coeffs, other_exps, other_coeffs, p):
+    exps = numpy.vstack((exps, other_exps))
+    coeffs = numpy.concatenate((coeffs, other_coeffs))
+    order = numpy.lexsort(_sort_keys(exps, ring))
+    exps = exps[order]
+    coeffs = coeffs[order]
+    starts = numpy.ones(len(coeffs), dtype=bool)
+    starts[1:] = numpy.any(exps[1:] != exps[:-1], axis=1)
+    starts = numpy.flatnonzero(starts)
+    coeffs = numpy.add.reduceat(coeffs, starts) % p
+    exps = exps[starts]
+    keep = coeffs != 0
+    return exps[keep], coeffs[keep]
+
+def S_polynomial(f, g):
+    """
+    Array version of Polynomial.S_polynomial
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(32003, vectorized=True), 'xyz')
+    >>> x, y, z = R.variables()
+    >>> f, g = (x + 2*y + z + 3)**4, (x*y - z + 1)**3
+    >>> R.coeff_ring.vectorized = False
+    >>> expected = f.S_polynomial(g)
+    >>> S_polynomial(f, g) == expected
+    True
+    """
+    ring = f.ring
+    field = ring.coeff_ring
+    p = field.p
+    A, B = from_polynomial(f), from_polynomial(g)
+    lcm = numpy.maximum(A.exps[-1], B.exps[-1])
+    exps, coeffs = merge(ring, A.exps + (lcm - A.exps[-1]), A.coeffs * field.inverse(int(A.coeffs[-1])) % p,
+                         B.exps + (lcm - B.exps[-1]), (p - B.coeffs) * field.inverse(int(B.coeffs[-1])) % p, p)
+    return ArrayPolynomial(ring, exps, coeffs).to_polynomial()
+
+def divide(f, divisors):
+    """
+    Array version of Polynomial.divide, returning the same quotients and remainder
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(32003, vectorized=True), 'xyz')
+    >>> x, y, z = R.variables()
+    >>> f = (x + 2*y + z + 3)**5
+    >>> F = [x**2*y - z**2 + 1, y**3 - 2*x*z, x*z**2 + y + 5]
+    >>> R.coeff_ring.vectorized = False
+    >>> expected = f.divide(F)
+    >>> divide(f, F) == expected
+    True
+    >>> for order in ['grlex', 'grevlex', 'block1']:
+    ...     S = PolynomialRing(PrimeField(32003), 'xyz', order)
+    ...     x, y, z = S.variables()
+    ...     f = (x + 2*y + z + 3)**5
+    ...     F = [x**2*y - z**2 + 1, y**3 - 2*x*z, x*z**2 + y + 5]
+    ...     expected = f.divide(F)
+    ...     S.coeff_ring.vectorized = True
+    ...     print divide(f, F) == expected
+    True
+    True
+    True
+    """
+    from polynomial import _polynomial
+    ring = f.ring
+    p = ring.coeff_ring.p
+    P = from_polynomial(f)
+    quots, remainder = reduce_arrays(ring, P.exps, P.coeffs, [from_polynomial(g) for g in divisors])
+
+    def polynomial(terms):
+        monomials, cs = terms
+        return _polynomial(ring, [_monomial(ring, tuple(m.tolist())) for m in reversed(monomials)], [_mod(int(c), p) for c in reversed(cs)])
+    return [polynomial(q) for q in quots], polynomial(([m for m, c in remainder], [c for m, c in remainder]))
+
+def reduce_arrays(ring, exps, coeffs, arrays, leading=None):
+    """
+    The division loop of divide on arrays: exps and coeffs are the
+    polynomial to divide, arrays are the divisors with exps and coeffs
+    attributes, such as ArrayPolynomials or basis_store views, and leading
+    optionally the matrix of their leading exponent vectors.  Returns the
+    quotients as pairs of lists (exponent vectors, coefficients) and the
+    remainder as a list of (exponent vector, coefficient), both from the
+    largest term down.
+    """
+    field = ring.coeff_ring
+    p = field.p
+    if leading is None:
+        leading = numpy.array([A.exps[-1] for A in arrays], dtype=numpy.int64)
+    inverses = [field.inverse(int(A.coeffs[-1])) for A in arrays]
+    quots = [([], []) for A in arrays]
+    remainder = []
+    while len(coeffs):
+        LM = exps[-1]
+        divisible = numpy.flatnonzero(numpy.all(leading <= LM, axis=1))
+        if len(divisible):
+            i = divisible[0]
+            m = LM - leading[i]
+            c = int(coeffs[-1]) * inverses[i] % p
+            quots[i][0].append(m)
+            quots[i][1].append(c)
+            exps, coeffs = merge(ring, exps, coeffs, arrays[i].exps + m, (p - c) * arrays[i].coeffs % p, p)
+        else:
+            remainder.append((exps[-1], coeffs[-1]))
+            exps, coeffs = exps[:-1], coeffs[:-1]
+    return quots, remainder
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
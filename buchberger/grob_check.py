@@ -1,11 +1,160 @@
-from polynomial import Polynomial
+from polynomial import Polynomial, _polynomial
 from buchberger import groebner
-from PolynomialRing import PolynomialRing
-from CoefficientField import RationalField, PrimeField
+from polynomial_ring import PolynomialRing
+from coefficient_field import RationalField, PrimeField
+from monomial import Monomial
+from multiprocessing import Pool
+from random import Random
 import sys
 
-def is_groebner(basis):
+def reduces_to_zero(f, basis):
     """
+    Divides f by basis like Polynomial.divide, but keeps no quotients and
+    stops at the first leading term that no element of basis divides
+
+    TESTS:
+
+    >>> R = PolynomialRing(RationalField(), 'xy')
+    >>> x, y = R.variables()
+    >>> reduces_to_zero(x**2*y - y**3, [x**2 - y**2])
+    True
+    >>> reduces_to_zero(x**2*y + y, [x**2 - y**2])
+    False
+    """
+    p = f
+    while not p.is_zero():
+        LM_p = p.monomials[-1]
+        LC_p = p.coeffs[-1]
+        for g in basis:
+            if LM_p.is_divisible(g.monomials[-1]):
+                p = p - _polynomial(p.ring, [LM_p / g.monomials[-1]], [LC_p / g.coeffs[-1]]) * g
+                break
+        else:
+            return False
+    return True
+
+def critical_pairs(basis):
+    """
+    Returns the pairs (i, j), j < i, whose S-polynomials have to reduce to
+    zero for basis to be a Groebner basis.  Pairs with coprime leading
+    monomials are dropped (product criterion), and so is (i, j) when some
+    LM_k divides lcm(LM_i, LM_j) and the pairs (i, k) and (j, k) come
+    before (i, j) (chain criterion).
+
+    TESTS:
+
+    >>> R = PolynomialRing(RationalField(), 'xyz')
+    >>> x, y, z = R.variables()
+    >>> critical_pairs([x**2, y**2, z**2])
+    []
+    >>> critical_pairs([x*y, x*z, y*z])
+    [(1, 0), (2, 0)]
+    """
+    LM = [f.monomials[-1] for f in basis]
+    n = len(basis)
+    pending = set([(i, j) for i in range(n) for j in range(i)])
+    pairs = []
+    for i in range(n):
+        for j in range(i):
+            pending.discard((i, j))
+            if LM[i].gcd(LM[j]).degree() == 0:
+                continue
+            L = LM[i].lcm(LM[j])
+            for k in range(n):
+                if k != i and k != j and L.is_divisible(LM[k]) and \
+                   (max(i, k), min(i, k)) not in pending and (max(j, k), min(j, k)) not in pending:
+                    break
+            else:
+                pairs.append((i, j))
+    return pairs
+
+_basis = None
+
+def _init_worker(basis):
+    global _basis
+    _basis = basis
+
+def _check_pair(pair):
+    i, j = pair
+    return reduces_to_zero(_basis[i].S_polynomial(_basis[j]), _basis)
+
+def random_prime(low, high, rng):
+    """
+    Returns a random prime in [low, high)
+
+    >>> p = random_prime(2**29, 2**30, Random(1))
+    >>> 2**29 <= p < 2**30 and is_prime(p)
+    True
+    """
+    while True:
+        n = rng.randrange(low, high) | 1
+        if is_prime(n):
+            return n
+
+def is_prime(n):
+    """
+    Miller-Rabin test, deterministic for n < 2152302898747
+
+    >>> [n for n in range(30) if is_prime(n)]
+    [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    """
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d / 2, s + 1
+    for a in (2, 3, 5, 7, 11):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for r in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def reduce_mod(basis, p):
+    """
+    Maps a basis over QQ to GF(p), or returns None if p divides one of the
+    denominators or leading coefficients
+
+    TESTS:
+
+    >>> from rational import Rational
+    >>> R = PolynomialRing(RationalField(), 'xy')
+    >>> x, y = R.variables()
+    >>> reduce_mod([x**2 + Rational(1, 2)*y], 7)
+    [x^2 + 4*y]
+    >>> reduce_mod([3*x**2 + y], 3) is None
+    True
+    """
+    ring = basis[0].ring
+    S = PolynomialRing(PrimeField(p), ring.var_list, ring.order)
+    images = []
+    for f in basis:
+        if any([c.d % p == 0 for c in f.coeffs]) or f.coeffs[-1].n % p == 0:
+            return None
+        monomials = [Monomial(S, m.degrees) for m in f.monomials]
+        coeffs = [S.coeff_ring(c.n) / S.coeff_ring(c.d) for c in f.coeffs]
+        images.append(Polynomial(S, monomials, coeffs))
+    return images
+
+def is_groebner(basis, criteria=True, processes=None, probabilistic=False, primes=1, seed=None):
+    """
+    Tests whether basis is a Groebner basis.  With criteria the product and
+    chain criteria skip pairs that need not be checked; with processes the
+    S-polynomials are reduced in a pool of that many worker processes.
+
+    With probabilistic, a basis over QQ is instead mapped to GF(p) for
+    `primes' random primes p of 30 bits and checked there.  A Groebner
+    basis always passes; a basis that passes is a Groebner basis except
+    for a small set of unlucky primes.
+
     TESTS:
 
     >>> R = PolynomialRing(RationalField(), 'xyz')
@@ -14,19 +163,49 @@ def is_groebner(basis):
     >>> J = groebner(I)
     >>> is_groebner(J)
     True
+    >>> is_groebner(I)
+    False
+    >>> is_groebner(J, criteria=False)
+    True
+    >>> is_groebner(J, processes=2), is_groebner(I, processes=2)
+    (True, False)
+    >>> is_groebner(J, probabilistic=True, seed=1), is_groebner(I, probabilistic=True, seed=1)
+    (True, False)
     """
+    basis = [f for f in basis if not f.is_zero()]
+    if not basis:
+        return True
+    if probabilistic and isinstance(basis[0].ring.coeff_ring, RationalField):
+        rng = Random(seed)
+        checked = 0
+        while checked < primes:
+            images = reduce_mod(basis, random_prime(2**29, 2**30, rng))
+            if images is None:
+                continue
+            if not is_groebner(images, criteria, processes):
+                return False
+            checked += 1
+        return True
+
+    if criteria:
+        pairs = critical_pairs(basis)
+    else:
+        pairs = [(i, j) for i in range(len(basis)) for j in range(i)]
+    if processes is None:
+        for i, j in pairs:
+            if not reduces_to_zero(basis[i].S_polynomial(basis[j]), basis):
+                return False
+        return True
+    pool = Pool(processes, _init_worker, (basis,))
+    try:
+        for result in pool.imap_unordered(_check_pair, pairs, max(1, len(pairs) / (4 * processes))):
+            if not result:
+                return False
+        return True
+    finally:
+        pool.terminate()
+
 
-    for i in range(len(basis)):
-        for j in range(len(basis)):
-            if j <= (i - 1):
-                S = basis[i].S_polynomial(basis[j])
-                if  S.divide(basis)[1].is_zero():
-                    pass
-                else:
-                    return False
-    return True
-                       
-                       
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
@@ -1,24 +1,77 @@
+# Fuzz test for the Groebner engines: random ideals from every family in random_ideals are run through each engine in
+# ENGINES on a pool of worker processes.  Every result is checked with is_groebner, the reduced bases of the engines
+# are compared, and the timings are summarised per engine and family.
+#
+# usage: python grob_test.py [trials] [processes]
+
 from polynomial import *
-from buchberger import groebner
+from buchberger import groebner, interreduce
 from grob_check import is_groebner
-from random import seed, randint
-import timeit
+from random_ideals import FAMILIES
+from multiprocessing import Pool, cpu_count
+from time import time
+import sys
+
+K = PrimeField(32003)
+VARIABLES = 'xyz'
+SEED = 559
+
+ENGINES = {
+    'buchberger': groebner,
+    'top': lambda I: groebner(I, reduction='top'),
+    'signature': lambda I: groebner(I, engine='signature'),
+}
 
-seed(559)
+def run_trial(trial):
+    """
+    Runs trial number `trial' and returns (family, {engine: seconds}, failures)
+    """
+    R = PolynomialRing(K, VARIABLES)
+    families = sorted(FAMILIES)
+    family = families[trial % len(families)]
+    I = [f for f in FAMILIES[family](R, SEED + trial) if not f.is_zero()]
+    times = {}
+    failures = []
+    reduced = {}
+    for name in sorted(ENGINES):
+        t = time()
+        G = ENGINES[name](I)
+        times[name] = time() - t
+        if not is_groebner(G):
+            failures.append('trial %d (%s): %s did not return a Groebner basis of %s' % (trial, family, name, I))
+        reduced[name] = interreduce(G)
+    names = sorted(reduced)
+    for name in names[1:]:
+        if reduced[name] != reduced[names[0]]:
+            failures.append('trial %d (%s): %s and %s disagree on %s' % (trial, family, names[0], name, I))
+    return family, times, failures
 
-K = PrimeField(5)
-R = PolynomialRing(K, 'xy')
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
 
-max_degree = 5
-max_terms = 7
+def main(trials, processes):
+    timings = {}
+    failures = []
+    pool = Pool(processes)
+    for done, (family, times, trial_failures) in enumerate(pool.imap_unordered(run_trial, range(trials))):
+        for name in times:
+            timings.setdefault((name, family), []).append(times[name])
+        failures.extend(trial_failures)
+        if done % 50 == 0:
+            print done
+    pool.close()
+    pool.join()
+    print '%-12s %-18s %8s %8s %8s %8s' % ('engine', 'family', 'median', 'p90', 'max', 'total')
+    for name, family in sorted(timings):
+        t = timings[(name, family)]
+        print '%-12s %-18s %8.4f %8.4f %8.4f %8.2f' % (name, family, percentile(t, 0.5), percentile(t, 0.9), max(t), sum(t))
+    for failure in failures:
+        print failure
+    assert not failures
 
-for trial in range(10000):
-	num_polys = randint(2, max_terms)
-	I = [R.random(max_degree, max_terms) for i in range(num_polys)]
-	I = [poly for poly in I if len(poly.coeffs)]
-	J = groebner(I)
-	test = is_groebner(J)
-	assert test
-	if trial % 50 == 0:
-		print trial
 
+if __name__ == '__main__':
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else cpu_count()
+    main(trials, processes)
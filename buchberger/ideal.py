@@ -0,0 +1,234 @@
+# Ideals with quotients, intersections and saturations.  An Ideal keeps the reduced Groebner bases computed for it, one
+# for each monomial order and order of the variables, so that a later quotient, saturation or comparison reuses them;
+# the results of these operations come with the bases that fall out of their computation already filled in.
+#
+# I : g is (I intersected with (g)) / g, and the intersection is computed by eliminating t from t*I + (1 - t)*J.  The
+# saturation I : f^oo can be computed with three strategies:
+#
+#   rabinowitsch  eliminate t from I + (1 - t*f), for any f
+#   iterated      I : f, I : f^2, ... until two consecutive quotients agree
+#   grevlex       for homogeneous I and a monomial f: for a variable v, divide every element of a grevlex Groebner basis
+#                 with v last by the largest power of v dividing it (Bayer), which gives a grevlex basis of I : v^oo
+#                 without any new reductions; a monomial is done one variable at a time
+#
+# 'auto' picks grevlex when it applies and rabinowitsch otherwise.
+
+from polynomial_ring import PolynomialRing
+from buchberger import groebner, interreduce
+from elimination import eliminate, transfer, is_homogeneous
+from polynomial import _polynomial
+from monomial import _monomial
+
+class Ideal:
+    """
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> I = Ideal([x*y - z**2, y**2 - x*z])
+    >>> I.basis()
+    [y^2 + (-1)*x*z, x*y + (-1)*z^2, x^2*z + (-1)*y*z^2]
+    >>> I.contains(x**2*z - y*z**2), I.contains(x)
+    (True, False)
+    >>> I == Ideal(I.basis())
+    True
+    >>> Ideal([])
+    Traceback (most recent call last):
+    ValueError: an ideal without generators needs its ring
+    """
+
+    def __init__(self, generators, ring=None):
+        if ring is None and not generators:
+            raise ValueError, 'an ideal without generators needs its ring'
+        self.ring = ring or generators[0].ring
+        self.generators = [f for f in generators if not f.is_zero()]
+        self._bases = {}
+
+    def __repr__(self):
+        return 'Ideal(%s)' % self.generators
+
+    def basis(self, order='grevlex', var_list=None):
+        """
+        Returns the reduced Groebner basis for the order and variables, in the
+        ring self.ring.with_order(order, var_list)
+        """
+        ring = self.ring.with_order(order, var_list)
+        key = (order, tuple(ring.var_list))
+        if key not in self._bases:
+            G = [transfer(f, ring) for f in self._known_generators()]
+            self._bases[key] = interreduce(groebner(G)) if G else []
+        return self._bases[key]
+
+    def _known_generators(self):
+        """
+        The grevlex basis if it is known, the generators otherwise
+        """
+        return self._bases.get(('grevlex', tuple(self.ring.var_list)), self.generators)
+
+    def _with_basis(self, basis):
+        """
+        Returns the ideal of self.ring generated by a reduced Groebner basis
+        given in some ring with the same variables, keeping that basis
+        """
+        ring = self.ring.with_order(basis[0].ring.order, basis[0].ring.var_list) if basis else self.ring
+        basis = [transfer(g, ring) for g in basis]
+        I = Ideal([transfer(g, self.ring) for g in basis], self.ring)
+        I._bases[(ring.order, tuple(ring.var_list))] = basis
+        return I
+
+    def __eq__(self, other):
+        return self.basis() == other.basis()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def contains(self, f):
+        G = self.basis()
+        if not G:
+            return f.is_zero()
+        return transfer(f, G[0].ring).divide(G)[1].is_zero()
+
+    def is_homogeneous(self):
+        return all([is_homogeneous(f) for f in self.generators])
+
+    def intersection(self, other):
+        """
+        >>> from polynomial import *
+        >>> R = PolynomialRing(QQ, 'xy')
+        >>> x, y = R.variables()
+        >>> Ideal([x**2*y]).intersection(Ideal([x*y**2])).basis()
+        [x^2*y^2]
+        """
+        other = _ideal(other, self.ring)
+        if not self.generators or not other.generators:
+            return Ideal([], self.ring)
+        T = PolynomialRing(self.ring.coeff_ring, ['_t'] + self.ring.var_list)
+        t = T.variables()[0]
+        generators = [t * transfer(f, T) for f in self._known_generators()] + \
+                     [(1 - t) * transfer(f, T) for f in other._known_generators()]
+        return self._with_basis(eliminate(generators, ['_t']))
+
+    def quotient(self, other):
+        """
+        Returns the ideal quotient self : other, other being an ideal, a list
+        of generators or a polynomial
+
+        >>> from polynomial import *
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> I = Ideal([x**2*y, x*y*z, z**3])
+        >>> I.quotient(x).basis()
+        [y*z, x*y, z^3]
+        >>> I.quotient([x, z]).basis()
+        [x*y, z^3, y*z^2]
+        >>> Ideal([], R).quotient(x), Ideal([], R).quotient([])
+        (Ideal([]), Ideal([1]))
+        """
+        other = _ideal(other, self.ring)
+        if not self.generators and other.generators:
+            return Ideal([], self.ring)
+        result = None
+        for g in other.generators:
+            intersection = self.intersection(Ideal([g]))
+            G = intersection.basis()
+            g = transfer(g, G[0].ring)
+            quotients = []
+            for h in G:
+                q, r = h.divide([g])
+                assert r.is_zero()
+                quotients.append(q[0])
+            # h / g for h in a Groebner basis of the intersection form a Groebner basis of the quotient
+            J = self._with_basis(interreduce(quotients))
+            result = J if result is None else result.intersection(J)
+        return result if result is not None else Ideal([self.ring(1)])
+
+    def saturation(self, f, strategy='auto'):
+        """
+        Returns self : f^oo, see the top of the file for the strategies
+
+        >>> from polynomial import *
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> I = Ideal([x**2*y - x*z**2, x*y**2 - y*z**2, x**3])
+        >>> [I.saturation(x, s).basis() for s in ['rabinowitsch', 'iterated', 'grevlex', 'auto']]
+        [[1], [1], [1], [1]]
+        >>> I = Ideal([x*z - y**2, x**2*y - z**3])
+        >>> J = I.saturation(z, 'grevlex')
+        >>> J.basis()
+        [y^2 + (-1)*x*z, x^2*y + (-1)*z^3, x^3 + (-1)*y*z^2]
+        >>> J == I.saturation(z, 'rabinowitsch') == I.saturation(z, 'iterated')
+        True
+        >>> Ideal([x*y - 1, x**2]).saturation(x + y)
+        Ideal([1])
+        >>> I.saturation(x + y, 'grevlex')
+        Traceback (most recent call last):
+        ValueError: the grevlex strategy needs a homogeneous ideal and a monomial
+        """
+        variables = _variables(f)
+        if strategy == 'auto':
+            strategy = 'grevlex' if variables is not None and self.is_homogeneous() else 'rabinowitsch'
+        if strategy == 'rabinowitsch':
+            T = PolynomialRing(self.ring.coeff_ring, ['_t'] + self.ring.var_list)
+            t = T.variables()[0]
+            generators = [transfer(g, T) for g in self._known_generators()] + [1 - t * transfer(f, T)]
+            return self._with_basis(eliminate(generators, ['_t']))
+        elif strategy == 'iterated':
+            J = self
+            while True:
+                K = J.quotient(f)
+                if K == J:
+                    return J
+                J = K
+        elif strategy == 'grevlex':
+            if variables is None or not self.is_homogeneous():
+                raise ValueError, 'the grevlex strategy needs a homogeneous ideal and a monomial'
+            J = self
+            for v in variables:
+                J = J._saturate_variable(v)
+            return J
+        else:
+            raise ValueError, 'unknown saturation strategy %r' % strategy
+
+    def _saturate_variable(self, v):
+        var_list = [w for w in self.ring.var_list if w != v] + [v]
+        G = self.basis('grevlex', var_list)
+        saturated = []
+        for g in G:
+            k = min([m.degrees[-1] for m in g.monomials])
+            monomials = [_monomial(g.ring, m.degrees[:-1] + (m.degrees[-1] - k,)) for m in g.monomials]
+            saturated.append(_polynomial(g.ring, monomials, g.coeffs))
+        return self._with_basis(interreduce(saturated))
+
+def _variables(f):
+    """
+    The names of the variables of the monomial f, None if f is not a monomial
+    """
+    if len(f.monomials) != 1:
+        return None
+    return [v for v, e in zip(f.ring.var_list, f.monomials[0].degrees) if e > 0]
+
+def _ideal(I, ring):
+    if isinstance(I, Ideal):
+        return I
+    elif isinstance(I, list):
+        return Ideal(I, ring)
+    return Ideal([I], ring)
+
+def quotient(I, J):
+    """
+    Returns I : J for ideals or lists of generators I and J, see Ideal.quotient
+    """
+    I = _ideal(I, None)
+    return I.quotient(J)
+
+def saturation(I, f, strategy='auto'):
+    """
+    Returns I : f^oo for an ideal or list of generators I, see Ideal.saturation
+    """
+    return _ideal(I, None).saturation(f, strategy)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
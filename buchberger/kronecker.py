@@ -0,0 +1,167 @@
+# Multiplication of polynomials by Kronecker substitution.  An exponent vector e is mapped to the integer
+# e_1*w_1 + ... + e_n*w_n, with weights chosen so that no exponent of the product can overflow into the next variable,
+# and the coefficients are written into fixed width slots of one big integer at those positions.  One multiplication of
+# two Python longs (Karatsuba in CPython) then computes every coefficient of the product, which is read back slot by
+# slot.  This pays off for dense products, where the number of slots is not much larger than the number of term pairs.
+
+from monomial import Monomial, _monomial
+from coefficient_field import RationalField, PrimeField
+from rational import Rational, lcm
+from mod import Mod
+
+# kronecker_mul is used when the product has at least MIN_PAIRS term pairs and at most SLOTS_PER_PAIR slots per pair
+MIN_PAIRS = 64
+SLOTS_PER_PAIR = 32
+
+def _bounds(f, g):
+    n = f.ring.num_vars()
+    return [max([m.degrees[i] for m in f.monomials]) + max([m.degrees[i] for m in g.monomials]) + 1 for i in range(n)]
+
+def _slots(bounds):
+    S = 1
+    for b in bounds:
+        S *= b
+    return S
+
+def is_profitable(f, g):
+    """
+    Decides whether f * g should be computed by kronecker_mul
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> is_profitable(x + y, x - y)
+    False
+    >>> f = (x + y + z + 1)**4
+    >>> is_profitable(f, f)
+    True
+    >>> is_profitable(f, x**50 + y**50 + z**50 + 1)
+    False
+    """
+    if not isinstance(f.ring.coeff_ring, (RationalField, PrimeField)):
+        return False
+    pairs = len(f.monomials) * len(g.monomials)
+    if pairs < MIN_PAIRS:
+        return False
+    return _slots(_bounds(f, g)) <= SLOTS_PER_PAIR * pairs
+
+def _weights(bounds):
+    weights = [1] * len(bounds)
+    for i in range(len(bounds) - 2, -1, -1):
+        weights[i] = weights[i+1] * bounds[i+1]
+    return weights
+
+def _pack(f, weights, ints, width, S):
+    """
+    Writes the integers `ints' into the slots of f's monomials, returns the
+    hexadecimal strings of the positive and of the negative coefficients
+    """
+    zero = '0' * width
+    pos = [zero] * S
+    neg = [zero] * S
+    fmt = '%0' + str(width) + 'x'
+    for m, c in zip(f.monomials, ints):
+        index = S - 1 - sum([e * w for e, w in zip(m.degrees, weights)])
+        if c >= 0:
+            pos[index] = fmt % c
+        else:
+            neg[index] = fmt % -c
+    return int(''.join(pos), 16), int(''.join(neg), 16)
+
+def _integer_coeffs(f):
+    """
+    Returns (ints, d) with coefficient i of f equal to ints[i] / d
+    """
+    if isinstance(f.ring.coeff_ring, PrimeField):
+        return [c.x for c in f.coeffs], 1
+    d = 1
+    for c in f.coeffs:
+        d = lcm(d, c.d)
+    return [c.n * (d / c.d) for c in f.coeffs], d
+
+def kronecker_mul(f, g):
+    """
+    Returns f * g, computed with a single multiplication of big integers
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> from rational import Rational
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> kronecker_mul(x + y, x - y)
+    x^2 + (-1)*y^2
+    >>> f = (2*x - Rational(1, 3)*y + z - 5)**3
+    >>> g = (x*y - 7*z + Rational(2, 5))**2
+    >>> kronecker_mul(f, g) == f.cub_mul(g)
+    True
+    >>> S = PolynomialRing(PrimeField(7), 'xy')
+    >>> x, y = S.variables()
+    >>> f = (x + 3*y + 6)**4
+    >>> kronecker_mul(f, f) == f.cub_mul(f)
+    True
+    >>> kronecker_mul(x - x, f)
+    0
+    >>> T = PolynomialRing(QQ, 'xyz', 'grevlex')
+    >>> x, y, z = T.variables()
+    >>> f = (x - 2*y*z + z**2 + 3)**3
+    >>> kronecker_mul(f, f) == f.cub_mul(f)
+    True
+    """
+    from polynomial import _polynomial
+    ring = f.ring
+    if f.is_zero() or g.is_zero():
+        return _polynomial(ring, [], [])
+    bounds = _bounds(f, g)
+    weights = _weights(bounds)
+    S = _slots(bounds)
+    a, da = _integer_coeffs(f)
+    b, db = _integer_coeffs(g)
+    bound = min(len(a), len(b)) * max([abs(c) for c in a]) * max([abs(c) for c in b])
+    width = (bound.bit_length() + 2) / 4 + 1     # hex digits per slot, room for the sign offset
+    a_pos, a_neg = _pack(f, weights, a, width, S)
+    b_pos, b_neg = _pack(g, weights, b, width, S)
+    product = (a_pos - a_neg) * (b_pos - b_neg)
+
+    # Adding half a slot to every slot makes all slots non-negative, so the
+    # hexadecimal digits of the sum can be read off independently.
+    half = 1 << (4 * width - 1)
+    offset = int(('%x' % half) * S, 16)
+    digits = '%x' % (product + offset)
+    digits = '0' * (S * width - len(digits)) + digits
+    zero = '%x' % half
+
+    monomials = []
+    coeffs = []
+    field = ring.coeff_ring
+    denominator = da * db
+    for index in range(S):
+        end = len(digits) - index * width
+        slot = digits[end - width:end]
+        if slot == zero:
+            continue
+        c = int(slot, 16) - half
+        if isinstance(field, PrimeField):
+            c = Mod(c, field.p)
+            if c.x == 0:
+                continue
+        else:
+            c = Rational(c, denominator)
+        e = []
+        for w in weights:
+            e.append(index / w)
+            index = index % w
+        monomials.append(_monomial(ring, tuple(e)))
+        coeffs.append(c)
+    if ring.order != 'lex':
+        # the slots are in lexicographic order
+        terms = sorted(zip(monomials, coeffs), key=lambda term: term[0])
+        monomials, coeffs = [m for m, c in terms], [c for m, c in terms]
+    return _polynomial(ring, monomials, coeffs)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
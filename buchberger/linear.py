@@ -0,0 +1,207 @@
+# Ideals generated by polynomials of total degree at most 1.  Their reduced Groebner basis is the reduced row echelon
+# form of the coefficient matrix, with the columns in decreasing monomial order: the variables from largest to
+# smallest and the constant term last.  groebner hands the linear generators of every ideal to echelon, and uses the
+# result to eliminate the pivot variables from the other generators before any S-polynomial is formed.
+#
+# - over GF(p) the matrix is reduced by Gauss-Jordan elimination, as a NumPy int64 array when NumPy is installed and
+#   p < 2**31 so that products of two entries fit, with each pivot clearing its column in one array operation on the
+#   rows and columns where it has any effect;
+# - over QQ the rows are scaled to integers and reduced by fraction-free (Bareiss) Gauss-Jordan elimination, in which
+#   every row operation is followed by an exact division by the previous pivot, so the entries stay minors of the
+#   matrix instead of growing into the large fractions that S-polynomials produce.
+
+from coefficient_field import RationalField, PrimeField
+from rational import Rational, lcm
+from polynomial import _polynomial
+from monomial import _monomial
+from mod import _mod
+import orders
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def supports(ring):
+    """
+    Whether the coefficients of ring are in QQ or a PrimeField, the fields
+    this module handles
+    """
+    return isinstance(ring.coeff_ring, (RationalField, PrimeField))
+
+def is_linear(f):
+    """
+    >>> from polynomial import *
+    >>> x, y = PolynomialRing(QQ, 'xy').variables()
+    >>> is_linear(2*x - y + 1), is_linear(x*y + 1), is_linear(x + y**2)
+    (True, False, False)
+    """
+    for m in f.monomials:
+        if m.degree() > 1:
+            return False
+    return True
+
+def _columns(ring):
+    """
+    The degree tuples of the variables in decreasing order, then that of 1
+    """
+    n = ring.num_vars()
+    units = [tuple([int(i == j) for j in range(n)]) for i in range(n)]
+    units.sort(key=orders.sort_key(ring), reverse=True)
+    return units + [(0,) * n]
+
+def _rows(polys, columns, p):
+    index = dict([(c, i) for i, c in enumerate(columns)])
+    rows = []
+    for f in polys:
+        row = [0] * len(columns)
+        if p:
+            for m, c in zip(f.monomials, f.coeffs):
+                row[index[m.degrees]] = c.x
+        else:
+            d = 1
+            for c in f.coeffs:
+                d = lcm(d, c.d)
+            for m, c in zip(f.monomials, f.coeffs):
+                row[index[m.degrees]] = c.n * (d / c.d)
+        rows.append(row)
+    return rows
+
+def _pivot(rows, r, c):
+    for k in range(r, len(rows)):
+        if rows[k][c]:
+            return k
+    return None
+
+def rref_mod(rows, p):
+    """
+    Returns the nonzero rows of the reduced row echelon form of a matrix over
+    GF(p), given as a list of rows of integers in [0, p)
+
+    >>> rref_mod([[1, 2, 3], [2, 4, 1], [0, 0, 5]], 7)
+    [[1, 2, 0], [0, 0, 1]]
+    """
+    if not rows:
+        return []
+    if numpy is not None and p < 2**31:
+        return _rref_array(numpy.array(rows, dtype=numpy.int64), p)
+    rows = [row[:] for row in rows]
+    r = 0
+    for c in range(len(rows[0])):
+        k = _pivot(rows, r, c)
+        if k is None:
+            continue
+        rows[r], rows[k] = rows[k], rows[r]
+        inv = pow(rows[r][c], p - 2, p)
+        pivot = [x * inv % p for x in rows[r]]
+        rows[r] = pivot
+        support = [j for j in range(len(pivot)) if pivot[j]]
+        for i in range(len(rows)):
+            a = rows[i][c]
+            if i != r and a:
+                row = rows[i]
+                for j in support:
+                    row[j] = (row[j] - a * pivot[j]) % p
+        r += 1
+        if r == len(rows):
+            break
+    return rows[:r]
+
+def _rref_array(M, p):
+    r = 0
+    for c in range(M.shape[1]):
+        nonzero = numpy.nonzero(M[r:, c])[0]
+        if not len(nonzero):
+            continue
+        k = r + nonzero[0]
+        if k != r:
+            M[[r, k]] = M[[k, r]]
+        M[r] = M[r] * pow(int(M[r, c]), p - 2, p) % p
+        column = M[:, c].copy()
+        column[r] = 0
+        rows = numpy.nonzero(column)[0]
+        if len(rows):
+            support = numpy.nonzero(M[r])[0]
+            block = numpy.ix_(rows, support)
+            M[block] = (M[block] - numpy.outer(column[rows], M[r, support])) % p
+        r += 1
+        if r == M.shape[0]:
+            break
+    return M[:r].tolist()
+
+def rref_integer(rows):
+    """
+    Fraction-free Gauss-Jordan elimination of an integer matrix: returns the
+    nonzero rows of an echelon form in which each pivot is the only nonzero
+    entry of its column; dividing each row by its pivot gives the reduced
+    row echelon form over QQ
+
+    >>> rref_integer([[2, 4, 6], [3, 6, 1], [1, 0, 1]])
+    [[32, 0, 0], [0, 32, 0], [0, 0, 32]]
+    >>> rref_integer([[1, 2, 3], [2, 4, 6]])
+    [[1, 2, 3]]
+    """
+    rows = [row[:] for row in rows]
+    r = 0
+    previous = 1
+    for c in range(len(rows[0]) if rows else 0):
+        k = _pivot(rows, r, c)
+        if k is None:
+            continue
+        rows[r], rows[k] = rows[k], rows[r]
+        pivot = rows[r]
+        d = pivot[c]
+        for i in range(len(rows)):
+            if i != r:
+                a = rows[i][c]
+                rows[i] = [(d * x - a * y) / previous for x, y in zip(rows[i], pivot)]
+        previous = d
+        r += 1
+        if r == len(rows):
+            break
+    return rows[:r]
+
+def echelon(polys):
+    """
+    Returns the reduced Groebner basis of polynomials of degree at most 1,
+    sorted by leading monomial; [1] if they generate the whole ring
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz', order='grevlex')
+    >>> x, y, z = R.variables()
+    >>> echelon([x + 2*y - z, 2*x - y + 3, x + 7*y - 4*z - 3])
+    [z, y + (-3/5)*1, x + 6/5*1]
+    >>> echelon([x - 1, x - 2])
+    [1]
+    >>> S = PolynomialRing(PrimeField(7), 'xyz')
+    >>> x, y, z = S.variables()
+    >>> echelon([x + y, 3*y + z, x - z + 1])
+    [z + 2*1, y + 4*1, x + 3*1]
+    """
+    polys = [f for f in polys if not f.is_zero()]
+    if not polys:
+        return []
+    ring = polys[0].ring
+    field = ring.coeff_ring
+    p = field.p if isinstance(field, PrimeField) else None
+    columns = _columns(ring)
+    rows = _rows(polys, columns, p)
+    rows = rref_mod(rows, p) if p else rref_integer(rows)
+    basis = []
+    for row in reversed(rows):
+        monomials = []
+        coeffs = []
+        d = [x for x in row if x][0]
+        for j in range(len(columns) - 1, -1, -1):
+            if row[j]:
+                monomials.append(_monomial(ring, columns[j]))
+                coeffs.append(_mod(row[j], p) if p else Rational(row[j], d))
+        if len(monomials) == 1 and monomials[0].degree() == 0:
+            return [ring(1)]
+        basis.append(_polynomial(ring, monomials, coeffs))
+    return basis
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,6 @@
 from xgcd import xgcd
+import new
+import debug
 
 class Mod:
     """
@@ -45,14 +47,17 @@ class Mod:
         Mod(4, 5)
         >>> Mod(2, 5) + Mod(4, 5)
         Mod(1, 5)
+        >>> debug.CHECKS = True
         >>> Mod(2, 5) + Mod(3, 6)
         Traceback (most recent call last):
         ...
         AssertionError: cannot add Mods of different moduli
+        >>> debug.CHECKS = False
         """
-        assert other.p == self.p, "cannot add Mods of different moduli"
+        if debug.CHECKS:
+            assert other.p == self.p, "cannot add Mods of different moduli"
         x = self.x + other.x
-        return Mod(x, self.p)
+        return _mod(x - self.p if x >= self.p else x, self.p)
 
     def __sub__(self, other):
         """
@@ -61,14 +66,17 @@ class Mod:
         Mod(2, 5)
         >>> Mod(2, 5) - Mod(4, 5)
         Mod(3, 5)
+        >>> debug.CHECKS = True
         >>> Mod(2, 5) - Mod(3, 6)
         Traceback (most recent call last):
         ...
         AssertionError: cannot subtract Mods of different moduli
+        >>> debug.CHECKS = False
         """
-        assert other.p == self.p, "cannot subtract Mods of different moduli"
+        if debug.CHECKS:
+            assert other.p == self.p, "cannot subtract Mods of different moduli"
         x = self.x - other.x
-        return Mod(x, self.p)
+        return _mod(x + self.p if x < 0 else x, self.p)
 
     def __mul__(self, other):
         return self.coerce_mul(other)
@@ -83,14 +91,16 @@ class Mod:
         TESTS:
         >>> Mod(13, 19) * Mod(5, 19)
         Mod(8, 19)
+        >>> debug.CHECKS = True
         >>> Mod(5, 11) * Mod(3, 17)
         Traceback (most recent call last):
         ...
         AssertionError: cannot multiply Mods of different moduli
+        >>> debug.CHECKS = False
         """
-        assert other.p == self.p, "cannot multiply Mods of different moduli"
-        x = self.x * other.x
-        return Mod(x, self.p)
+        if debug.CHECKS:
+            assert other.p == self.p, "cannot multiply Mods of different moduli"
+        return _mod(self.x * other.x % self.p, self.p)
 
     def __invert__(self):
         """
@@ -103,13 +113,27 @@ class Mod:
         x = y[1]
         return Mod(x, self.p)
 
+    def __pow__(self, power):
+        """
+        TESTS:
+        >>> Mod(3, 7) ** 4
+        Mod(4, 7)
+        >>> Mod(3, 7) ** 0
+        Mod(1, 7)
+        >>> Mod(3, 7) ** -1
+        Mod(5, 7)
+        """
+        if power < 0:
+            return ~self ** -power
+        return Mod(pow(self.x, power, self.p), self.p)
+
     def __neg__(self):
         """
         TESTS:
         >>> -Mod(4, 9)
         Mod(5, 9)
         """
-        return Mod(-self.x + self.p, self.p)
+        return _mod(self.p - self.x if self.x else 0, self.p)
 
     def __div__(self, other):
         """
@@ -133,18 +157,40 @@ class Mod:
         """
         >>> Mod(4, 9) < Mod(5, 9)
         True
+        >>> debug.CHECKS = True
         >>> Mod(7, 19) < Mod(5, 7)
         Traceback (most recent call last):
         ...
         AssertionError: cannot compare Mods of different moduli
+        >>> debug.CHECKS = False
         >>> Mod(5, 7) > Mod(0, 7)
         True
         >>> Mod(88, 88) < Mod(98, 88)
         True
         """
-        assert other.p == self.p, "cannot compare Mods of different moduli"
+        if debug.CHECKS:
+            assert other.p == self.p, "cannot compare Mods of different moduli"
         return cmp(self.x, other.x)
 
+    def __hash__(self):
+        return hash(self.x)
+
+    def __nonzero__(self):
+        """
+        >>> bool(Mod(7, 7)), bool(Mod(3, 7))
+        (False, True)
+        """
+        return self.x != 0
+
+def _mod(x, p):
+    """
+    Mod(x, p) for 0 <= x < p, without reducing x
+    """
+    if debug.CHECKS:
+        assert 0 <= x < p, 'representative %d is not reduced modulo %d' % (x, p)
+        return Mod(x, p)
+    return new.instance(Mod, {'x': x, 'p': p})
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
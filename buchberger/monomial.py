@@ -1,7 +1,9 @@
 # This is a class that represents multivariate monomials, to be used in conjunction with a polynomial ring class.
 
-from PolynomialRing import PolynomialRing
-from CoefficientField import RationalField, PrimeField
+from polynomial_ring import PolynomialRing
+from coefficient_field import RationalField, PrimeField
+import new
+import debug
 
 class Monomial:
    
@@ -32,13 +34,15 @@ class Monomial:
         >>> Monomial(R, (3, 2, 1)) * Monomial(R, (1, 3, 2))
         x^4*y^5*z^3
         >>> J = PolynomialRing(QQ, 'xy')
+        >>> debug.CHECKS = True
         >>> Monomial(J, (2, 3)) * Monomial(R, (1, 3, 4))
         Traceback (most recent call last):
         AssertionError: Monomials should be from the same ring
+        >>> debug.CHECKS = False
         """
-        assert self.ring == other.ring, 'Monomials should be from the same ring'
-        x = [self.degrees[i] + other.degrees[i] for i in range(len(self.degrees))]
-        return Monomial(self.ring, x)
+        if debug.CHECKS:
+            assert self.ring == other.ring, 'Monomials should be from the same ring'
+        return _monomial(self.ring, tuple([i + j for i, j in zip(self.degrees, other.degrees)]))
 
     def __mul__(self, other):
         return self.coerce_mul(other)
@@ -77,12 +81,10 @@ class Monomial:
         Traceback (most recent call last):   
         ArithmeticError: Monomials with negative exponents are not members of the ring
         """
-        x = tuple([self.degrees[i] - other.degrees[i] for i in range(len(self.degrees))])
-        for i in range(len(x)):
-            if all([power >= 0 for power in x]):
-                return Monomial(self.ring, x)
-            else:
-                raise ArithmeticError, 'Monomials with negative exponents are not members of the ring'
+        x = tuple([i - j for i, j in zip(self.degrees, other.degrees)])
+        if min(x) < 0:
+            raise ArithmeticError, 'Monomials with negative exponents are not members of the ring'
+        return _monomial(self.ring, x)
 
     def __repr__(self):
         """
@@ -134,8 +136,7 @@ class Monomial:
         >>> Monomial(R, (4, 3, 7)) ** 3
         x^12*y^9*z^21
         """
-        x = tuple([self.degrees[i] * power for i in range(len(self.degrees))]) 
-        return Monomial(self.ring, x)
+        return _monomial(self.ring, tuple([i * power for i in self.degrees]))
 
     def __cmp__(self, other):
 
@@ -148,8 +149,16 @@ class Monomial:
         1
         >>> cmp(Monomial(R, (3, 1, 0)), Monomial(R, (3, 1, 0)))
         0
+        >>> R = PolynomialRing(QQ, ['x', 'y', 'z'], 'grevlex')
+        >>> cmp(Monomial(R, (2, 1, 0)), Monomial(R, (1, 0, 3)))
+        -1
+        >>> cmp(Monomial(R, (1, 0, 1)), Monomial(R, (0, 2, 0)))
+        -1
         """
-        return cmp(self.degrees, other.degrees)
+        key = self.ring._key
+        if key is None:
+            return cmp(self.degrees, other.degrees)
+        return cmp(key(self.degrees), key(other.degrees))
 
     def __getitem__(self, key):
 
@@ -187,6 +196,14 @@ class Monomial:
         """
         return self.degrees == other.degrees
 
+    def __hash__(self):
+        """
+        >>> R = PolynomialRing('QQ', 'xyz')
+        >>> len(set([Monomial(R, (0, 4, 2)), Monomial(R, (0, 4, 2)), Monomial(R, (1, 0, 0))]))
+        2
+        """
+        return hash(self.degrees)
+
     def gcd(self, other):
         """
         >>> R = PolynomialRing('QQ', 'xyz') 
@@ -197,13 +214,7 @@ class Monomial:
         >>> Monomial(R, (4, 1, 6)).gcd(Monomial(R, (5, 2, 8)))
         x^4*y*z^6
         """
-        new = []
-        for i,j in zip(self.degrees, other.degrees):
-            if i >= j:
-                new.append(j)
-            else:
-                new.append(i)
-        return Monomial(self.ring, tuple(new))
+        return _monomial(self.ring, tuple(map(min, self.degrees, other.degrees)))
 
     def lcm(self, other):
         """
@@ -211,7 +222,16 @@ class Monomial:
         >>> Monomial(R, (4, 1, 0)).lcm(Monomial(R, (3, 2, 0)))
         x^4*y^2
         """
-        return (self * other) / self.gcd(other)
+        return _monomial(self.ring, tuple(map(max, self.degrees, other.degrees)))
+
+def _monomial(ring, degrees):
+    """
+    Monomial(ring, degrees) without the length check, for a degrees tuple computed from monomials of the ring
+    """
+    if debug.CHECKS:
+        assert isinstance(degrees, tuple) and min(degrees) >= 0, 'invalid degrees %r' % (degrees,)
+        return Monomial(ring, degrees)
+    return new.instance(Monomial, {'degrees': degrees, 'ring': ring})
     
 if __name__ == '__main__':
     import doctest
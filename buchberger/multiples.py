@@ -0,0 +1,81 @@
+# A cache of the monomial multiples m*g of basis elements g used while reducing.  Polynomial.divide subtracts
+# c*(m*g) for each reduction step, and within one Groebner basis computation the same m*g come back again and again
+# for different S-polynomials.  The cache keeps, for each (g, m), the monomials of m*g; the coefficients are those of g,
+# shared rather than copied, and divide scales them by c while subtracting.  Entries are evicted least recently used
+# first once there are more than maxsize of them.
+#
+# Entries are keyed by id(g) and keep g alive, so an entry never answers for another polynomial that happens to get
+# the same id.  Buchberger clears its cache when the computation is finished, since nothing is reduced after that.
+
+from collections import OrderedDict
+from monomial import _monomial
+
+class MultipleCache:
+    """
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> g = x**2 - y
+    >>> cache = MultipleCache(maxsize=2)
+    >>> cache.multiple(g, y.LM())
+    [y^2, x^2*y]
+    >>> cache.multiple(g, y.LM()) is cache.multiple(g, y.LM())
+    True
+    >>> m = cache.multiple(g, x.LM()), cache.multiple(g, (x*y).LM())
+    >>> sorted(cache.stats().items())
+    [('evictions', 1), ('hits', 2), ('misses', 3), ('size', 2)]
+    >>> cache.clear()
+    >>> cache.stats()['size']
+    0
+
+    The cache does not change what a computation finds, and is cleared when
+    it is finished:
+
+    >>> from buchberger import Buchberger
+    >>> x, y, z = PolynomialRing(QQ, 'xyz').variables()
+    >>> F = [x**2*y - z**2 + 1, y**3 - 2*x*z, x*z**2 + y + 5]
+    >>> cached, uncached = Buchberger(F), Buchberger(F)
+    >>> uncached.cache = None
+    >>> cached.run() == uncached.run(), cached.cache.hits > 0, cached.cache.stats()['size']
+    (True, True, 0)
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def multiple(self, g, m):
+        """
+        Returns the monomials of m*g, in increasing order
+        """
+        key = (id(g), m.degrees)
+        entry = self.entries.pop(key, None)
+        if entry is not None and entry[0] is g:
+            self.hits += 1
+            self.entries[key] = entry
+            return entry[1]
+        self.misses += 1
+        ring = g.ring
+        e = m.degrees
+        monomials = [_monomial(ring, tuple([i + j for i, j in zip(e, n.degrees)])) for n in g.monomials]
+        self.entries[key] = (g, monomials)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return monomials
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries)}
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,38 @@
+# Times the Buchberger engine with and without the cache of monomial multiples, checks that both find the same bases
+# and prints how often the cache was hit.
+
+from polynomial import *
+from buchberger import Buchberger
+from random_ideals import FAMILIES
+from timing import timed, Table
+
+def run(ideals, cached):
+    """
+    Returns the bases of the ideals and the hits and misses of the caches
+    """
+    bases = []
+    hits = misses = 0
+    for I in ideals:
+        engine = Buchberger(I)
+        if not cached:
+            engine.cache = None
+        bases.append(engine.run())
+        if cached:
+            hits += engine.cache.hits
+            misses += engine.cache.misses
+    return bases, hits, misses
+
+def main():
+    table = Table('uncached', 'cached', 'hits')
+    for K in [PrimeField(32003), QQ]:
+        R = PolynomialRing(K, 'xyz')
+        for family in sorted(FAMILIES):
+            ideals = [[f for f in FAMILIES[family](R, seed) if not f.is_zero()] for seed in range(10)]
+            (expected, h, m), uncached = timed(lambda: run(ideals, False))
+            (bases, hits, misses), cached = timed(lambda: run(ideals, True))
+            assert bases == expected, '%s %s: the cached bases differ' % (K, family)
+            table.row('%s %s' % (K, family), uncached, cached, '%.0f%%' % (100.0 * hits / max(1, hits + misses)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# Monomial orders.  An order is given to PolynomialRing by name and turned into a key function on degree tuples here;
+# monomials are compared by comparing their keys as tuples.  The names are
+#
+#   lex        lexicographic, x > y > z, the default
+#   grlex      total degree, ties broken lexicographically
+#   grevlex    total degree, ties broken by the smaller exponent of the last variable that differs
+#   block<k>   an elimination order for the first k variables: grevlex on the first k variables, ties broken by grevlex
+#              on the others.  Every monomial containing one of the first k variables is larger than every monomial
+#              without them.
+#
+# For lex the key is the degree tuple itself and key() returns None, so that Monomial.__cmp__ can compare the tuples
+# directly.
+
+def grlex(degrees):
+    """
+    >>> grlex((1, 2, 0))
+    (3, 1, 2, 0)
+    """
+    return (sum(degrees),) + tuple(degrees)
+
+def grevlex(degrees):
+    """
+    >>> grevlex((1, 2, 0))
+    (3, 0, -2, -1)
+    """
+    return (sum(degrees),) + tuple([-e for e in reversed(degrees)])
+
+def block(k):
+    """
+    Returns the key of the elimination order for the first k variables
+
+    >>> key = block(1)
+    >>> key((1, 0, 0)) > key((0, 5, 5))
+    True
+    >>> key((0, 2, 0)) > key((0, 1, 1))
+    True
+    """
+    def key(degrees):
+        return grevlex(degrees[:k]) + grevlex(degrees[k:])
+    return key
+
+def key(order):
+    """
+    Returns the key function of the order with the given name, None for lex
+
+    >>> key('lex') is None
+    True
+    >>> key('grevlex')((0, 1))
+    (1, -1, 0)
+    >>> key('block2')((1, 0, 1))
+    (1, 0, -1, 1, -1)
+    >>> key('revlex')
+    Traceback (most recent call last):
+    ValueError: unknown monomial order 'revlex'
+    """
+    if order == 'lex':
+        return None
+    elif order == 'grlex':
+        return grlex
+    elif order == 'grevlex':
+        return grevlex
+    elif order.startswith('block') and order[5:].isdigit():
+        return block(int(order[5:]))
+    raise ValueError, 'unknown monomial order %r' % order
+
+def sort_key(ring):
+    """
+    Returns a key function for sorting degree tuples of ring in increasing order
+    """
+    return ring._key or tuple
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,364 @@
+# Greatest common divisors of multivariate polynomials, and contents and primitive parts.
+#
+# gcd(f, g) is normalized to be monic for the order of the ring.  The polynomials are taken apart into dictionaries
+# {degrees: coefficient} in lex order and handled by modular algorithms:
+#
+# - over GF(p), Brown's dense interpolation: the last variable is set to values a, the GCDs of the images are computed
+#   recursively down to one variable (univariate.gcd_dense) and interpolated back in the last variable.  Images
+#   whose leading monomial is larger than the others come from unlucky values and are dropped; a smaller one means
+#   all earlier images were unlucky.  The leading coefficients are fixed up with gamma, the GCD of the leading
+#   coefficients of f and g as polynomials in the last variable.  The result is accepted once there are more
+#   images than its degree in the last variable can need and it divides f and g.
+# - over QQ, f and g are scaled to integer polynomials and their GCD is computed modulo a sequence of 30-bit primes,
+#   the images being combined by Chinese remaindering until the combination stops changing and divides f and g.
+#
+# A field with fewer elements than the degrees involved can run out of values to substitute; the GCD is then
+# f*g / lcm(f, g), with the lcm the generator of the intersection of (f) and (g) (see ideal.py).
+
+from polynomial_ring import PolynomialRing
+from coefficient_field import RationalField, PrimeField, QQ
+from rational import Rational, gcd as integer_gcd, lcm as integer_lcm
+from polynomial import _polynomial
+from monomial import _monomial
+from grob_check import is_prime
+import univariate
+import orders
+
+def _dict(f):
+    """
+    f as {degrees: coefficient}, with integer coefficients over GF(p)
+    """
+    if isinstance(f.ring.coeff_ring, PrimeField):
+        return dict([(m.degrees, c.x) for m, c in zip(f.monomials, f.coeffs)])
+    return dict([(m.degrees, c) for m, c in zip(f.monomials, f.coeffs)])
+
+def _polynomial_from_dict(ring, d):
+    field = ring.coeff_ring
+    key = orders.sort_key(ring)
+    terms = sorted([(e, c) for e, c in d.iteritems() if c], key=lambda term: key(term[0]))
+    if isinstance(field, PrimeField):
+        return _polynomial(ring, [_monomial(ring, e) for e, c in terms], [field(c % field.p) for e, c in terms])
+    return _polynomial(ring, [_monomial(ring, e) for e, c in terms], [c for e, c in terms])
+
+def _monic(f):
+    return f * ~f.LC() if not f.is_zero() else f
+
+# Dictionaries over GF(p) in recursive form {degrees of the other variables: coefficient list in the last variable}
+
+def _recursive(f):
+    r = {}
+    for e, c in f.iteritems():
+        a = r.setdefault(e[:-1], [])
+        if len(a) <= e[-1]:
+            a.extend([0] * (e[-1] + 1 - len(a)))
+        a[e[-1]] = c
+    return r
+
+def _flat(r):
+    f = {}
+    for e, a in r.iteritems():
+        for k in range(len(a)):
+            if a[k]:
+                f[e + (k,)] = a[k]
+    return f
+
+def _value(a, x, p):
+    v = 0
+    for c in reversed(a):
+        v = (v * x + c) % p
+    return v
+
+def _divides(f, h, p):
+    """
+    Whether the dictionary h divides f, over GF(p) for integer coefficients
+    or over QQ for Rationals and p None
+    """
+    f = dict(f)
+    lead = max(h)
+    inverse = univariate.inverse(h[lead], p)
+    zero = 0 if p else Rational(0, 1)
+    while f:
+        e = max(f)
+        if any([i < j for i, j in zip(e, lead)]):
+            return False
+        m = tuple([i - j for i, j in zip(e, lead)])
+        c = f[e] * inverse % p if p else f[e] * inverse
+        for d, b in h.iteritems():
+            t = tuple([i + j for i, j in zip(m, d)])
+            v = (f.get(t, zero) - c * b) % p if p else f.get(t, zero) - c * b
+            if v:
+                f[t] = v
+            elif t in f:
+                del f[t]
+    return True
+
+def _gcd_mod(f, g, p):
+    """
+    The GCD of the nonzero dictionaries f and g with integer coefficients
+    modulo p, monic for lex, or None if GF(p) has too few elements
+    """
+    n = len(iter(f).next())
+    if n == 1:
+        a = univariate.gcd_dense(univariate._trim(_recursive(f)[()]), univariate._trim(_recursive(g)[()]), p)
+        return _flat({(): a})
+    F, G = _recursive(f), _recursive(g)
+    # the content, as polynomials in the last variable, is handled separately
+    cf = cg = []
+    for a in F.itervalues():
+        cf = univariate.gcd_dense(cf, a, p)
+    for a in G.itervalues():
+        cg = univariate.gcd_dense(cg, a, p)
+    content = univariate.gcd_dense(cf, cg, p)
+    F = dict([(e, univariate.divmod_dense(a, cf, p)[0]) for e, a in F.iteritems()])
+    G = dict([(e, univariate.divmod_dense(a, cg, p)[0]) for e, a in G.iteritems()])
+    lcf, lcg = F[max(F)], G[max(G)]
+    gamma = univariate.gcd_dense(lcf, lcg, p)
+    bound = min(max([len(a) for a in F.itervalues()]), max([len(a) for a in G.itervalues()])) + len(gamma)
+    f, g = _flat(F), _flat(G)
+    lead = None
+    for x in xrange(p):
+        gx = _value(gamma, x, p)
+        if not gx or not _value(lcf, x, p) or not _value(lcg, x, p):
+            continue
+        fx = dict([(e, _value(a, x, p)) for e, a in F.iteritems()])
+        gx_ = dict([(e, _value(a, x, p)) for e, a in G.iteritems()])
+        h = _gcd_mod(dict([(e, c) for e, c in fx.iteritems() if c]), dict([(e, c) for e, c in gx_.iteritems() if c]), p)
+        if h is None:
+            return None
+        m = max(h)
+        if not any(m):
+            # the primitive parts are coprime
+            return _monic_dict(_flat({(0,) * (n - 1): content}), p)
+        if lead is None or m < lead:
+            lead = m
+            H = dict([(e, [c * gx % p]) for e, c in h.iteritems()])
+            modulus = [(-x) % p, 1]
+            points = 1
+        elif m > lead:
+            continue
+        else:
+            # Newton interpolation: H += (gamma(x) * h - H(x)) * modulus / modulus(x)
+            scale = univariate.inverse(_value(modulus, x, p), p)
+            for e in set(H) | set(h):
+                a = H.get(e, [])
+                d = (h.get(e, 0) * gx - _value(a, x, p)) * scale % p
+                if d:
+                    H[e] = univariate.add(a, [c * d % p for c in modulus], p)
+            modulus = univariate.mul(modulus, [(-x) % p, 1], p)
+            points += 1
+        if points >= bound:
+            c = []
+            for a in H.itervalues():
+                c = univariate.gcd_dense(c, a, p)
+            candidate = _flat(dict([(e, univariate.divmod_dense(a, c, p)[0]) for e, a in H.iteritems()]))
+            if _divides(f, candidate, p) and _divides(g, candidate, p):
+                product = _flat(dict([(e, univariate.mul(a, content, p)) for e, a in _recursive(candidate).iteritems()]))
+                return _monic_dict(product, p)
+    return None
+
+def _monic_dict(f, p):
+    inverse = univariate.inverse(f[max(f)], p)
+    return dict([(e, c * inverse % p if p else c * inverse) for e, c in f.iteritems()])
+
+def _primes(start=2**30):
+    n = start
+    while True:
+        n -= 1
+        if is_prime(n):
+            yield n
+
+def _integer_dict(f):
+    """
+    The polynomial c*f with coprime integer coefficients, for a Rational c, as a dictionary
+    """
+    d = _dict(f)
+    denominator = reduce(integer_lcm, [c.d for c in d.itervalues()], 1)
+    d = dict([(e, c.n * (denominator / c.d)) for e, c in d.iteritems()])
+    g = reduce(integer_gcd, d.itervalues(), 0)
+    return dict([(e, c / g) for e, c in d.iteritems()])
+
+def _rationals(f):
+    return dict([(e, Rational(c, 1)) for e, c in f.iteritems()])
+
+def _gcd_rational(f, g):
+    """
+    The GCD of the nonzero dictionaries f and g with integer coefficients
+    over QQ, with coprime integer coefficients
+    """
+    lead_f, lead_g = f[max(f)], g[max(g)]
+    gamma = integer_gcd(lead_f, lead_g)
+    rational_f, rational_g = _rationals(f), _rationals(g)
+    H = None
+    for p in _primes():
+        if lead_f % p == 0 or lead_g % p == 0:
+            continue
+        fp = dict([(e, c % p) for e, c in f.iteritems() if c % p])
+        gp = dict([(e, c % p) for e, c in g.iteritems() if c % p])
+        h = _gcd_mod(fp, gp, p)
+        if h is None:
+            continue
+        m = max(h)
+        if not any(m):
+            return {m: 1}
+        h = dict([(e, c * gamma % p) for e, c in h.iteritems()])
+        if H is None or m < max(H):
+            H, modulus = h, p
+            previous = None
+            continue
+        elif m > max(H):
+            continue
+        # Chinese remaindering into the symmetric range
+        u = univariate.inverse(modulus % p, p)
+        combined = {}
+        for e in set(H) | set(h):
+            a = H.get(e, 0)
+            c = a + modulus * ((h.get(e, 0) - a) * u % p)
+            if c > modulus * p / 2:
+                c -= modulus * p
+            if c:
+                combined[e] = c
+        H, modulus = combined, modulus * p
+        if combined == previous:
+            content = reduce(integer_gcd, H.itervalues(), 0)
+            candidate = dict([(e, c / content) for e, c in H.iteritems()])
+            if _divides(rational_f, _rationals(candidate), None) and _divides(rational_g, _rationals(candidate), None):
+                return candidate
+        previous = combined
+
+def _gcd_by_lcm(f, g):
+    from ideal import Ideal
+    from elimination import transfer
+    lcm = Ideal([f]).intersection(Ideal([g])).basis()[0]
+    q, r = (transfer(f, lcm.ring) * transfer(g, lcm.ring)).divide([lcm])
+    return transfer(q[0], f.ring)
+
+def gcd(f, g):
+    """
+    Returns the monic greatest common divisor of f and g
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> gcd((x**2 - y*z) * (3*x + z), (x**2 - y*z) * (x*y - 2))
+    x^2 + (-1)*y*z
+    >>> gcd(2*x*y + 4*y, 6*x**2 + 12*x)
+    x + 2*1
+    >>> gcd(x + y, x - y), gcd(R(0), 2*z)
+    (1, z)
+    >>> S = PolynomialRing(PrimeField(32003), 'xyz', 'grevlex')
+    >>> x, y, z = S.variables()
+    >>> h = x*y*z + 3*z**2 - 1
+    >>> gcd(h * (x**3 - y), h * (y**2 + z) * (x + z))
+    x*y*z + 3*z^2 + 32002*1
+    >>> T = PolynomialRing(PrimeField(3), 'xy')
+    >>> x, y = T.variables()
+    >>> gcd((x*y**4 + x + 1) * (x**5 + y**5 + 1), (x*y**4 + x + 1) * (x**5*y**5 + 2))
+    x*y^4 + x + 1
+    >>> gcd((2*x*y + x + 1) * (x**3*y + y + 1), (2*x*y + x + 1) * (x*y**3 + x + 2))
+    x*y + 2*x + 2*1
+    """
+    ring = f.ring
+    if f.is_zero() or g.is_zero():
+        return _monic(g if f.is_zero() else f)
+    if univariate.supports(ring):
+        return univariate.gcd([f, g])
+    field = ring.coeff_ring
+    if isinstance(field, PrimeField):
+        h = _gcd_mod(_dict(f), _dict(g), field.p)
+        if h is None:
+            return _monic(_gcd_by_lcm(f, g))
+    elif not isinstance(field, RationalField):
+        return _monic(_gcd_by_lcm(f, g))
+    else:
+        h = _gcd_rational(_integer_dict(f), _integer_dict(g))
+        h = _rationals(h)
+    return _monic(_polynomial_from_dict(ring, h))
+
+def gcd_list(polys):
+    """
+    The monic GCD of the polynomials in polys, 0 if all of them are 0
+    """
+    h = polys[0].ring(0)
+    for f in polys:
+        h = gcd(h, f)
+        if not h.is_zero() and h.LM().degree() == 0:
+            break
+    return h
+
+def divide_exact(f, h):
+    """
+    Returns f / h, for h dividing f
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> divide_exact(x**2 - y**2, x + y)
+    x + (-1)*y
+    >>> divide_exact(x**2, x + y)
+    Traceback (most recent call last):
+    ValueError: x + y does not divide x^2
+    """
+    q, r = f.divide([h])
+    if not r.is_zero():
+        raise ValueError, '%s does not divide %s' % (h, f)
+    return q[0]
+
+def content(f, variable=None):
+    """
+    With a variable, given by name or as a polynomial, returns the monic GCD
+    of the coefficients of f as a polynomial in that variable.  Without,
+    returns the constant c such that f/c is primitive: with coprime integer
+    coefficients and a positive leading coefficient over QQ, monic over GF(p).
+
+    >>> from polynomial import *
+    >>> from rational import Rational
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> content(x**2*y**2 + 2*x*y**2 + y**3 + y**2, 'x')
+    y^2
+    >>> content(Rational(4, 3)*x - 2*y)
+    Rational(2, 3)
+    """
+    ring = f.ring
+    if variable is None:
+        if f.is_zero():
+            return ring.coeff_ring(1)
+        if isinstance(ring.coeff_ring, PrimeField):
+            return f.LC()
+        n = reduce(integer_gcd, [c.n for c in f.coeffs], 0)
+        d = reduce(integer_lcm, [c.d for c in f.coeffs], 1)
+        return Rational(n if f.LC().n > 0 else -n, d)
+    if not isinstance(variable, str):
+        variable = ring.var_list[list(variable.LM().degrees).index(1)]
+    k = ring.var_list.index(variable)
+    coefficients = {}
+    for m, c in zip(f.monomials, f.coeffs):
+        e = m.degrees
+        coefficients.setdefault(e[k], {})[e[:k] + (0,) + e[k+1:]] = c
+    polys = [_polynomial_from_dict(ring, d) for d in coefficients.itervalues()]
+    return gcd_list(polys) if polys else ring(0)
+
+def primitive_part(f, variable=None):
+    """
+    f divided by its content, see content
+
+    >>> from polynomial import *
+    >>> from rational import Rational
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> primitive_part(x**2*y**2 + 2*x*y**2 + y**3 + y**2, 'x')
+    x^2 + 2*x + y + 1
+    >>> primitive_part(Rational(4, 3)*x - 2*y)
+    2*x + (-3)*y
+    """
+    c = content(f, variable)
+    if variable is None:
+        return f * ~c
+    return divide_exact(f, c)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -3,6 +3,19 @@
 from monomial import Monomial
 from polynomial_ring import PolynomialRing
 from coefficient_field import RationalField, PrimeField, QQ
+from rational import Rational
+from mod import Mod
+from finite_field import FFElement
+from collections import OrderedDict
+import kronecker
+import univariate
+import debug
+import new
+
+# __pow__ expands polynomials with at most this many terms by the multinomial theorem
+MULTINOMIAL_TERMS = 3
+# __pow__ keeps at most this many powers of a polynomial on it, dropping the oldest first
+POWER_CACHE = 4
 
 class Polynomial:
 
@@ -29,9 +42,10 @@ class Polynomial:
         else:
             self.coeffs = coeffs
         assert len(self.coeffs) == len(self.monomials), 'Coefficient list length should equal monomial list length'
-        zero = self.ring.coeff_ring(0)
-        self.monomials = [self.monomials[i] for i in range(len(self.monomials)) if self.coeffs[i] != zero]
-        self.coeffs = [coeff for coeff in self.coeffs if coeff != zero]
+        nonzero = [i for i in range(len(self.coeffs)) if self.coeffs[i]]
+        if len(nonzero) < len(self.coeffs):
+            self.monomials = [self.monomials[i] for i in nonzero]
+            self.coeffs = [self.coeffs[i] for i in nonzero]
         assert all([isinstance(monomial, Monomial) for monomial in self.monomials]), 'Monomial list should only contain monomials'
         assert all([self.monomials[i] < self.monomials[i+1] for i in range(len(self.monomials)-1)]), 'Monomials should be distinct and ordered from least to greatest'
         
@@ -98,13 +112,16 @@ class Polynomial:
         coeffs = []
         L1 = len(self.monomials)
         L2 = len(other.monomials)
-        while i < L1 or j < L2:
-            if (i < L1 and j < L2) and self.monomials[i] == other.monomials[j]:
-                monomials.append(self.monomials[i])
-                coeffs.append(self.coeffs[i] + other.coeffs[j])
+        while i < L1 and j < L2:
+            order = cmp(self.monomials[i], other.monomials[j])
+            if order == 0:
+                c = self.coeffs[i] + other.coeffs[j]
+                if c:
+                    monomials.append(self.monomials[i])
+                    coeffs.append(c)
                 i += 1
                 j += 1
-            elif i == L1 or (j < L2 and self.monomials[i] > other.monomials[j]):
+            elif order > 0:
                 monomials.append(other.monomials[j])
                 coeffs.append(other.coeffs[j])
                 j += 1
@@ -112,7 +129,11 @@ class Polynomial:
                 monomials.append(self.monomials[i])
                 coeffs.append(self.coeffs[i])
                 i += 1
-        return Polynomial(self.ring, monomials, coeffs)
+        monomials.extend(self.monomials[i:])
+        coeffs.extend(self.coeffs[i:])
+        monomials.extend(other.monomials[j:])
+        coeffs.extend(other.coeffs[j:])
+        return _polynomial(self.ring, monomials, coeffs)
 
     def __radd__(self, other):
         """
@@ -145,13 +166,16 @@ class Polynomial:
         coeffs = []
         L1 = len(self.monomials)
         L2 = len(other.monomials)
-        while i < L1 or j < L2:
-            if (i < L1 and j < L2) and self.monomials[i] == other.monomials[j]:
-                monomials.append(self.monomials[i])
-                coeffs.append(self.coeffs[i] - other.coeffs[j])
+        while i < L1 and j < L2:
+            order = cmp(self.monomials[i], other.monomials[j])
+            if order == 0:
+                c = self.coeffs[i] - other.coeffs[j]
+                if c:
+                    monomials.append(self.monomials[i])
+                    coeffs.append(c)
                 i += 1
                 j += 1
-            elif i == L1 or (j < L2 and self.monomials[i] > other.monomials[j]):
+            elif order > 0:
                 monomials.append(other.monomials[j])
                 coeffs.append(-other.coeffs[j])
                 j += 1
@@ -159,7 +183,11 @@ class Polynomial:
                 monomials.append(self.monomials[i])
                 coeffs.append(self.coeffs[i])
                 i += 1
-        return Polynomial(self.ring, monomials, coeffs)   
+        monomials.extend(self.monomials[i:])
+        coeffs.extend(self.coeffs[i:])
+        monomials.extend(other.monomials[j:])
+        coeffs.extend([-c for c in other.coeffs[j:]])
+        return _polynomial(self.ring, monomials, coeffs)
 
     def __rsub__(self, other):
         """
@@ -213,6 +241,11 @@ class Polynomial:
         2*x^2
         >>> x**2 * 0
         0
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> f = (x + y + z + 1)**3
+        >>> f * f == f.cub_mul(f)   # dense enough for kronecker.kronecker_mul
+        True
         """
         if not isinstance(other, Polynomial):
             other = self.ring(other)
@@ -224,15 +257,20 @@ class Polynomial:
         L1, L2 = len(f.monomials), len(g.monomials)
 
         if not L2:
-            return Polynomial(self.ring, [], [])
+            return _polynomial(self.ring, [], [])
         elif L2 == 1:
-            return Polynomial(self.ring, [m * g.monomials[0] for m in f.monomials], [m * g.coeffs[0] for m in f.coeffs])
+            return _polynomial(self.ring, [m * g.monomials[0] for m in f.monomials], [m * g.coeffs[0] for m in f.coeffs])
+        elif self.ring._num_vars == 1 and isinstance(self.ring.coeff_ring, PrimeField) and \
+             univariate.is_dense(f) and univariate.is_dense(g):
+            return univariate.multiply(f, g)
+        elif kronecker.is_profitable(f, g):
+            return kronecker.kronecker_mul(f, g)
         else:
             h1 = g.monomials[:L2/2]
             h2 = g.monomials[L2/2:]
             c1 = g.coeffs[:L2/2]
             c2 = g.coeffs[L2/2:]
-            return f * Polynomial(self.ring, h1, c1) + f * Polynomial(self.ring, h2, c2)
+            return f * _polynomial(self.ring, h1, c1) + f * _polynomial(self.ring, h2, c2)
 
     def __mul__(self, other):
         return self.coerce_mul(other)
@@ -269,8 +307,12 @@ class Polynomial:
     
         return self * other
     
-    def divide(self, divisors):
+    def divide(self, divisors, cache=None):
         """
+        Returns the quotients and the remainder of the division by divisors.
+        With a multiples.MultipleCache the multiples m*divisors[i] subtracted
+        in each step are taken from the cache.
+
         >>> R = PolynomialRing(QQ, 'xyz')
         >>> x, y, z = R.variables()
         >>> (x**2*y + x*y**2 + y**2).divide([x*y + (-1), y**2 - 1])
@@ -286,15 +328,31 @@ class Polynomial:
         >>> (x**2).divide([R(0)])
         Traceback (most recent call last):
         ZeroDivisionError
+        >>> from multiples import MultipleCache
+        >>> cache = MultipleCache()
+        >>> F = [x*y + (-1), y**2 - 1]
+        >>> (x**2*y + x*y**2 + y**2).divide(F, cache)
+        ([x + y, 1], x + y + 1)
+        >>> (x**2*y + x*y**2 + y**2).divide(F, cache)[1] == x + y + 1
+        True
+        >>> cache.stats()['hits']
+        3
         """
         if all([not divisors[i].monomials and not divisors[i].coeffs for i in range(len(divisors))]):
             raise ZeroDivisionError
         if not all([isinstance(divisor, Polynomial) for divisor in divisors]): # maybe change this to an error
             divisors = [self.ring(divisor) for divisor in divisors]
 
-        p = Polynomial(self.ring, self.monomials[:], self.coeffs[:])
-        quots = [Polynomial(self.ring, [], []) for divisor in divisors]
-        r = Polynomial(self.ring, [], [])
+        if univariate.supports(self.ring):
+            return univariate.divide(self, divisors)
+        if isinstance(self.ring.coeff_ring, PrimeField) and self.ring.coeff_ring.vectorized and \
+           len(self.monomials) >= gfp_array_min_terms():
+            import gfp_array
+            return gfp_array.divide(self, divisors)
+
+        p = _polynomial(self.ring, self.monomials[:], self.coeffs[:])
+        quots = [_polynomial(self.ring, [], []) for divisor in divisors]
+        r = _polynomial(self.ring, [], [])
         while p.monomials:
             i = 0
             division_occurred = False
@@ -307,7 +365,10 @@ class Polynomial:
                 if LM_p.is_divisible(LM_i):
                     quots[i].monomials.append(LM_p / LM_i)
                     quots[i].coeffs.append(LC_p / LC_i)
-                    p = p - (Polynomial(self.ring, [LM_p / LM_i], [LC_p / LC_i]) * divisors[i])
+                    if cache is not None:
+                        p = _sub_multiple(p, LC_p / LC_i, cache.multiple(divisors[i], LM_p / LM_i), divisors[i].coeffs)
+                    else:
+                        p = p - (_polynomial(self.ring, [LM_p / LM_i], [LC_p / LC_i]) * divisors[i])
                     division_occurred = True
                 else:
                     i += 1
@@ -317,37 +378,134 @@ class Polynomial:
         for i in range(len(quots)): 
             quots[i].monomials = list(reversed(quots[i].monomials))
             quots[i].coeffs = list(reversed(quots[i].coeffs))
-        return quots, Polynomial(self.ring, list(reversed(r.monomials)), list(reversed(r.coeffs)))
+        return quots, _polynomial(self.ring, list(reversed(r.monomials)), list(reversed(r.coeffs)))
                     
+    def top_reduce(self, divisors, cache=None):
+        """
+        Subtracts multiples of divisors from the polynomial until its leading
+        monomial is divisible by none of their leading monomials, and returns
+        the result; unlike divide, the lower terms are left unreduced.  cache
+        is a multiples.MultipleCache as for divide.
+
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> (x**2*y + x*y**2 + y**2).top_reduce([x*y + (-1), y**2 - 1])
+        x + y^2 + y
+        >>> (x**2*y + x*y**2 + y**2).divide([x*y + (-1), y**2 - 1])[1]
+        x + y + 1
+        >>> (x**2 - y**2).top_reduce([x + y])
+        0
+        """
+        if univariate.supports(self.ring) and self.monomials:
+            return univariate.divide(self, divisors)[1]
+        p = self
+        while p.monomials:
+            LM_p = p.monomials[-1]
+            LC_p = p.coeffs[-1]
+            for g in divisors:
+                if g.monomials and LM_p.is_divisible(g.monomials[-1]):
+                    m = LM_p / g.monomials[-1]
+                    c = LC_p / g.coeffs[-1]
+                    if cache is not None:
+                        p = _sub_multiple(p, c, cache.multiple(g, m), g.coeffs)
+                    else:
+                        p = p - _polynomial(self.ring, [m], [c]) * g
+                    break
+            else:
+                return p
+        return p
+
     def __pow__(self, power):
         """
+        Single terms are raised termwise, polynomials with at most
+        MULTINOMIAL_TERMS terms are expanded by the multinomial theorem and
+        longer ones by repeated squaring.  Every power computed is kept in a
+        cache on the polynomial and reused by later powers.
+
         >>> from polynomial import *
         >>> R = PolynomialRing(QQ, 'xyz')
         >>> x, y, z = R.variables()
         >>> x**2
         x^2
-        >>> 
-        x^4*z^2 + 2*x^4*z + x^4
         >>> Polynomial(R, [Monomial(R, (2, 0, 0)), Monomial(R, (2, 0, 1))], [1, 1])**0
         1
         >>> Polynomial(R, [Monomial(R, (2, 0, 0)), Monomial(R, (2, 0, 1))], [1, 1])**1
         x^2*z + x^2
+        >>> Polynomial(R, [Monomial(R, (2, 0, 0)), Monomial(R, (2, 0, 1))], [1, 1])**2
+        x^4*z^2 + 2*x^4*z + x^4
         >>> Polynomial(R, [Monomial(R, (0, 1, 0)), Monomial(R, (1, 0, 0))], [1, 1])**3
         x^3 + 3*x^2*y + 3*x*y^2 + y^3
         >>> Polynomial(R, [Monomial(R, (1, 1, 1))], [1])**5
         x^5*y^5*z^5
+        >>> (-2*x*y)**3
+        (-8)*x^3*y^3
+        >>> (x + x*y + y)**2 == (x + x*y + y).cub_mul(x + x*y + y)
+        True
+        >>> f = x + 2*y - z + x*y + 3
+        >>> f**5 == f * f * f * f * f
+        True
+        >>> sorted(f._powers)
+        [2, 5]
+        >>> g = [f**k for k in range(2, 8)]
+        >>> len(f._powers), 7 in f._powers
+        (4, True)
+        >>> S = PolynomialRing(PrimeField(5), 'xy')
+        >>> x, y = S.variables()
+        >>> (x + y)**5
+        x^5 + y^5
+        >>> (x + y)**0
+        1
+        >>> x**-1
+        Traceback (most recent call last):
+        ArithmeticError: Polynomials can only be raised to non-negative powers
         """
-        i = 0
-        x = Polynomial(self.ring, self.monomials, self.coeffs)
+        if power < 0:
+            raise ArithmeticError, 'Polynomials can only be raised to non-negative powers'
         if power == 0:
-            return Polynomial(self.ring, [Monomial(self.ring, (0, 0, 0))], [1]) 
+            return self.ring(1)
         elif power == 1:
             return self
-        else:
-            for i in range(power-1):
-                x = x * self
-            return x
-    
+        powers = self.__dict__.setdefault('_powers', OrderedDict())
+        if power not in powers:
+            if len(self.monomials) <= 1:
+                result = _polynomial(self.ring, [m**power for m in self.monomials], [c**power for c in self.coeffs])
+            elif len(self.monomials) <= MULTINOMIAL_TERMS:
+                result = self._multinomial_power(power)
+            else:
+                half = self**(power / 2)
+                result = half * half if power % 2 == 0 else half * half * self
+            if len(powers) >= POWER_CACHE:
+                powers.popitem(last=False)
+            powers[power] = result
+        return powers[power]
+
+    def _multinomial_power(self, power):
+        """
+        Expands self**power by the multinomial theorem
+        """
+        n = len(self.monomials)
+        binomials = [[1]]
+        for i in range(power):
+            row = binomials[-1]
+            binomials.append([1] + [row[k] + row[k+1] for k in range(i)] + [1])
+        monomial_powers = [[m**k for k in range(power + 1)] for m in self.monomials]
+        coeff_powers = [[c**k for k in range(power + 1)] for c in self.coeffs]
+        terms = {}
+
+        def expand(i, left, monomial, coeff):
+            if i == n - 1:
+                monomial = monomial * monomial_powers[i][left]
+                coeff = coeff * coeff_powers[i][left]
+                terms[monomial.degrees] = terms[monomial.degrees] + coeff if monomial.degrees in terms else coeff
+                return
+            for k in range(left + 1):
+                expand(i + 1, left - k, monomial * monomial_powers[i][k], coeff * coeff_powers[i][k] * self.ring.coeff_ring(binomials[left][k]))
+
+        one = Monomial(self.ring, (0,) * self.ring.num_vars())
+        expand(0, power, one, self.ring.coeff_ring(1))
+        monomials = sorted([Monomial(self.ring, d) for d in terms if terms[d]])
+        return _polynomial(self.ring, monomials, [terms[m.degrees] for m in monomials])
+
     def LM(self):
         """
         A function that returns the leading monomial of a polynomial
@@ -385,9 +543,9 @@ class Polynomial:
         0
         """
         if self.is_zero():
-            return Polynomial(self.ring, [], [])
+            return _polynomial(self.ring, [], [])
         else:
-            return Polynomial(self.ring, [self.LM()], [self.coeffs[-1]])
+            return _polynomial(self.ring, [self.LM()], [self.coeffs[-1]])
 
     def LC(self):
         """
@@ -417,7 +575,7 @@ class Polynomial:
         """
         Returns a the additive inverse of a polynomial
         """
-        return Polynomial(self.ring, self.monomials, [-coeff for coeff in self.coeffs])
+        return _polynomial(self.ring, self.monomials, [-coeff for coeff in self.coeffs])
 
     def LC_is_one(self):
         """
@@ -484,12 +642,113 @@ class Polynomial:
         zero = self.ring(0)
         if self.is_zero() or other.is_zero():
             return zero
+        elif isinstance(self.ring.coeff_ring, PrimeField) and self.ring.coeff_ring.vectorized and \
+             len(self.monomials) + len(other.monomials) >= gfp_array_min_terms():
+            import gfp_array
+            return gfp_array.S_polynomial(self, other)
         else:
             LCM = self.LM().lcm(other.LM())
-            s_f = Polynomial(self.ring, [LCM / self.LM()], [self.ring.coeff_ring(1) / self.LT().coeffs[0]])
-            s_g = Polynomial(other.ring, [LCM / other.LM()], [other.ring.coeff_ring(1) / other.LT().coeffs[0]])
+            s_f = _polynomial(self.ring, [LCM / self.LM()], [self.ring.coeff_ring(1) / self.LC()])
+            s_g = _polynomial(other.ring, [LCM / other.LM()], [other.ring.coeff_ring(1) / other.LC()])
             return s_f * self - s_g * other
-        
+
+    def evaluate(self, point):
+        """
+        Returns the value of the polynomial at `point', a sequence with one
+        value per variable, by a multivariate Horner scheme: the terms are
+        grouped by the power of the first variable and each group is
+        evaluated recursively in the remaining variables.  Over QQ the point
+        may be given as floats.
+
+        TESTS:
+
+        >>> from rational import Rational
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> x, y, z = R.variables()
+        >>> f = x**3*y - 2*x*y*z + Rational(1, 2)*z**2 + 5
+        >>> f.evaluate((1, 2, 3))
+        Rational(-1, 2)
+        >>> f.evaluate((Rational(1, 2), 0, -1))
+        Rational(11, 2)
+        >>> f.evaluate((1.5, 2.0, 0.0))
+        11.75
+        >>> R(0).evaluate((1, 2, 3))
+        Rational(0, 1)
+        >>> S = PolynomialRing(PrimeField(7), 'xy')
+        >>> x, y = S.variables()
+        >>> (x**6 + 3*x*y**2 + y).evaluate((3, 5))
+        Mod(0, 7)
+        >>> (x + y).evaluate((0.5, 1.0))
+        Traceback (most recent call last):
+        ValueError: float points need rational coefficients
+        """
+        field = self.ring.coeff_ring
+        if any([isinstance(v, float) for v in point]):
+            if not isinstance(field, RationalField):
+                raise ValueError, 'float points need rational coefficients'
+            zero = 0.0
+            terms = [(m.degrees, float(c.n) / c.d) for m, c in zip(self.monomials, self.coeffs)]
+        else:
+            zero = field(0)
+            point = [field(v) for v in point]
+            terms = zip([m.degrees for m in self.monomials], self.coeffs)
+        terms.sort(key=lambda term: term[0], reverse=True)
+        n = self.ring.num_vars()
+
+        # with the terms in decreasing lex order, the terms with the same power
+        # of variable k are consecutive and these powers decrease
+        def horner(terms, k):
+            if k == n:
+                return terms[0][1]
+            value = None
+            start = 0
+            while start < len(terms):
+                e = terms[start][0][k]
+                end = start
+                while end < len(terms) and terms[end][0][k] == e:
+                    end += 1
+                inner = horner(terms[start:end], k + 1)
+                value = inner if value is None else value * point[k]**(previous - e) + inner
+                previous = e
+                start = end
+            return value * point[k]**previous if previous else value
+
+        if not terms:
+            return zero
+        return horner(terms, 0)
+
+    def evaluate_many(self, points):
+        """
+        Returns the values of the polynomial at each of `points'.  Over GF(p)
+        with p < 2**31, and over QQ for points with float coordinates, all
+        points are evaluated at once with NumPy (see evaluation.py) and the
+        values come back as a NumPy array; otherwise they are a list computed
+        by evaluate.
+
+        TESTS:
+
+        >>> R = PolynomialRing(PrimeField(101), 'xy')
+        >>> x, y = R.variables()
+        >>> (x**2*y + 100).evaluate_many([(1, 1), (2, 3), (R.coeff_ring(5), R.coeff_ring(7))]).tolist()
+        [0, 11, 73]
+        >>> S = PolynomialRing(QQ, 'xy')
+        >>> x, y = S.variables()
+        >>> (x**2*y + 1).evaluate_many([(1, 1), (2, 3)])
+        [Rational(2, 1), Rational(13, 1)]
+        >>> (x**2*y + 1).evaluate_many([(0.5, 4.0)]).tolist()
+        [2.0]
+        >>> T = PolynomialRing(PrimeField(2**61 - 1), 'xy')
+        >>> x, y = T.variables()
+        >>> (x**2*y + 1).evaluate_many([(2**40, 1), (2, 3)])
+        [Mod(524289, 2305843009213693951), Mod(13, 2305843009213693951)]
+        """
+        field = self.ring.coeff_ring
+        if isinstance(field, PrimeField) and field.p < 2**31 or \
+           any([isinstance(v, float) for point in points for v in point]):
+            import evaluation
+            return evaluation.evaluate_many(self, points)
+        return [self.evaluate(point) for point in points]
+
     def __eq__(self, other):
         """
         Tests the equality of two polynomials
@@ -498,7 +757,122 @@ class Polynomial:
 #        try: 
 #        except AttributeError:
 #            return self.monomials == self.ring(other).monomials and self.coeffs == self.ring(other).coeffs
+
+    def __hash__(self):
+        """
+        Polynomials are not changed after they are made, so they can be kept
+        in sets and dictionaries
+
+        >>> R = PolynomialRing(QQ, 'xy')
+        >>> x, y = R.variables()
+        >>> len(set([x*y - 1, y*x - 1, x*y + 1]))
+        2
+        """
+        return hash((tuple(self.monomials), tuple(self.coeffs)))
+
+    def __getstate__(self):
+        """
+        The state without the caches kept on the polynomial, the powers of
+        __pow__ and the array of gfp_array.from_polynomial, which are rebuilt
+        when they are needed
+
+        >>> import pickle
+        >>> R = PolynomialRing(QQ, 'xy')
+        >>> x, y = R.variables()
+        >>> f = x + y + 1
+        >>> g = f**3
+        >>> h = pickle.loads(pickle.dumps(f))
+        >>> h == f, '_powers' in h.__dict__, h**3 == g
+        (True, False, True)
+        """
+        state = self.__dict__.copy()
+        state.pop('_powers', None)
+        state.pop('_array', None)
+        return state
     
+def _polynomial(ring, monomials, coeffs):
+    """
+    Polynomial(ring, monomials, coeffs) without coercion or checks, for the
+    results of arithmetic: the monomials must be distinct and increasing and
+    the coefficients nonzero elements of ring.coeff_ring.  With debug.CHECKS
+    this is verified.
+
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> _polynomial(R, [y.LM(), x.LM()], [QQ(1), QQ(2)])
+    2*x + y
+    >>> debug.CHECKS = True
+    >>> _polynomial(R, [x.LM(), y.LM()], [QQ(1), QQ(2)])
+    Traceback (most recent call last):
+    AssertionError: Monomials should be distinct and ordered from least to greatest
+    >>> _polynomial(R, [y.LM(), x.LM()], [QQ(0), QQ(2)])
+    Traceback (most recent call last):
+    AssertionError: zero coefficient in [Rational(0, 1), Rational(2, 1)]
+    >>> f, F = (x + 2*y + 5)**4, [x**2*y - 3, y**3 - 2*x]
+    >>> checked = f * (x*y - 1), f.divide(F)
+    >>> from coefficient_field import FiniteField
+    >>> K = FiniteField(3, 2)
+    >>> a = K.gen()
+    >>> u, v = PolynomialRing(K, 'uv').variables()
+    >>> (u + v)*(u - v), (a*u + v)**3
+    (u^2 + 2*v^2, a^3*u^3 + v^3)
+    >>> debug.CHECKS = False
+    >>> checked == (f * (x*y - 1), f.divide(F))
+    True
+    """
+    if debug.CHECKS:
+        assert all([isinstance(c, (Rational, Mod, FFElement)) for c in coeffs]), 'coefficients should be field elements'
+        assert all(coeffs), 'zero coefficient in %s' % coeffs
+        return Polynomial(ring, monomials, coeffs)
+    return new.instance(Polynomial, {'ring': ring, 'monomials': monomials, 'coeffs': coeffs})
+
+def _sub_multiple(p, c, monomials, coeffs):
+    """
+    Returns p - c*g for the polynomial g with the given monomials and
+    coefficients, merging without building c*g
+
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> x, y = R.variables()
+    >>> g = x*y - 1
+    >>> _sub_multiple(x**2*y + y, QQ(1), [x.LM(), (x**2*y).LM()], g.coeffs)
+    x + y
+    """
+    i = 0
+    j = 0
+    result_monomials = []
+    result_coeffs = []
+    L1 = len(p.monomials)
+    L2 = len(monomials)
+    while i < L1 and j < L2:
+        order = cmp(p.monomials[i], monomials[j])
+        if order == 0:
+            d = p.coeffs[i] - c * coeffs[j]
+            if d:
+                result_monomials.append(monomials[j])
+                result_coeffs.append(d)
+            i += 1
+            j += 1
+        elif order > 0:
+            result_monomials.append(monomials[j])
+            result_coeffs.append(-c * coeffs[j])
+            j += 1
+        else:
+            result_monomials.append(p.monomials[i])
+            result_coeffs.append(p.coeffs[i])
+            i += 1
+    result_monomials.extend(p.monomials[i:])
+    result_coeffs.extend(p.coeffs[i:])
+    result_monomials.extend(monomials[j:])
+    result_coeffs.extend([-c * d for d in coeffs[j:]])
+    return _polynomial(p.ring, result_monomials, result_coeffs)
+
+def gfp_array_min_terms():
+    """
+    The size from which vectorized prime fields use gfp_array, which is only imported then since it needs NumPy
+    """
+    import gfp_array
+    return gfp_array.MIN_TERMS
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
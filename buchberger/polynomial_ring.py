@@ -1,19 +1,27 @@
 # This is a class that represents a multivariate polynomial ring, it relies on the multivariate monomial class, monomial.py
 
 from coefficient_field import RationalField, PrimeField, QQ
-from random import randint
+import orders
+import random
 
 
 class PolynomialRing:
 
-    def __init__(self, coeff_ring, var_list): 
+    def __init__(self, coeff_ring, var_list, order='lex'): 
         """
+        order names the monomial order, see orders.py
+
         >>> R = PolynomialRing(QQ, 'xyz')
         >>> R.var_list
         ['x', 'y', 'z']
+        >>> x, y, z = PolynomialRing(QQ, 'xyz', 'grevlex').variables()
+        >>> x**2 + y**3 + x*y*z
+        y^3 + x*y*z + x^2
         """
         from monomial import Monomial
         self.coeff_ring = coeff_ring
+        self.order = order
+        self._key = orders.key(order)
         self._num_vars = len(var_list)
         if isinstance(var_list, list):
             self.var_list = var_list
@@ -36,6 +44,7 @@ class PolynomialRing:
         from mod import Mod
         from rational import Rational
         from monomial import Monomial
+        from finite_field import FFElement
         
         if isinstance(element, Polynomial):
             if element.ring is self:
@@ -46,7 +55,7 @@ class PolynomialRing:
                 return Polynomial(self, element.monomials, [self(coeff) for coeff in element.coeffs]) 
         elif isinstance(element, Monomial): 
             return Polynomial(self, [element], [self.coeff_ring(1)])
-        elif isinstance(element, Mod) or isinstance(element, Rational) or isinstance(element, int):
+        elif isinstance(element, (Mod, Rational, FFElement, int)):
             return Polynomial(self, [Monomial(self, tuple([0 for var in self.var_list]))], [self.coeff_ring(element)])
         
     def num_vars(self):
@@ -62,6 +71,8 @@ class PolynomialRing:
         >>> R = PolynomialRing(QQ, 'xyz')
         >>> R
         Polynomial Ring in 3 variable(s), x, y, z over QQ
+        >>> PolynomialRing(QQ, 'xy', 'grevlex')
+        Polynomial Ring in 2 variable(s), x, y over QQ with grevlex order
         """
         y = ''
         for i in range(len(self.var_list)):
@@ -69,7 +80,10 @@ class PolynomialRing:
                 y += self.var_list[i]
             else:
                 y += ', ' + self.var_list[i]
-        return 'Polynomial Ring in ' + str(len(self.var_list)) + ' variable(s), ' + y + ' over ' + str(self.coeff_ring)
+        x = 'Polynomial Ring in ' + str(len(self.var_list)) + ' variable(s), ' + y + ' over ' + str(self.coeff_ring)
+        if self.order != 'lex':
+            x += ' with %s order' % self.order
+        return x
 
     def variables(self):
         """
@@ -94,25 +108,94 @@ class PolynomialRing:
             variables.append(Polynomial(self, [Monomial(self, tuple(degree))], [1]))
         return tuple(variables)
 
-    def random_monomial(self, degree):
+    def with_order(self, order, var_list=None):
+        """
+        Returns the ring over the same field with the given monomial order and
+        variables, by default the variables of this ring.  The rings are kept,
+        so the same arguments always give the same ring.
+
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> R.with_order('lex') is R
+        True
+        >>> S = R.with_order('grevlex', 'zyx')
+        >>> S
+        Polynomial Ring in 3 variable(s), z, y, x over QQ with grevlex order
+        >>> R.with_order('grevlex', 'zyx') is S
+        True
+        """
+        var_list = list(var_list or self.var_list)
+        if order == self.order and var_list == self.var_list:
+            return self
+        variants = self.__dict__.setdefault('_variants', {})
+        key = (order, tuple(var_list))
+        if key not in variants:
+            variants[key] = PolynomialRing(self.coeff_ring, var_list, order)
+        return variants[key]
+
+    def eliminate(self, ideal, variables, degree=None):
+        """
+        Returns generators of the intersection of the ideal with the ring in
+        the variables not in `variables', as a reduced Groebner basis in a new
+        ring of those variables with grevlex order.  See elimination.py.
+
+        >>> R = PolynomialRing(QQ, 'txy')
+        >>> t, x, y = R.variables()
+        >>> R.eliminate([x - t**2, y - t**3], ['t'])
+        [x^3 + (-1)*y^2]
+        >>> R.eliminate([], ['x']), R.eliminate([R(0)], ['x'])
+        ([], [])
+        """
+        import elimination
+        assert all([f.ring is self for f in ideal]), 'the polynomials should be in this ring'
+        return elimination.eliminate(ideal, variables, degree, self)
+
+    def random_monomial(self, degree, rng=random):
         """
-        Returns a random monomial of degree <= 'degree'
+        Returns a random monomial of degree <= 'degree', every such monomial
+        being equally likely.  The exponents are read off a random choice of
+        n bar positions among n + degree slots (stars and bars), the stars
+        after the last bar being the unused degree.
+
+        TESTS:
+
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> rng = random.Random(5)
+        >>> counts = {}
+        >>> for i in range(10000):
+        ...     m = R.random_monomial(2, rng).degrees
+        ...     counts[m] = counts.get(m, 0) + 1
+        >>> len(counts), min(counts.values()) > 900, max(counts.values()) < 1100
+        (10, True, True)
+        >>> R = PolynomialRing(QQ, ['x%d' % i for i in range(40)])
+        >>> R.random_monomial(3, rng).degree() <= 3
+        True
+        """
+        from monomial import Monomial
+        bars = sorted(rng.sample(xrange(self._num_vars + degree), self._num_vars))
+        m = [bars[0]] + [bars[i] - bars[i-1] - 1 for i in range(1, self._num_vars)]
+        return Monomial(self, tuple(m))
+
+    def random_homogeneous_monomial(self, degree, rng=random):
+        """
+        Returns a random monomial of degree exactly 'degree', every such monomial being equally likely
+
+        >>> R = PolynomialRing(QQ, 'xyz')
+        >>> R.random_homogeneous_monomial(4, random.Random(3)).degree()
+        4
         """
         from monomial import Monomial
-        while True:
-            m = [randint(0, degree) for i in range(self._num_vars)]
-            if sum(m) <= degree:
-                return Monomial(self, tuple(m))
-            
+        bars = sorted(rng.sample(xrange(self._num_vars - 1 + degree), self._num_vars - 1))
+        bars = [-1] + bars + [self._num_vars - 1 + degree]
+        return Monomial(self, tuple([bars[i+1] - bars[i] - 1 for i in range(self._num_vars)]))
 
-    def random(self, degree, num_terms):
+    def random(self, degree, num_terms, rng=random):
         """
         Returns a random polynomial of degree at most `degree' with at most `num_terms' terms
         """
         from polynomial import Polynomial
-        num_terms = randint(1, num_terms)
-        monomials = [self.random_monomial(degree) for i in range(num_terms)]
-        coeffs = [self.coeff_ring.random_element() for i in range(num_terms)]
+        num_terms = rng.randint(1, num_terms)
+        monomials = [self.random_monomial(degree, rng) for i in range(num_terms)]
+        coeffs = [self.coeff_ring.random_element(rng) for i in range(num_terms)]
         L = zip(monomials, coeffs)
         L.sort()
         monomials = [L[0][0]]
@@ -0,0 +1,121 @@
+# Seeded generators of random ideals for benchmarks and fuzzing.  Each generator takes a polynomial ring and a seed,
+# and returns the same list of polynomials for the same arguments.
+
+import random
+from polynomial import Polynomial
+from monomial import Monomial
+from polynomial_ring import PolynomialRing
+from coefficient_field import QQ, PrimeField
+
+def _nonzero_element(ring, rng):
+    zero = ring.coeff_ring(0)
+    while True:
+        c = ring.coeff_ring.random_element(rng)
+        if c != zero:
+            return c
+
+def _polynomial(ring, monomials, rng):
+    """
+    Returns the polynomial with the given monomials and random nonzero coefficients
+    """
+    monomials = sorted([Monomial(ring, m) for m in set([m.degrees for m in monomials])])
+    return Polynomial(ring, monomials, [_nonzero_element(ring, rng) for m in monomials])
+
+def all_monomials(ring, degree):
+    """
+    Returns the monomials of degree at most `degree', in increasing order
+
+    >>> R = PolynomialRing(QQ, 'xy')
+    >>> all_monomials(R, 2)
+    [1, y, y^2, x, x*y, x^2]
+    """
+    def exponents(n, d):
+        if n == 0:
+            return [()]
+        return [(e,) + rest for e in range(d + 1) for rest in exponents(n - 1, d - e)]
+    return sorted([Monomial(ring, e) for e in exponents(ring.num_vars(), degree)])
+
+def sparse(ring, num_polys, degree, num_terms, seed=None):
+    """
+    num_polys polynomials, each with num_terms terms chosen uniformly among the monomials of degree at most `degree'
+
+    >>> R = PolynomialRing(PrimeField(7), 'xyz')
+    >>> sparse(R, 2, 3, 3, seed=1) == sparse(R, 2, 3, 3, seed=1)
+    True
+    >>> [len(f.monomials) <= 3 for f in sparse(R, 2, 3, 3, seed=1)]
+    [True, True]
+    """
+    rng = random.Random(seed)
+    return [_polynomial(ring, [ring.random_monomial(degree, rng) for i in range(num_terms)], rng) for j in range(num_polys)]
+
+def dense(ring, num_polys, degree, seed=None):
+    """
+    num_polys polynomials, each with every monomial of degree at most `degree'
+
+    >>> R = PolynomialRing(PrimeField(7), 'xy')
+    >>> [len(f.monomials) for f in dense(R, 2, 2, seed=1)]
+    [6, 6]
+    """
+    rng = random.Random(seed)
+    monomials = all_monomials(ring, degree)
+    return [_polynomial(ring, monomials, rng) for j in range(num_polys)]
+
+def homogeneous(ring, num_polys, degree, num_terms, seed=None):
+    """
+    num_polys homogeneous polynomials of degree `degree' with num_terms terms
+
+    >>> R = PolynomialRing(PrimeField(7), 'xyz')
+    >>> [set([m.degree() for m in f.monomials]) for f in homogeneous(R, 2, 3, 4, seed=1)]
+    [set([3]), set([3])]
+    """
+    rng = random.Random(seed)
+    return [_polynomial(ring, [ring.random_homogeneous_monomial(degree, rng) for i in range(num_terms)], rng) for j in range(num_polys)]
+
+def binomial(ring, num_polys, degree, seed=None):
+    """
+    num_polys binomials m1 - c*m2 with monomials of degree at most `degree'
+
+    >>> R = PolynomialRing(PrimeField(7), 'xyz')
+    >>> [len(f.monomials) <= 2 for f in binomial(R, 3, 3, seed=1)]
+    [True, True, True]
+    """
+    rng = random.Random(seed)
+    return [_polynomial(ring, [ring.random_monomial(degree, rng), ring.random_monomial(degree, rng)], rng) for j in range(num_polys)]
+
+def zero_dimensional(ring, degree, num_terms, seed=None):
+    """
+    Generators of a random zero dimensional ideal: a triangular system
+    x_i^degree + (terms lexicographically smaller), hidden by an invertible
+    (unit triangular) change of generators.
+
+    >>> R = PolynomialRing(PrimeField(7), 'xy')
+    >>> F = zero_dimensional(R, 2, 3, seed=1)
+    >>> len(F)
+    2
+    """
+    rng = random.Random(seed)
+    n = ring.num_vars()
+    triangular = []
+    for i in range(n):
+        lead = [0] * n
+        lead[i] = degree
+        tail = []
+        for k in range(num_terms - 1):
+            e = [0] * i + [rng.randint(0, degree - 1)] + [rng.randint(0, degree) for j in range(n - i - 1)]
+            tail.append(Monomial(ring, e))
+        f = _polynomial(ring, tail, rng) if tail else ring(0)
+        triangular.append(ring(Monomial(ring, lead)) + f)
+    return [sum([ring.coeff_ring.random_element(rng) * f for f in triangular[:j]], triangular[j]) for j in range(n)]
+
+FAMILIES = {
+    'sparse': lambda R, seed: sparse(R, 3, 2, 4, seed),
+    'dense': lambda R, seed: dense(R, 2, 2, seed),
+    'homogeneous': lambda R, seed: homogeneous(R, 3, 2, 3, seed),
+    'binomial': lambda R, seed: binomial(R, 3, 3, seed),
+    'zero_dimensional': lambda R, seed: zero_dimensional(R, 2, 3, seed),
+}
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,3 +1,6 @@
+import new
+import debug
+
 def gcd(x, y):
     """
     >>> gcd(1, -2)
@@ -133,6 +136,19 @@ class Rational:
 
         return Rational(self.d, self.n)
 
+    def __pow__(self, power):
+        """
+        >>> Rational(-2, 3) ** 3
+        Rational(-8, 27)
+        >>> Rational(2, 3) ** -2
+        Rational(9, 4)
+        >>> Rational(2, 3) ** 0
+        Rational(1, 1)
+        """
+        if power < 0:
+            return Rational(self.d ** -power, self.n ** -power)
+        return Rational(self.n ** power, self.d ** power)
+
     def __div__(self, other):
 
         """
@@ -166,7 +182,23 @@ class Rational:
             return cmp((self.n * (x / self.d)), (other.n * (x / other.d)))
 
     def __neg__(self):
-        return Rational(-self.n, self.d)
+        return _rational(-self.n, self.d)
+
+    def __hash__(self):
+        """
+        Equal to the hash of n for integers, like the hash of a float
+
+        >>> hash(Rational(6, 2)) == hash(3), hash(Rational(2, 4)) == hash(Rational(1, 2))
+        (True, True)
+        """
+        return hash(self.n) if self.d == 1 else hash((self.n, self.d))
+
+    def __nonzero__(self):
+        """
+        >>> bool(Rational(0, 3)), bool(Rational(-1, 3))
+        (False, True)
+        """
+        return self.n != 0
     
     def __str__(self):
         """
@@ -183,7 +215,15 @@ class Rational:
             y = str(self.d)
             return x + '/' + y
             
-        
+def _rational(n, d):
+    """
+    Rational(n, d) for n/d already in lowest terms with d > 0
+    """
+    if debug.CHECKS:
+        assert d > 0 and gcd(n, d) == 1, '%d/%d is not in lowest terms' % (n, d)
+        return Rational(n, d)
+    return new.instance(Rational, {'n': n, 'd': d})
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
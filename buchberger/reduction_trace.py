@@ -0,0 +1,270 @@
+# Recording a Buchberger computation once and replaying it for other coefficients.  Multi-prime and parametric
+# workloads compute the Groebner bases of many ideals that differ only in their coefficients: the same generators
+# modulo other primes, or with other values for the parameters.  For most of them every choice the computation makes
+# is the same, since pair selection, the criteria and the divisor search look at monomials only.
+#
+# record runs Buchberger and keeps a Trace of what happened: which generators were zero or duplicates, and for every
+# pair reduced, the reducers with their multipliers in the order divide used them and the monomials of the result, or
+# None if it vanished.  The monomials of every polynomial of the run follow from the trace, so a replay works on the
+# coefficients only.  Each step is compiled once, on the first replay of a trace, into a vector of columns for the
+# monomials it touches with the columns of the two halves of the S-polynomial, of each multiple m*g subtracted and of
+# the result.  A replay puts the coefficients of the S-polynomial into the vector and subtracts c times the
+# coefficients of g at the columns of each m*g, where c is the entry at the column of m*LM(g) (the elements are monic):
+# no pair is selected, no divisor is searched for and no monomials are compared.  Over GF(p) the entries are ints.
+#
+# A replay is checked as it goes: every generator must have the recorded monomials and every result must vanish or have
+# the recorded monomials.  The leading monomials are then those of the recorded run, so the criteria drop the same
+# pairs, every result is a remainder by the basis and the pairs that vanished vanish again: the result is a Groebner
+# basis.  A term that was reduced in the recorded run may have cancelled before its turn; its reduction is skipped,
+# which only leaves a multiple out of the representation of the S-polynomial.  A coefficient that vanishes for the new
+# coefficients and not in the recorded run (a prime dividing it, a special value of a parameter) otherwise changes the
+# monomials and raises TraceDivergence; groebner falls back to a full run then.  The generators, steps and basis of a
+# trace are lists, tuples, ints and None, so they can be saved with marshal.
+
+from buchberger import Buchberger
+from coefficient_field import PrimeField
+from polynomial import _polynomial
+from monomial import _monomial
+from mod import _mod
+
+class TraceDivergence(Exception):
+    pass
+
+class Trace:
+    """
+    generators has, for each generator, None if it is zero, the index in
+    the basis of the equal generator if it is a duplicate and its monomials
+    otherwise; steps has (i, j, reductions, result) for each pair reduced,
+    with (k, multiplier) for each reduction by element k; basis has the
+    indices of the elements of the final basis.  The compiled steps are
+    kept in plan, which is not pickled.
+    """
+
+    def __init__(self, generators, steps, basis):
+        self.generators = generators
+        self.steps = steps
+        self.basis = basis
+        self.plan = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['plan'] = None
+        return state
+
+    def compile(self):
+        """
+        Returns the plan: the monomials of each element of the basis and for
+        each step (i, j, columns of the multiple of i, of the multiple of j,
+        [(k, columns of the multiple of k)], columns of the result or None,
+        number of columns)
+        """
+        if self.plan is None:
+            supports = [code for code in self.generators if isinstance(code, tuple)]
+            steps = []
+            for i, j, reductions, result in self.steps:
+                index = {}
+                LM_i, LM_j = supports[i][-1], supports[j][-1]
+                lcm = tuple(map(max, LM_i, LM_j))
+                multiple_i = _columns(index, supports[i], [a - b for a, b in zip(lcm, LM_i)])
+                multiple_j = _columns(index, supports[j], [a - b for a, b in zip(lcm, LM_j)])
+                multiples = [(k, _columns(index, supports[k], m)) for k, m in reductions]
+                if result is not None:
+                    supports.append(result)
+                    result = _columns(index, result, [0] * len(lcm))
+                steps.append((i, j, multiple_i, multiple_j, multiples, result, len(index)))
+            self.plan = (supports, steps)
+        return self.plan
+
+def _columns(index, support, m):
+    """
+    The columns of the monomials of support times the monomial with
+    exponents m, new ones numbered as they come
+    """
+    columns = []
+    for degrees in support:
+        degrees = tuple([a + b for a, b in zip(degrees, m)])
+        if degrees not in index:
+            index[degrees] = len(index)
+        columns.append(index[degrees])
+    return columns
+
+class TraceRecorder(Buchberger):
+    """
+    A Buchberger engine that records a Trace of its run
+    """
+
+    def __init__(self, poly_list):
+        Buchberger.__init__(self, poly_list)
+        self.generators = []
+        index = {}
+        for f in poly_list:
+            if f.is_zero():
+                self.generators.append(None)
+                continue
+            f = f * ~f.LC()
+            if f in index:
+                self.generators.append(index[f])
+            else:
+                index[f] = len(index)
+                self.generators.append(_support(f))
+        self.steps = []
+        self._reductions = None
+
+    def reduce(self, S):
+        quots, r = S.divide(self.ideal, self.cache)
+        terms = [(m * self.ideal[k].LM(), k, m.degrees) for k in range(len(quots)) for m in quots[k].monomials]
+        # divide reduces the terms from the largest down, each once
+        terms.sort(reverse=True)
+        self._reductions = [(k, m) for t, k, m in terms]
+        return r
+
+    def step(self):
+        i, j = self.pairs[0]
+        S = Buchberger.step(self)
+        self.steps.append((i, j, self._reductions, None if S is None else _support(S)))
+        return S
+
+    def trace(self):
+        return Trace(self.generators, self.steps, [k for k in range(len(self.ideal)) if k not in self.redundant])
+
+def _support(f):
+    return tuple([m.degrees for m in f.monomials])
+
+def record(poly_list):
+    """
+    Computes a Groebner basis of the polynomials like
+    Buchberger(poly_list).run() and returns it with the Trace of the run
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(32003), 'xyz', 'grevlex')
+    >>> x, y, z = R.variables()
+    >>> G, trace = record([x**2*y - z, x*y**2 + y*z - x, z**2 - 3*x*y + 5])
+    >>> len(trace.steps), len([s for s in trace.steps if s[3] is None]), trace.basis
+    (27, 20, [2, 3, 4, 5, 7, 8, 9])
+    >>> trace.steps[0]
+    (1, 0, [(2, (0, 0, 1))], ((0, 0, 1), (0, 1, 1), (2, 0, 0), (0, 0, 3)))
+    """
+    engine = TraceRecorder(poly_list)
+    return engine.run(), engine.trace()
+
+def replay(trace, poly_list):
+    """
+    Returns the Groebner basis of the polynomials that the recorded run would
+    have found for them, computed by following trace; raises TraceDivergence
+    if the computation for poly_list does not follow it
+
+    >>> from polynomial import *
+    >>> from grob_check import is_groebner
+    >>> R = PolynomialRing(PrimeField(32003), 'xyz', 'grevlex')
+    >>> x, y, z = R.variables()
+    >>> G, trace = record([x**2*y - z, x*y**2 + y*z - x, z**2 - 3*x*y + 5])
+    >>> S = PolynomialRing(PrimeField(10007), 'xyz', 'grevlex')
+    >>> x, y, z = S.variables()
+    >>> F = [x**2*y - z, x*y**2 + y*z - x, z**2 - 3*x*y + 5]
+    >>> replay(trace, F) == Buchberger(F).run()
+    True
+    >>> is_groebner(replay(trace, [x**2*y - 4*z, x*y**2 + 9*y*z - x, z**2 - x*y + 2]))
+    True
+    >>> replay(trace, [x**2*y - z, x*y**2 + y*z - x, z**2 - 3*x*y])
+    Traceback (most recent call last):
+    TraceDivergence: generator 2 has other monomials
+    >>> T = PolynomialRing(QQ, 'xyz', 'grevlex')
+    >>> x, y, z = T.variables()
+    >>> F = [x**2*y - z, x*y**2 + y*z - x, z**2 - Rational(1, 3)*x*y + 5]
+    >>> replay(trace, F) == Buchberger(F).run()
+    True
+    >>> x, y = PolynomialRing(QQ, 'xy', 'grevlex').variables()
+    >>> G, trace = record([x**2*y - 3*x + y, x*y**2 - 5*y - 1])
+    >>> replay(trace, [x**2*y - 2*x + y, x*y**2 - 2*y - 1])
+    Traceback (most recent call last):
+    TraceDivergence: step 0 leaves other monomials
+    """
+    if len(poly_list) != len(trace.generators):
+        raise TraceDivergence, 'the trace has %d generators' % len(trace.generators)
+    ring = None
+    kept = [code for code in trace.generators if isinstance(code, tuple)]
+    elements = []
+    for n, (f, code) in enumerate(zip(poly_list, trace.generators)):
+        if code is None or f.is_zero():
+            if code is not None or not f.is_zero():
+                raise TraceDivergence, 'generator %d is zero in one of the runs only' % n
+            continue
+        ring = f.ring
+        f = f * ~f.LC()
+        if isinstance(code, int):
+            if _support(f) != kept[code] or not f.coeffs == elements[code]:
+                raise TraceDivergence, 'generator %d is no longer a duplicate' % n
+        elif _support(f) != code:
+            raise TraceDivergence, 'generator %d has other monomials' % n
+        else:
+            elements.append(f.coeffs)
+    if ring is None:
+        return []
+    field = ring.coeff_ring
+    p = field.p if isinstance(field, PrimeField) else None
+    if p:
+        elements = [[c.x for c in coeffs] for coeffs in elements]
+    zero = 0 if p else field(0)
+    supports, steps = trace.compile()
+    for n, (i, j, multiple_i, multiple_j, multiples, result, width) in enumerate(steps):
+        v = [zero] * width
+        for column, c in zip(multiple_i, elements[i]):
+            v[column] = c
+        for column, c in zip(multiple_j, elements[j]):
+            v[column] = v[column] - c
+        for k, columns in multiples:
+            c = v[columns[-1]]
+            if not c:
+                continue
+            if p:
+                for column, a in zip(columns, elements[k]):
+                    v[column] = (v[column] - c * a) % p
+            else:
+                for column, a in zip(columns, elements[k]):
+                    v[column] = v[column] - c * a
+        if p:
+            v = [c % p for c in v]
+        if result is None:
+            if any(v):
+                raise TraceDivergence, 'step %d does not vanish' % n
+            continue
+        coeffs = [v[column] for column in result]
+        if not all(coeffs) or len([c for c in v if c]) != len(result):
+            raise TraceDivergence, 'step %d leaves other monomials' % n
+        if p:
+            inverse = pow(coeffs[-1], p - 2, p)
+            elements.append([c * inverse % p for c in coeffs])
+        else:
+            inverse = ~coeffs[-1]
+            elements.append([c * inverse for c in coeffs])
+    basis = []
+    for k in trace.basis:
+        monomials = [_monomial(ring, degrees) for degrees in supports[k]]
+        coeffs = [_mod(c, p) for c in elements[k]] if p else elements[k]
+        basis.append(_polynomial(ring, monomials, coeffs))
+    return basis
+
+def groebner(poly_list, trace):
+    """
+    replay(trace, poly_list), or Buchberger(poly_list).run() if the
+    computation does not follow trace
+
+    >>> from polynomial import *
+    >>> x, y = PolynomialRing(QQ, 'xy', 'grevlex').variables()
+    >>> G, trace = record([x**2*y - 3*x + y, x*y**2 - 5*y - 1])
+    >>> F = [x**2*y - 4*x + y, x*y**2 - 7*y - 1]
+    >>> groebner(F, trace) == Buchberger(F).run()
+    True
+    >>> F = [x**2*y - 2*x + y, x*y**2 - 2*y - 1]
+    >>> groebner(F, trace) == Buchberger(F).run()
+    True
+    """
+    try:
+        return replay(trace, poly_list)
+    except TraceDivergence:
+        return Buchberger(poly_list).run()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,405 @@
+# A Groebner basis service for many concurrent clients.  submit(ideal, options) returns a Job at once; its result() waits
+# for the basis.  Behind a GroebnerService is a multiprocessing pool whose workers stay up between jobs, so imports and
+# rings (cached per worker by their encoding) are only paid for once.  Polynomials travel to and from the workers in
+# the encoding of checkpoint.py.
+#
+# - Identical requests, same ideal generators in the same ring with the same options, share one computation while it
+#   runs; every client gets its own Job.
+# - options['time_limit'] (seconds) and options['memory_limit'] (megabytes, see buchberger.memory_used) are handed
+#   to the iterate method of the engine; a job that exceeds them raises JobTimeout.  result(timeout) also raises
+#   JobTimeout if the client stops waiting, but leaves the computation running.
+# - Job.cancel() stops the computation once every client sharing it has cancelled.  Each running computation owns a
+#   slot of a shared flag array which the worker polls between reductions.
+# - At most max_pending computations are queued or running; submit blocks until a slot is free, or raises ServiceBusy
+#   with block=False.
+#
+# LocalService has the same interface and computes in the calling process, when a result is first asked for.
+
+import threading
+import traceback
+from multiprocessing import Pool, Array, cpu_count
+from polynomial_ring import PolynomialRing
+from buchberger import Buchberger, CancellationToken, presolve, combine, interreduce
+from signature import SignatureBuchberger
+from checkpoint import encode_field, decode_field, encode_polynomial, decode_polynomial
+
+class JobCancelled(Exception):
+    pass
+
+class JobTimeout(Exception):
+    pass
+
+class ServiceBusy(Exception):
+    pass
+
+OPTIONS = {'engine': 'buchberger', 'reduction': 'full', 'reduced': True, 'time_limit': None, 'memory_limit': None}
+
+def _options(options):
+    """
+    >>> sorted(_options({'reduced': False}).items())
+    [('engine', 'buchberger'), ('memory_limit', None), ('reduced', False), ('reduction', 'full'), ('time_limit', None)]
+    >>> _options({'order': 'lex'})
+    Traceback (most recent call last):
+    ValueError: unknown option 'order'
+    """
+    result = dict(OPTIONS)
+    for name in options or {}:
+        if name not in OPTIONS:
+            raise ValueError, 'unknown option %r' % name
+        result[name] = options[name]
+    return result
+
+def encode_ideal(ideal):
+    """
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(7), 'xy')
+    >>> x, y = R.variables()
+    >>> encode_ideal([x**2 - y])
+    ((('GF', 7), ('x', 'y'), 'lex'), ((((0, 1), (2, 0)), (6, 1)),))
+    """
+    ring = ideal[0].ring
+    return ((encode_field(ring.coeff_ring), tuple(ring.var_list), ring.order),
+            tuple([encode_polynomial(f) for f in ideal]))
+
+_rings = {}
+
+def _ring(code):
+    """
+    The ring with the encoding code, built once per process
+    """
+    if code not in _rings:
+        field, var_list, order = code
+        _rings[code] = PolynomialRing(decode_field(field), list(var_list), order)
+    return _rings[code]
+
+def compute(ideal, options, cancel=None):
+    """
+    Computes the Groebner basis of the list of polynomials ideal with the
+    options, see OPTIONS.  Returns (status, basis, stats) with status 'done',
+    'time', 'memory' or 'cancelled' and basis None unless done.  The ideal
+    goes through the fast paths of groebner (buchberger.presolve) first, and
+    the stats are those of the engine, empty if it was not needed.  The
+    signature engine takes no reduction.
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> compute([x - 2*x*y, x**3*y - 2*x**2 + y], _options(None))
+    ('done', [y^2 + (-1/2)*y, x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y], {'reductions': 5, 'zero_reductions': 3})
+    >>> compute([x - 2*x*y, x**3*y - 2*x**2 + y], _options({'time_limit': 0}))
+    ('time', None, {'reductions': 0, 'zero_reductions': 0})
+    >>> status, basis, stats = compute([x - 2*x*y, x**3*y - 2*x**2 + y], _options({'engine': 'signature'}))
+    >>> status, basis, stats['reductions']
+    ('done', [y^2 + (-1/2)*y, x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y], 3)
+    >>> compute([x - 2*x*y, x**3*y - 2*x**2 + y], _options({'engine': 'signature', 'time_limit': 0}))[0]
+    'time'
+    >>> compute([x - y, x + y - 2*z, x*y - z**2], _options(None))
+    ('done', [y + (-1)*z, x + (-1)*z], {})
+    >>> compute([x*y - z], _options({'engine': 'signature', 'reduction': 'top'}))
+    Traceback (most recent call last):
+    ValueError: the signature engine takes no reduction
+    """
+    if options['engine'] not in ('buchberger', 'signature'):
+        raise ValueError, 'unknown engine %r' % options['engine']
+    if options['engine'] == 'signature' and options['reduction'] != 'full':
+        raise ValueError, 'the signature engine takes no reduction'
+    basis, rest = presolve(ideal)
+    stats = {}
+    if rest:
+        if options['engine'] == 'buchberger':
+            engine = Buchberger(rest, options['reduction'])
+        else:
+            engine = SignatureBuchberger(rest)
+        for event, value in engine.iterate(options['time_limit'], options['memory_limit'], cancel):
+            if event == 'stopped':
+                return (value, None, engine.stats)
+            G = value
+        basis = combine(basis, G)
+        stats = engine.stats
+    if options['reduced']:
+        basis = interreduce(basis)
+    return ('done', basis, stats)
+
+def run_job(code, options, cancel=None):
+    """
+    Same as compute for an ideal encoded by encode_ideal, returning the
+    encoded basis.  Errors are returned with status 'error' and the
+    traceback in place of the basis.
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> run_job(encode_ideal([x - 2*x*y, x**3*y - 2*x**2 + y]), _options(None))[1]
+    ((((0, 1, 0), (0, 2, 0)), ((-1, 2), (1, 1))), (((1, 0, 0), (1, 1, 0)), ((-1, 2), (1, 1))), (((0, 1, 0), (2, 0, 0), (3, 0, 0)), ((2, 1), (-4, 1), (1, 1))))
+    """
+    try:
+        ring = _ring(code[0])
+        status, basis, stats = compute([decode_polynomial(ring, f) for f in code[1]], options, cancel)
+        if basis is not None:
+            basis = tuple([encode_polynomial(f) for f in basis])
+        return (status, basis, stats)
+    except Exception:
+        return ('error', traceback.format_exc(), {})
+
+class _SlotToken:
+    """
+    A cancellation token reading its flag from the array shared with the service
+    """
+
+    def __init__(self, flags, slot):
+        self.flags = flags
+        self.slot = slot
+
+    def is_cancelled(self):
+        return self.flags[self.slot] != 0
+
+_flags = None
+
+def _init_worker(flags):
+    global _flags
+    _flags = flags
+
+def _work(code, options, slot):
+    return run_job(code, options, _SlotToken(_flags, slot))
+
+class _Computation:
+    """
+    One computation, shared by the Jobs of identical requests
+    """
+
+    def __init__(self, key, slot=None):
+        self.key = key
+        self.slot = slot
+        self.clients = 0
+        self.result = None
+        self.finished = threading.Event()
+
+    def wait(self, timeout):
+        return self.finished.wait(timeout)
+
+    def finish(self, result):
+        self.result = result
+        self.finished.set()
+
+class Job:
+    """
+    A client's handle on a computation
+    """
+
+    def __init__(self, service, computation, ring):
+        self.service = service
+        self.computation = computation
+        self.ring = ring
+        self.cancelled = False
+        computation.clients += 1
+
+    def done(self):
+        return self.cancelled or self.computation.finished.is_set()
+
+    def cancel(self):
+        if not self.cancelled:
+            self.cancelled = True
+            self.service._cancel(self.computation)
+
+    def stats(self):
+        """
+        The statistics of the finished computation
+        """
+        return self.computation.result[2] if self.computation.result else None
+
+    def result(self, timeout=None):
+        """
+        Waits for the basis, at most timeout seconds
+        """
+        if self.cancelled:
+            raise JobCancelled
+        if not self.computation.wait(timeout):
+            raise JobTimeout, 'no result after %s seconds' % timeout
+        if self.cancelled:
+            raise JobCancelled
+        status, basis, stats = self.computation.result
+        if status == 'done':
+            return [decode_polynomial(self.ring, f) for f in basis]
+        elif status == 'cancelled':
+            raise JobCancelled
+        elif status in ('time', 'memory'):
+            raise JobTimeout, 'the %s limit was exceeded' % status
+        raise RuntimeError, 'the computation failed:\n' + basis
+
+class GroebnerService:
+    """
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> service = GroebnerService(processes=2)
+    >>> service.compute_basis([x - 2*x*y, x**3*y - 2*x**2 + y])
+    [y^2 + (-1/2)*y, x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y]
+    >>> jobs = [service.submit([x**k - y, y**2 - z]) for k in range(1, 4)]
+    >>> [job.result() for job in jobs]
+    [[y^2 + (-1)*z, x + (-1)*y], [y^2 + (-1)*z, x^2 + (-1)*y], [y^2 + (-1)*z, x^3 + (-1)*y]]
+    >>> service.submit([x**2 - y, x*y - 1], {'time_limit': 0}).result()
+    Traceback (most recent call last):
+    JobTimeout: the time limit was exceeded
+    >>> service.close()
+    """
+
+    def __init__(self, processes=None, max_pending=None):
+        processes = processes or cpu_count()
+        max_pending = max_pending or 4 * processes
+        self.flags = Array('b', max_pending, lock=False)
+        self.pool = Pool(processes, _init_worker, (self.flags,))
+        self.free_slots = range(max_pending)
+        self.slots = threading.Semaphore(max_pending)
+        self.lock = threading.Lock()
+        self.running = {}
+        self.stats = {'submitted': 0, 'deduplicated': 0, 'cancelled': 0}
+
+    def submit(self, ideal, options=None, block=True):
+        """
+        Returns a Job for the Groebner basis of the ideal generated by the
+        polynomials in the list ideal.  The basis is returned in their ring.
+        """
+        options = _options(options)
+        code = encode_ideal(ideal)
+        key = (code, tuple(sorted(options.items())))
+        with self.lock:
+            self.stats['submitted'] += 1
+            if key in self.running:
+                self.stats['deduplicated'] += 1
+                return Job(self, self.running[key], ideal[0].ring)
+        if not self.slots.acquire(block):
+            raise ServiceBusy, 'too many pending computations'
+        with self.lock:
+            if key in self.running:
+                self.slots.release()
+                self.stats['deduplicated'] += 1
+                return Job(self, self.running[key], ideal[0].ring)
+            computation = self._start(key)
+            job = Job(self, computation, ideal[0].ring)
+        return job
+
+    def _start(self, key):
+        slot = self.free_slots.pop()
+        self.flags[slot] = 0
+        computation = _Computation(key, slot)
+        self.running[key] = computation
+        self.pool.apply_async(_work, (key[0], dict(key[1]), slot),
+                              callback=lambda result: self._finish(computation, result))
+        return computation
+
+    def _finish(self, computation, result):
+        with self.lock:
+            if self.running.get(computation.key) is computation:
+                del self.running[computation.key]
+            computation.finish(result)
+            self.free_slots.append(computation.slot)
+        self.slots.release()
+
+    def _cancel(self, computation):
+        with self.lock:
+            computation.clients -= 1
+            if computation.clients == 0 and not computation.finished.is_set():
+                self.stats['cancelled'] += 1
+                self.flags[computation.slot] = 1
+                # new requests for the same ideal start over
+                if self.running.get(computation.key) is computation:
+                    del self.running[computation.key]
+
+    def compute_basis(self, ideal, options=None, timeout=None):
+        return self.submit(ideal, options).result(timeout)
+
+    def close(self):
+        """
+        Lets the running computations finish and stops the workers
+        """
+        self.pool.close()
+        self.pool.join()
+
+class _LocalComputation(_Computation):
+
+    def __init__(self, key):
+        _Computation.__init__(self, key)
+        self.token = CancellationToken()
+
+    def wait(self, timeout):
+        if not self.finished.is_set():
+            self.finish(run_job(self.key[0], dict(self.key[1]), self.token))
+        return True
+
+class LocalService(GroebnerService):
+    """
+    A GroebnerService without worker processes, for tests: a computation
+    runs in the process of the first client asking for its result
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(32003), 'xy')
+    >>> x, y = R.variables()
+    >>> service = LocalService()
+    >>> a, b = service.submit([x**2 - y, x*y - 1]), service.submit([x**2 - y, x*y - 1])
+    >>> a.computation is b.computation
+    True
+    >>> a.cancel()
+    >>> a.result()
+    Traceback (most recent call last):
+    JobCancelled
+    >>> b.result()
+    [y^3 + 32002*1, x + 32002*y^2]
+    >>> c = service.submit([x**3 - y])
+    >>> c.cancel()
+    >>> c.computation.token.is_cancelled()
+    True
+    >>> sorted(service.stats.items())
+    [('cancelled', 1), ('deduplicated', 1), ('submitted', 3)]
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+        self.stats = {'submitted': 0, 'deduplicated': 0, 'cancelled': 0}
+
+    def submit(self, ideal, options=None, block=True):
+        options = _options(options)
+        key = (encode_ideal(ideal), tuple(sorted(options.items())))
+        with self.lock:
+            self.stats['submitted'] += 1
+            for k in [k for k, c in self.running.items() if c.finished.is_set()]:
+                del self.running[k]
+            computation = self.running.get(key)
+            if computation is not None:
+                self.stats['deduplicated'] += 1
+            else:
+                computation = self.running[key] = _LocalComputation(key)
+            return Job(self, computation, ideal[0].ring)
+
+    def _cancel(self, computation):
+        with self.lock:
+            computation.clients -= 1
+            if computation.clients == 0 and not computation.finished.is_set():
+                self.stats['cancelled'] += 1
+                computation.token.cancel()
+                if self.running.get(computation.key) is computation:
+                    del self.running[computation.key]
+
+    def close(self):
+        pass
+
+_service = None
+
+def compute_basis(ideal, options=None, timeout=None):
+    """
+    Computes a Groebner basis on a GroebnerService shared by the process,
+    started on first use
+    """
+    global _service
+    if _service is None:
+        _service = GroebnerService()
+    return _service.compute_basis(ideal, options, timeout)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
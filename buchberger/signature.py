@@ -0,0 +1,197 @@
+# A signature based Groebner basis engine in the style of F5 and GVW.
+#
+# Every basis element g carries a signature (i, m), standing for the term m*e_i of a module element
+# sum(h_j*e_j) with g = sum(h_j*f_j) whose largest term is m*e_i.  Signatures are compared position over term: first
+# by i, then by m.  Pairs are reduced in increasing order of signature, and only by reducers of smaller signature,
+# which lets two criteria drop pairs without reducing them:
+#
+#   syzygy criterion  - the signature is divisible by the signature of a known syzygy, either a Koszul syzygy
+#                       LM(g)*e_i with g coming from generators before f_i, or a pair that reduced to zero.
+#   rewrite criterion - a newer basis element has a signature dividing that of the pair, so the pair is covered by
+#                       that element's pairs.
+#
+# For a regular sequence no pair reduces to zero.
+
+from polynomial import Polynomial, _polynomial
+from monomial import Monomial
+from heapq import heappush, heappop
+from time import time
+from buchberger import stop_reason
+
+class SignatureBuchberger:
+    """
+    TESTS:
+
+    >>> from polynomial import *
+    >>> from buchberger import Buchberger, interreduce
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> F = [x**2 + y*z - 2, y**2 + x*z - 3, z**2 + x*y - 5]
+    >>> engine = SignatureBuchberger(F)
+    >>> G = engine.run()
+    >>> engine.stats['zero_reductions']
+    0
+    >>> plain = Buchberger(F)
+    >>> interreduce(G) == interreduce(plain.run())
+    True
+    >>> plain.stats['zero_reductions'] > 0
+    True
+    >>> SignatureBuchberger([]).run()
+    []
+    """
+
+    def __init__(self, poly_list):
+        self.ring = poly_list[0].ring if poly_list else None
+        self.basis = []         # (signature, polynomial) with monic polynomials
+        self.syzygies = []      # signatures of pairs that reduced to zero
+        self.queue = []
+        self.count = 0
+        self.last = None        # signature of the last pair reduced
+        self.stats = {'reductions': 0, 'zero_reductions': 0, 'syzygy_criterion': 0, 'rewrite_criterion': 0}
+        for i, f in enumerate(poly_list):
+            self._push((i, Monomial(f.ring, (0,) * f.ring.num_vars())), f, None, None, None)
+
+    def _push(self, signature, a, u, b, v):
+        """
+        Queues the S-pair u*a - v*b of signature `signature', or the
+        generator a if b is None
+        """
+        heappush(self.queue, (signature, self.count, a, u, b, v))
+        self.count += 1
+
+    def _is_syzygy(self, signature):
+        i, m = signature
+        for s, g in self.basis:
+            if s[0] < i and m.is_divisible(g.LM()):
+                return True
+        for j, t in self.syzygies:
+            if j == i and m.is_divisible(t):
+                return True
+        return False
+
+    def _is_rewritable(self, signature, a):
+        """
+        Tests whether a basis element newer than basis[a] has a signature dividing `signature'
+        """
+        i, m = signature
+        for s, g in self.basis[a+1:]:
+            if s[0] == i and m.is_divisible(s[1]):
+                return True
+        return False
+
+    def _reduce(self, signature, p):
+        """
+        Top reduces p by the basis elements whose multiples have smaller signature
+        """
+        while not p.is_zero():
+            LM = p.LM()
+            for s, g in self.basis:
+                if LM.is_divisible(g.LM()):
+                    t = LM / g.LM()
+                    if (s[0], t * s[1]) < signature:
+                        p = p - _polynomial(self.ring, [t], [p.LC()]) * g
+                        self.stats['reductions'] += 1
+                        break
+            else:
+                return p
+        return p
+
+    def step(self):
+        """
+        Handles the pair of smallest signature, returns the new basis element or None
+        """
+        signature, count, a, u, b, v = heappop(self.queue)
+        if signature == self.last:
+            return None
+        if self._is_syzygy(signature):
+            self.stats['syzygy_criterion'] += 1
+            return None
+        if b is None:
+            p = a
+        elif self._is_rewritable(signature, a):
+            self.stats['rewrite_criterion'] += 1
+            return None
+        else:
+            p = _polynomial(self.ring, [u], [self.ring.coeff_ring(1)]) * self.basis[a][1] - \
+                _polynomial(self.ring, [v], [self.ring.coeff_ring(1)]) * self.basis[b][1]
+        self.last = signature
+        p = self._reduce(signature, p)
+        if p.is_zero():
+            self.stats['zero_reductions'] += 1
+            self.syzygies.append(signature)
+            return None
+        p = p * ~p.LC()
+        k = len(self.basis)
+        for j in range(k):
+            s, g = self.basis[j]
+            L = p.LM().lcm(g.LM())
+            u, v = L / p.LM(), L / g.LM()
+            su, sv = (signature[0], u * signature[1]), (s[0], v * s[1])
+            if su > sv:
+                self._push(su, k, u, j, v)
+            elif sv > su:
+                self._push(sv, j, v, k, u)
+        self.basis.append((signature, p))
+        return p
+
+    def run(self):
+        while self.queue:
+            self.step()
+        return [g for s, g in self.basis]
+
+    def iterate(self, time_limit=None, memory_limit=None, cancel=None, progress=None):
+        """
+        Runs the computation as a generator of the events of
+        Buchberger.iterate, with the limits checked between pairs
+
+        >>> from polynomial import *
+        >>> x, y = PolynomialRing(QQ, 'xy').variables()
+        >>> engine = SignatureBuchberger([x**2 - 2*x*y, x**2*y - 2*y**2 + x])
+        >>> list(engine.iterate(time_limit=0))
+        [('stopped', 'time')]
+        >>> for event, value in engine.iterate(progress=5):
+        ...     print event, value['reductions'] if event == 'progress' else value
+        basis x^2 + (-2)*x*y
+        basis x*y^2 + 1/2*x + (-1)*y^2
+        basis x + 4*y^3 + (-2)*y^2
+        basis y^5 + (-1/2)*y^4 + 1/2*y^3
+        progress 5
+        done [x^2 + (-2)*x*y, x*y^2 + 1/2*x + (-1)*y^2, x + 4*y^3 + (-2)*y^2, y^5 + (-1/2)*y^4 + 1/2*y^3]
+        """
+        start = time()
+        reported = 0
+        while self.queue:
+            reason = stop_reason(start, time_limit, memory_limit, cancel)
+            if reason is not None:
+                yield ('stopped', reason)
+                return
+            p = self.step()
+            if p is not None:
+                yield ('basis', p)
+            if progress and self.stats['reductions'] / progress > reported:
+                reported = self.stats['reductions'] / progress
+                yield ('progress', dict(self.stats))
+        yield ('done', [g for s, g in self.basis])
+
+def groebner_signature(poly_list):
+    """
+    Takes a list of polynomials from the same ring and returns a Groebner basis
+
+    TESTS:
+
+    >>> from polynomial import *
+    >>> from grob_check import is_groebner
+    >>> R = PolynomialRing(QQ, 'xyz')
+    >>> x, y, z = R.variables()
+    >>> G = groebner_signature([x - 2*x*y, x**3*y - 2*x**2 + y])
+    >>> G
+    [x*y + (-1/2)*x, x^3 + (-4)*x^2 + 2*y, y^2 + (-1/2)*y]
+    >>> is_groebner(G)
+    True
+    """
+    return SignatureBuchberger(poly_list).run()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,72 @@
+# Timing helpers for the benchmark scripts (debug_test.py, compact_test.py, multiples_test.py, univariate_test.py):
+# each compares an old and a new way of doing the same thing, checks that both give the same result and prints one
+# row of a Table per case.
+
+from time import time
+
+def timed(f, repeat=1):
+    """
+    Calls f repeat times and returns (the last result, seconds per call)
+
+    >>> result, seconds = timed(lambda: sum(range(100)), 3)
+    >>> result, seconds >= 0
+    (4950, True)
+    """
+    t = time()
+    for i in range(repeat):
+        result = f()
+    return result, (time() - t) / repeat
+
+class Table:
+    """
+    Rows of a name, the seconds of the old and of the new way and the
+    speedup, with an optional extra column; the header is printed with the
+    first row
+
+    >>> table = Table('old', 'new', 'hits')
+    >>> table.row('f * g', 2.0, 0.5, '95%')
+                                                old        new   speedup     hits
+    f * g                                    2.0000     0.5000     4.00x      95%
+    >>> table.row('f + g', 1.0, 0.0)
+    f + g                                    1.0000     0.0000      infx
+    """
+
+    def __init__(self, old, new, extra=None):
+        self.columns = (old, new, 'speedup') + ((extra,) if extra else ())
+        self.printed = False
+
+    def row(self, name, old, new, extra=None):
+        if not self.printed:
+            print ('%-36s %10s %10s %9s' + ' %8s' * (len(self.columns) - 3)) % (('',) + self.columns)
+            self.printed = True
+        speedup = old / new if new else float('inf')
+        line = '%-36s %10.4f %10.4f %8.2fx' % (name, old, new, speedup)
+        if extra is not None:
+            line += ' %8s' % extra
+        print line
+
+def compare(table, name, old, new, repeat=1, same=None):
+    """
+    Times the calls old and new, checks that they agree and adds a row to
+    table; same compares the results, equality by default.  None as the
+    result of old skips the case.
+
+    >>> table = Table('sorted', 'sort')
+    >>> compare(table, 'sort', lambda: sorted([3, 1, 2]), lambda: [1, 2, 3])   # doctest: +ELLIPSIS
+                                             sorted       sort   speedup
+    sort                                     ...
+    >>> compare(table, 'wrong', lambda: [1], lambda: [2])
+    Traceback (most recent call last):
+    AssertionError: wrong: the results differ
+    """
+    a, t1 = timed(old, repeat)
+    if a is None:
+        return
+    b, t2 = timed(new, repeat)
+    assert (same or (lambda a, b: a == b))(a, b), '%s: the results differ' % name
+    table.row(name, t1, t2)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,295 @@
+# Polynomials in one variable.  In a ring with one variable the reduced Groebner basis of an ideal is the monic GCD
+# of its generators, and division and multiplication need no monomial comparisons at all.  Polynomial.divide and
+# groebner hand univariate polynomials to this module, and so does Polynomial._mul_ over GF(p) when both factors are
+# dense (over QQ kronecker.py multiplies faster).  It works on dense coefficient lists, lowest degree first, without
+# trailing zeros:
+#
+# - over GF(p) the coefficients are integers in [0, p) and p is passed around, over QQ they are Rationals and p is None;
+# - products over GF(p) with both factors of at least CONVOLVE_TERMS coefficients are computed with numpy.convolve when
+#   NumPy is installed and the sums of products fit into 64 bits;
+# - the GCD is Euclid's algorithm, and over GF(p) for degrees of at least HGCD_DEGREE the half-GCD algorithm, which
+#   replaces most of the remainder sequence by products of 2x2 polynomial matrices of half the degree.  Over QQ the
+#   entries of these matrices have large coefficients, and the half-GCD does not pay off.
+
+from coefficient_field import RationalField, PrimeField, QQ
+from monomial import _monomial
+from mod import _mod
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CONVOLVE_TERMS = 32
+HGCD_DEGREE = 256
+
+def supports(ring):
+    """
+    Whether ring has one variable and its coefficients in QQ or a PrimeField,
+    the rings this module handles
+    """
+    return ring.num_vars() == 1 and isinstance(ring.coeff_ring, (RationalField, PrimeField))
+
+def _p(field):
+    return field.p if isinstance(field, PrimeField) else None
+
+def _zero(p):
+    return 0 if p else QQ(0)
+
+def _trim(a):
+    while a and not a[-1]:
+        a.pop()
+    return a
+
+def dense(f):
+    """
+    Returns the coefficient list of the univariate polynomial f
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(PrimeField(7), 'x')
+    >>> x = R.variables()
+    >>> dense(3*x**3 + 5)
+    [5, 0, 0, 3]
+    """
+    p = _p(f.ring.coeff_ring)
+    if not f.monomials:
+        return []
+    a = [_zero(p)] * (f.monomials[-1].degrees[0] + 1)
+    for m, c in zip(f.monomials, f.coeffs):
+        a[m.degrees[0]] = c.x if p else c
+    return a
+
+def sparse(ring, a):
+    """
+    Returns the Polynomial of ring with the coefficient list a
+    """
+    from polynomial import _polynomial
+    p = _p(ring.coeff_ring)
+    monomials = []
+    coeffs = []
+    for e in range(len(a)):
+        if a[e]:
+            monomials.append(_monomial(ring, (e,)))
+            coeffs.append(_mod(a[e], p) if p else a[e])
+    return _polynomial(ring, monomials, coeffs)
+
+def add(a, b, p):
+    if len(a) < len(b):
+        a, b = b, a
+    c = a[:]
+    for i in range(len(b)):
+        c[i] = (c[i] + b[i]) % p if p else c[i] + b[i]
+    return _trim(c)
+
+def neg(a, p):
+    return [-x % p for x in a] if p else [-x for x in a]
+
+def mul(a, b, p):
+    """
+    >>> mul([1, 1], [6, 1], 7)
+    [6, 0, 1]
+    >>> a = range(1, 40)
+    >>> mul(a, a, 101) == [sum([a[i] * a[k - i] for i in range(len(a)) if 0 <= k - i < len(a)]) % 101 for k in range(77)]
+    True
+    """
+    if not a or not b:
+        return []
+    if p and numpy is not None and min(len(a), len(b)) >= CONVOLVE_TERMS and \
+       (p - 1)**2 * min(len(a), len(b)) < 2**63:
+        c = numpy.convolve(numpy.array(a, dtype=numpy.int64), numpy.array(b, dtype=numpy.int64)) % p
+        return _trim(c.tolist())
+    c = [_zero(p)] * (len(a) + len(b) - 1)
+    for i in range(len(a)):
+        x = a[i]
+        if not x:
+            continue
+        for j in range(len(b)):
+            c[i + j] = c[i + j] + x * b[j]
+    if p:
+        c = [x % p for x in c]
+    return _trim(c)
+
+def inverse(c, p):
+    return pow(c, p - 2, p) if p else ~c
+
+def monic(a, p):
+    if not a:
+        return a
+    inv = inverse(a[-1], p)
+    return [x * inv % p for x in a] if p else [x * inv for x in a]
+
+def divmod_dense(a, b, p):
+    """
+    Returns the quotient and remainder of a by the nonzero b
+
+    >>> divmod_dense([1, 0, 0, 1], [1, 1], 7)
+    ([1, 6, 1], [])
+    >>> divmod_dense([2, 0, 1], [0, 3], 7)
+    ([0, 5], [2])
+    """
+    r = a[:]
+    n = len(b) - 1
+    if len(r) <= n:
+        return [], r
+    inv = inverse(b[-1], p)
+    q = [_zero(p)] * (len(r) - n)
+    for k in range(len(r) - 1, n - 1, -1):
+        if not r[k]:
+            continue
+        c = r[k] * inv % p if p else r[k] * inv
+        q[k - n] = c
+        for i in range(n + 1):
+            r[k - n + i] = (r[k - n + i] - c * b[i]) % p if p else r[k - n + i] - c * b[i]
+    return _trim(q), _trim(r[:n])
+
+def _apply(M, a, b, p):
+    """
+    Returns M * (a, b) for a 2x2 matrix M of polynomials
+    """
+    return (add(mul(M[0][0], a, p), mul(M[0][1], b, p), p),
+            add(mul(M[1][0], a, p), mul(M[1][1], b, p), p))
+
+def _matmul(M, N, p):
+    return [[add(mul(M[i][0], N[0][j], p), mul(M[i][1], N[1][j], p), p) for j in range(2)] for i in range(2)]
+
+def _step(q, p):
+    """
+    The matrix taking (a, b) to (b, a - q*b)
+    """
+    return [[[], [1]], [[1], neg(q, p)]]
+
+def _hgcd(a, b, p):
+    """
+    For deg a > deg b, returns a matrix M, a product of steps of Euclid's
+    algorithm, such that M * (a, b) = (c, d) with deg c >= m > deg d for
+    m = ceil(deg a / 2)
+    """
+    m = len(a) // 2
+    if len(b) - 1 < m:
+        return [[[1], []], [[], [1]]]
+    if len(a) <= HGCD_DEGREE:
+        M = [[[1], []], [[], [1]]]
+        while len(b) - 1 >= m:
+            q, r = divmod_dense(a, b, p)
+            M = _matmul(_step(q, p), M, p)
+            a, b = b, r
+        return M
+    R = _hgcd(a[m:], b[m:], p)
+    c, d = _apply(R, a, b, p)
+    if len(d) - 1 < m:
+        return R
+    q, r = divmod_dense(c, d, p)
+    R = _matmul(_step(q, p), R, p)
+    if len(r) - 1 < m:
+        return R
+    k = 2 * m - (len(d) - 1)
+    return _matmul(_hgcd(d[k:], r[k:], p), R, p)
+
+def gcd_dense(a, b, p):
+    """
+    Returns the monic GCD of a and b
+
+    >>> gcd_dense([6, 0, 1], [1, 1], 7)
+    [1, 1]
+    >>> gcd_dense([], [], 7)
+    []
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    while b:
+        q, r = divmod_dense(a, b, p)
+        a, b = b, r
+        if p and len(a) > HGCD_DEGREE and b:
+            a, b = _apply(_hgcd(a, b, p), a, b, p)
+    return monic(a, p)
+
+def gcd(polys):
+    """
+    Returns the monic GCD of the univariate polynomials polys, 0 if they are all 0
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'x')
+    >>> x = R.variables()
+    >>> gcd([2*x**3 - 2*x, 3*x**2 + 6*x + 3])
+    x + 1
+    >>> S = PolynomialRing(PrimeField(32003), 'x')
+    >>> x = S.variables()
+    >>> f, g, h = (x**150 + 3*x + 1)**2, x**200 - 7*x**3 + 2, x**170 + x**11 - 5
+    >>> gcd([f * g, f * h]) == f * ~f.LC()
+    True
+    """
+    ring = polys[0].ring
+    p = _p(ring.coeff_ring)
+    a = []
+    for f in polys:
+        a = gcd_dense(a, dense(f), p)
+    return sparse(ring, a)
+
+def is_dense(f):
+    """
+    Whether at least a quarter of the coefficients of f up to its degree are
+    nonzero, so that multiplying dense coefficient lists does not waste much
+    """
+    return f.monomials[-1].degrees[0] < 4 * len(f.monomials)
+
+def multiply(f, g):
+    return sparse(f.ring, mul(dense(f), dense(g), _p(f.ring.coeff_ring)))
+
+def divide(f, divisors):
+    """
+    Polynomial.divide for univariate polynomials: the quotients and the
+    remainder are the same as from the general algorithm, which at each step
+    uses the first divisor whose degree is at most that of what is left
+
+    >>> from polynomial import *
+    >>> R = PolynomialRing(QQ, 'x')
+    >>> x = R.variables()
+    >>> divide(x**5 + 2*x + 1, [x**3 - 1, x**2 + 1])
+    ([x^2, 1], 2*x)
+    """
+    ring = f.ring
+    p = _p(ring.coeff_ring)
+    r = dense(f)
+    divs = [(i, dense(g)) for i, g in enumerate(divisors) if not g.is_zero()]
+    if not divs:
+        raise ZeroDivisionError
+    inverses = dict([(i, inverse(b[-1], p)) for i, b in divs])
+    low = min([len(b) for i, b in divs]) - 1
+    quots = [[_zero(p)] * max(0, len(r) - low) for g in divisors]
+    k = len(r) - 1
+    while k >= low:
+        if r[k]:
+            for i, b in divs:
+                n = len(b) - 1
+                if n <= k:
+                    break
+            c = r[k] * inverses[i] % p if p else r[k] * inverses[i]
+            quots[i][k - n] = c
+            for j in range(n + 1):
+                r[k - n + j] = (r[k - n + j] - c * b[j]) % p if p else r[k - n + j] - c * b[j]
+        k -= 1
+    return [sparse(ring, _trim(q)) for q in quots], sparse(ring, _trim(r[:max(low, 0)]))
+
+def groebner(polys):
+    """
+    The reduced Groebner basis of univariate polynomials: their monic GCD
+
+    >>> from polynomial import *
+    >>> from buchberger import Buchberger, interreduce
+    >>> from random import Random
+    >>> rng = Random(43)
+    >>> R = PolynomialRing(PrimeField(32003), 'x')
+    >>> f, g, h = [R.random(20, 21, rng) for i in range(3)]
+    >>> G = groebner([f * h, g * h])
+    >>> G == interreduce(Buchberger([f * h, g * h]).run()), G[0].LM().degree() >= h.LM().degree()
+    (True, True)
+    >>> groebner([R(0)])
+    []
+    """
+    g = gcd(polys)
+    return [g] if not g.is_zero() else []
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,28 @@
+# Compares the univariate fast path with the general code: Groebner bases of two polynomials with a common factor
+# against the Buchberger engine, and products against the same product in a ring with a second, unused variable.
+
+from polynomial import *
+from buchberger import Buchberger, groebner, interreduce
+from elimination import transfer
+from random import Random
+from timing import compare, Table
+
+def main():
+    rng = Random(43)
+    table = Table('general', 'univariate')
+    for K, degrees in [(PrimeField(32003), [20, 100, 400]), (QQ, [5, 10, 20])]:
+        R = PolynomialRing(K, 'x')
+        S = PolynomialRing(K, 'xy')
+        for d in degrees:
+            f, g, h = [R.random(d, d + 1, rng) for i in range(3)]
+            F = [f * h, g * h]
+            # the general engine takes too long for the largest degrees over GF(p)
+            compare(table, '%s groebner deg %d' % (K, d),
+                    lambda: interreduce(Buchberger(F).run()) if d <= 100 or K is QQ else None, lambda: groebner(F))
+            fS, gS = transfer(f, S), transfer(g, S)
+            compare(table, '%s product deg %d' % (K, d), lambda: fS * gS, lambda: f * g,
+                    same=lambda a, b: a == transfer(b, S))
+
+
+if __name__ == '__main__':
+    main()